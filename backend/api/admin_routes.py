@@ -10,23 +10,36 @@ Versão: 3.0.0
 Data: 2026-02-08
 """
 
+import json
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 
-from flask import Blueprint, jsonify, request, send_file
+from flask import Blueprint, Response, jsonify, request, send_file, stream_with_context
 from werkzeug.utils import secure_filename
 
 from backend.api.auth import require_admin_api
 from backend.config import Config
 from backend.models.domain import Domain
 from backend.models.domain_history import DomainHistory
+from backend.models.domain_change import DomainChange
 from backend.models.dns_client import DNSClient
+from backend.models.extraction_cache import ExtractionCache
+from backend.models.event_log import EventLog
+from backend.models.job import Job
 from backend.models.pdf_upload import PDFUpload
 from backend.models.pdf_removal import PDFRemoval
 from backend.models.sync_history import SyncHistory
+from backend.services.api_log_writer import api_log_writer
+from backend.services.blocklist_publisher import BlocklistPublisher
+from backend.services.client_sync import ClientSyncService
 from backend.services.domain_manager import DomainManager
-from backend.utils.helpers import paginate, safe_int
+from backend.services.health_sweeper import health_sweeper
+from backend.services.heartbeat_buffer import heartbeat_buffer
+from backend.services.history_service import HistoryService
+from backend.services.job_queue import JobQueue
+from backend.services.statistics_service import StatisticsService
+from backend.utils.helpers import safe_int
 from backend.utils.validators import validate_file_upload, sanitize_filename
 
 logger = logging.getLogger(__name__)
@@ -34,36 +47,89 @@ logger = logging.getLogger(__name__)
 # Blueprint para rotas administrativas
 admin_api = Blueprint('admin_api', __name__, url_prefix='/api/v1/admin')
 
+# Formatos da exportação do histórico
+HISTORY_EXPORT_CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson'
+}
+
 
 # === Gerenciamento de Domínios ===
 
 @admin_api.route('/domains', methods=['GET'])
 @require_admin_api
 def list_domains():
-    """Lista domínios com paginação e busca"""
+    """
+    Lista domínios com paginação e busca
+    
+    Paginação por página (page/per_page) ou por keyset (after_id e
+    after_added_at do último item recebido, devolvidos em next_cursor);
+    o modo keyset não conta o total e tem custo constante em qualquer
+    profundidade.
+    """
     try:
-        page = safe_int(request.args.get('page', 1), 1)
-        per_page = safe_int(request.args.get('per_page', 50), 50)
+        per_page = min(max(safe_int(request.args.get('per_page', 50), 50), 1), 1000)
         search = request.args.get('search', '').strip()
         active_only = request.args.get('active_only', 'true').lower() == 'true'
+        after_id = request.args.get('after_id')
+        after_added_at = request.args.get('after_added_at')
         
-        # Buscar domínios
-        domains = Domain.get_all(active_only=active_only, search=search)
+        if after_id or after_added_at:
+            try:
+                after_id = int(after_id)
+                after_added_at = datetime.fromisoformat(after_added_at)
+            except (TypeError, ValueError):
+                return jsonify({
+                    'success': False,
+                    'error': 'after_id e after_added_at devem ser informados juntos (inteiro e data ISO 8601)'
+                }), 400
+            
+            # Um item a mais indica se existe próxima página
+            domains = Domain.get_all(
+                active_only=active_only,
+                limit=per_page + 1,
+                search=search,
+                after_added_at=after_added_at,
+                after_id=after_id
+            )
+            has_next = len(domains) > per_page
+            domains = domains[:per_page]
+            
+            return jsonify({
+                'success': True,
+                'domains': [d.to_dict() for d in domains],
+                'pagination': {
+                    'per_page': per_page,
+                    'has_next': has_next,
+                    'next_cursor': _domains_cursor(domains) if has_next else None
+                }
+            }), 200
+        
+        page = max(safe_int(request.args.get('page', 1), 1), 1)
         total = Domain.count(active_only=active_only, search=search)
-        
-        # Paginar
-        paginated = paginate(domains, page, per_page)
+        total_pages = (total + per_page - 1) // per_page
+        if page > total_pages and total_pages > 0:
+            page = total_pages
+        
+        domains = Domain.get_all(
+            active_only=active_only,
+            limit=per_page,
+            offset=(page - 1) * per_page,
+            search=search
+        )
+        has_next = page < total_pages
         
         return jsonify({
             'success': True,
-            'domains': [d.to_dict() for d in paginated['items']],
+            'domains': [d.to_dict() for d in domains],
             'pagination': {
-                'page': paginated['page'],
-                'per_page': paginated['per_page'],
-                'total': paginated['total'],
-                'total_pages': paginated['total_pages'],
-                'has_prev': paginated['has_prev'],
-                'has_next': paginated['has_next']
+                'page': page,
+                'per_page': per_page,
+                'total': total,
+                'total_pages': total_pages,
+                'has_prev': page > 1,
+                'has_next': has_next,
+                'next_cursor': _domains_cursor(domains) if has_next else None
             }
         }), 200
     
@@ -72,6 +138,14 @@ def list_domains():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+def _domains_cursor(domains: list):
+    """Cursor keyset a partir do último domínio da página"""
+    if not domains or not domains[-1].added_at:
+        return None
+    last = domains[-1]
+    return {'after_id': last.id, 'after_added_at': last.added_at.isoformat()}
+
+
 @admin_api.route('/domains', methods=['POST'])
 @require_admin_api
 def add_domain():
@@ -189,14 +263,18 @@ def upload_pdf():
             file_path.unlink(missing_ok=True)
             return jsonify({'success': False, 'error': 'Arquivo enviado está vazio'}), 400
         
-        # Processar PDF
-        result = DomainManager.process_pdf_upload(
-            file_path=file_path,
-            original_filename=original_filename,
-            uploaded_by=request.user.username
+        # Processar PDF em segundo plano
+        job = JobQueue.enqueue(
+            'pdf_upload',
+            {
+                'file_path': str(file_path),
+                'original_filename': original_filename,
+                'uploaded_by': request.user.username
+            },
+            created_by=request.user.username
         )
         
-        return jsonify(result), 200 if result['success'] else 400
+        return jsonify(_job_accepted(job)), 202
     
     except Exception as e:
         logger.error(f"Erro no upload de PDF: {e}")
@@ -234,14 +312,18 @@ def upload_removal_pdf():
 
         permanent = request.form.get('permanent', 'false').lower() == 'true'
 
-        result = DomainManager.process_pdf_removal(
-            file_path=file_path,
-            original_filename=original_filename,
-            uploaded_by=request.user.username,
-            permanent=permanent
+        job = JobQueue.enqueue(
+            'pdf_removal',
+            {
+                'file_path': str(file_path),
+                'original_filename': original_filename,
+                'uploaded_by': request.user.username,
+                'permanent': permanent
+            },
+            created_by=request.user.username
         )
 
-        return jsonify(result), 200 if result['success'] else 400
+        return jsonify(_job_accepted(job)), 202
 
     except Exception as e:
         logger.error(f"Erro no upload de PDF de remoção: {e}")
@@ -290,6 +372,61 @@ def get_removal_history():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+# === Jobs em Segundo Plano ===
+
+def _job_accepted(job: Job) -> dict:
+    """Resposta padrão para processamento enfileirado"""
+    return {
+        'success': True,
+        'job_id': job.id,
+        'status': job.status,
+        'status_url': f"/api/v1/admin/jobs/{job.id}",
+        'message': 'Arquivo recebido. O processamento continua em segundo plano.'
+    }
+
+
+@admin_api.route('/jobs', methods=['GET'])
+@require_admin_api
+def list_jobs():
+    """Lista jobs recentes"""
+    try:
+        limit = safe_int(request.args.get('limit', 50), 50)
+        job_type = request.args.get('type') or None
+        status = request.args.get('status') or None
+        
+        jobs = Job.get_recent(limit=limit, job_type=job_type, status=status)
+        
+        return jsonify({
+            'success': True,
+            'jobs': [j.to_dict() for j in jobs],
+            'total': len(jobs)
+        }), 200
+    
+    except Exception as e:
+        logger.error(f"Erro ao listar jobs: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@admin_api.route('/jobs/<int:job_id>', methods=['GET'])
+@require_admin_api
+def get_job(job_id):
+    """Status, progresso e resultado de um job"""
+    try:
+        job = Job.get_by_id(job_id)
+        
+        if not job:
+            return jsonify({'success': False, 'error': 'Job não encontrado'}), 404
+        
+        return jsonify({
+            'success': True,
+            'job': job.to_dict()
+        }), 200
+    
+    except Exception as e:
+        logger.error(f"Erro ao buscar job {job_id}: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 # === Gerenciamento de Clientes DNS ===
 
 @admin_api.route('/clients', methods=['GET'])
@@ -417,6 +554,75 @@ def regenerate_client_key(client_id):
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@admin_api.route('/clients/health', methods=['GET'])
+@require_admin_api
+def get_clients_health():
+    """
+    Relatório da última varredura de saúde dos clientes: status, latência
+    atual e p50/p95/p99 por cliente e da frota, histograma de latência
+    
+    Query params:
+        refresh: true para varrer agora em vez de usar o último relatório
+    """
+    try:
+        if request.args.get('refresh', 'false').lower() == 'true':
+            report = health_sweeper.sweep(force=True)
+        else:
+            report = health_sweeper.get_report()
+        
+        if report is None:
+            return jsonify({
+                'success': False,
+                'error': 'Nenhuma varredura realizada ainda (use refresh=true)'
+            }), 404
+        
+        return jsonify({'success': True, 'report': report}), 200
+    
+    except Exception as e:
+        logger.error(f"Erro ao obter saúde dos clientes: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@admin_api.route('/clients/push', methods=['POST'])
+@require_admin_api
+def push_to_clients():
+    """
+    Envia a lista atual a todos os clientes com endpoint de push
+    
+    Query params:
+        stream: true para receber o resultado de cada cliente em NDJSON
+            assim que ele termina (última linha com o resumo)
+        parallel: false para enviar um cliente por vez
+    """
+    try:
+        stream = request.args.get('stream', 'false').lower() == 'true'
+        parallel = request.args.get('parallel', 'true').lower() != 'false'
+        
+        logger.info(f"Push para todos os clientes solicitado por {request.user.username}")
+        
+        if not stream:
+            results = ClientSyncService.push_to_all_clients(parallel=parallel)
+            return jsonify({'success': True, **results}), 200
+        
+        clients = DNSClient.get_all(active_only=True)
+        
+        def generate():
+            summary = {'total_clients': len(clients), 'success': 0, 'failed': 0, 'skipped': 0}
+            for detail in ClientSyncService.iter_push_results(
+                clients,
+                concurrency=None if parallel else 1
+            ):
+                summary[detail['status']] += 1
+                yield json.dumps(detail) + '\n'
+            yield json.dumps({'summary': summary}) + '\n'
+        
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    
+    except Exception as e:
+        logger.error(f"Erro no push para clientes: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 # === Histórico ===
 
 @admin_api.route('/history/domains', methods=['GET'])
@@ -483,6 +689,49 @@ def get_upload_history():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@admin_api.route('/history/export', methods=['GET'])
+@require_admin_api
+def export_history():
+    """
+    Exporta o histórico unificado (domínios, sincronizações e uploads)
+    como download em streaming, do evento mais recente ao mais antigo
+    
+    Query params:
+        format: csv (padrão) ou ndjson
+        days: dias para trás (padrão 30, 0 = todo o histórico)
+        type: all (padrão) ou lista separada por vírgula (domains, syncs, uploads)
+    """
+    try:
+        export_format = request.args.get('format', 'csv').lower()
+        days = safe_int(request.args.get('days', 30), 30)
+        event_type = request.args.get('type', 'all')
+        event_types = None if event_type == 'all' else [t for t in event_type.split(',') if t]
+        
+        if export_format not in HISTORY_EXPORT_CONTENT_TYPES:
+            return jsonify({
+                'success': False,
+                'error': f"Formato inválido. Use: {', '.join(HISTORY_EXPORT_CONTENT_TYPES)}"
+            }), 400
+        
+        try:
+            chunks = HistoryService.stream_history_export(export_format, days, event_types)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        filename = f"historico_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{export_format}"
+        logger.info(f"Exportação do histórico ({export_format}, {days} dias) por {request.user.username}")
+        
+        return Response(
+            stream_with_context(chunks),
+            mimetype=HISTORY_EXPORT_CONTENT_TYPES[export_format],
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+        )
+    
+    except Exception as e:
+        logger.error(f"Erro ao exportar histórico: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 # === Gerenciamento de Clientes (complemento) ===
 
 @admin_api.route('/clients/<int:client_id>', methods=['DELETE'])
@@ -573,6 +822,128 @@ def clear_cache():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@admin_api.route('/extraction-cache', methods=['GET'])
+@require_admin_api
+def get_extraction_cache_stats():
+    """Estatísticas do cache de extrações de PDF"""
+    try:
+        stats = ExtractionCache.get_stats()
+        stats.update({
+            'enabled': Config.PDF_CACHE_ENABLED,
+            'max_entries': Config.PDF_CACHE_MAX_ENTRIES,
+            'max_age_days': Config.PDF_CACHE_MAX_AGE_DAYS
+        })
+        return jsonify({'success': True, 'cache': stats}), 200
+    except Exception as e:
+        logger.error(f"Erro ao obter estatísticas do cache de extrações: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@admin_api.route('/extraction-cache', methods=['DELETE'])
+@admin_api.route('/extraction-cache/<file_hash>', methods=['DELETE'])
+@require_admin_api
+def purge_extraction_cache(file_hash=None):
+    """Remove entradas do cache de extrações (todas ou de um arquivo)"""
+    try:
+        removed = ExtractionCache.purge(file_hash)
+        logger.info(f"Cache de extrações: {removed} entradas removidas")
+        return jsonify({'success': True, 'removed': removed}), 200
+    except Exception as e:
+        logger.error(f"Erro ao limpar cache de extrações: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+# === Manutenção ===
+
+@admin_api.route('/maintenance/prune-changes', methods=['POST'])
+@require_admin_api
+def prune_domain_changes():
+    """Remove entradas antigas do changelog usado pela sincronização delta"""
+    try:
+        data = request.get_json(silent=True) or {}
+        retention_days = safe_int(data.get('retention_days', Config.DELTA_RETENTION_DAYS), Config.DELTA_RETENTION_DAYS)
+        
+        removed = DomainChange.prune(retention_days)
+        
+        return jsonify({
+            'success': True,
+            'removed': removed,
+            'retention_days': retention_days,
+            'changelog_floor': DomainChange.get_changelog_floor()
+        }), 200
+    
+    except Exception as e:
+        logger.error(f"Erro ao limpar changelog de domínios: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@admin_api.route('/maintenance/prune-events', methods=['POST'])
+@require_admin_api
+def prune_events():
+    """Remove as partições mensais da timeline anteriores à retenção e cria as próximas"""
+    try:
+        data = request.get_json(silent=True) or {}
+        retention_months = safe_int(data.get('retention_months', Config.EVENTS_RETENTION_MONTHS), Config.EVENTS_RETENTION_MONTHS)
+        
+        dropped = EventLog.drop_partitions(max(1, retention_months))
+        created = EventLog.ensure_partitions()
+        
+        logger.info(f"Timeline: {dropped} partições removidas, {created} criadas")
+        return jsonify({
+            'success': True,
+            'dropped_partitions': dropped,
+            'created_partitions': created,
+            'retention_months': max(1, retention_months)
+        }), 200
+    
+    except Exception as e:
+        logger.error(f"Erro ao remover partições da timeline: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@admin_api.route('/maintenance/refresh-stats', methods=['POST'])
+@require_admin_api
+def refresh_stats_counters():
+    """Recalcula os contadores de estatísticas (COUNT completo nas tabelas)"""
+    try:
+        stats = StatisticsService.refresh()
+        
+        return jsonify({
+            'success': True,
+            'stats': stats
+        }), 200
+    
+    except Exception as e:
+        logger.error(f"Erro ao recalcular contadores de estatísticas: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+# === Lista de Bloqueio ===
+
+@admin_api.route('/blocklist/compaction', methods=['GET'])
+@require_admin_api
+def get_blocklist_compaction():
+    """Economia da variante compacta da lista (compact=true em /client/domains)"""
+    try:
+        version = Domain.get_blocklist_version()
+        full = BlocklistPublisher.get_artifact('rpz', version)
+        compact = BlocklistPublisher.get_artifact('rpz', version, compact=True)
+        
+        return jsonify({
+            'success': True,
+            'version': compact['version'],
+            'compaction': compact['compaction'],
+            'rpz_bytes': {
+                'full': {enc: len(body) for enc, body in full['bodies'].items()},
+                'compact': {enc: len(body) for enc, body in compact['bodies'].items()}
+            }
+        }), 200
+    
+    except Exception as e:
+        logger.error(f"Erro ao calcular compactação da lista: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 # === Estatísticas ===
 
 @admin_api.route('/stats', methods=['GET'])
@@ -593,9 +964,11 @@ def get_stats():
             },
             'syncs': {
                 'recent': len(SyncHistory.get_recent(limit=100)),
-                'last_24h': len([s for s in SyncHistory.get_recent(limit=1000) 
-                                if (datetime.now() - s.synced_at).days < 1])
-            }
+                'last_24h': SyncHistory.get_period_stats(datetime.now() - timedelta(days=1))['total_syncs']
+            },
+            # Contadores da fila de api_logs e do buffer de heartbeats deste worker
+            'api_logs': api_log_writer.get_stats(),
+            'heartbeats': heartbeat_buffer.get_stats()
         }
         
         return jsonify({
@@ -10,12 +10,18 @@ Versão: 3.0.0
 Data: 2026-02-08
 """
 
+import copy
+import hashlib
 import logging
+import threading
+import time
+from collections import OrderedDict
 from functools import wraps
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 
 from flask import request, jsonify
 
+from backend.config import Config
 from backend.models.dns_client import DNSClient
 from backend.models.user import User
 from backend.utils.helpers import get_client_ip
@@ -23,6 +29,167 @@ from backend.utils.validators import validate_api_key
 
 logger = logging.getLogger(__name__)
 
+# Canal Redis usado para propagar invalidações entre workers
+API_KEY_INVALIDATION_CHANNEL = 'auth:api_key:invalidate'
+
+
+class ApiKeyCache:
+    """
+    Cache em memória (LRU com TTL) de clientes autenticados por API key.
+    
+    Evita um SELECT em dns_clients a cada requisição de cliente DNS.
+    As entradas são indexadas pelo SHA-256 da chave (a chave em claro não
+    fica em memória) e guardam uma cópia dos atributos do cliente; cada
+    acerto devolve uma instância nova, então alterações feitas pela rota
+    não contaminam o cache. Chaves inválidas não são cacheadas.
+    """
+    
+    def __init__(self, ttl: int, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: 'OrderedDict[str, Tuple[float, Dict]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def key_hash(api_key: str) -> str:
+        """Hash usado como chave do cache e nas mensagens de invalidação"""
+        return hashlib.sha256(api_key.encode('utf-8')).hexdigest()
+    
+    def get(self, api_key: str) -> Optional[DNSClient]:
+        """Retorna o cliente cacheado ou None se ausente/expirado"""
+        if self.ttl <= 0:
+            return None
+        
+        key = self.key_hash(api_key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            expires_at, snapshot = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+        
+        return DNSClient(**copy.deepcopy(snapshot))
+    
+    def set(self, api_key: str, client: DNSClient) -> None:
+        """Armazena cópia do cliente autenticado"""
+        if self.ttl <= 0:
+            return
+        
+        key = self.key_hash(api_key)
+        snapshot = copy.deepcopy(client.__dict__)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, snapshot)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def discard_hash(self, key: str) -> None:
+        """Remove entrada pelo hash da chave"""
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        """Esvazia o cache"""
+        with self._lock:
+            self._entries.clear()
+    
+    def get_stats(self) -> Dict:
+        """Retorna estatísticas do cache"""
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+api_key_cache = ApiKeyCache(Config.API_KEY_CACHE_TTL, Config.API_KEY_CACHE_SIZE)
+
+_invalidation_listener: Optional[threading.Thread] = None
+_listener_lock = threading.Lock()
+_listener_retry_at = 0.0
+
+# Intervalo entre tentativas de assinar o canal quando o Redis está fora
+LISTENER_RETRY_SECONDS = 30
+
+
+def _listen_invalidations(pubsub) -> None:
+    """Loop da thread que aplica invalidações publicadas por outros workers"""
+    try:
+        for message in pubsub.listen():
+            if message.get('type') == 'message':
+                api_key_cache.discard_hash(message['data'])
+    except Exception as e:
+        logger.warning(f"Listener de invalidação de API keys encerrado: {e}")
+        # Sem o listener não há como saber de revogações em outros workers
+        api_key_cache.clear()
+
+
+def _ensure_invalidation_listener() -> None:
+    """
+    Inicia (uma vez por processo) a thread que escuta invalidações no Redis.
+    É iniciada sob demanda para rodar em cada worker após o fork do Gunicorn.
+    Sem Redis, a revogação em outros workers depende apenas do TTL.
+    """
+    global _invalidation_listener, _listener_retry_at
+    
+    if _invalidation_listener is not None and _invalidation_listener.is_alive():
+        return
+    if time.monotonic() < _listener_retry_at:
+        return
+    
+    with _listener_lock:
+        if _invalidation_listener is not None and _invalidation_listener.is_alive():
+            return
+        if time.monotonic() < _listener_retry_at:
+            return
+        
+        from backend.services.cache_service import cache
+        
+        pubsub = cache.subscribe(API_KEY_INVALIDATION_CHANNEL)
+        if pubsub is None:
+            _listener_retry_at = time.monotonic() + LISTENER_RETRY_SECONDS
+            return
+        
+        _invalidation_listener = threading.Thread(
+            target=_listen_invalidations,
+            args=(pubsub,),
+            name='api-key-invalidation',
+            daemon=True
+        )
+        _invalidation_listener.start()
+
+
+def invalidate_api_key_cache(api_key: Optional[str]) -> None:
+    """
+    Remove uma API key do cache local e avisa os demais workers via Redis.
+    Deve ser chamada sempre que a chave for regenerada, o cliente
+    desativado ou removido.
+    """
+    if not api_key:
+        return
+    
+    key = ApiKeyCache.key_hash(api_key)
+    api_key_cache.discard_hash(key)
+    
+    try:
+        from backend.services.cache_service import cache
+        cache.publish(API_KEY_INVALIDATION_CHANNEL, key)
+    except Exception as e:
+        logger.error(f"Erro ao propagar invalidação de API key: {e}")
+
 
 def get_api_key_from_request() -> Optional[str]:
     """Extrai API key da requisição"""
@@ -66,8 +233,13 @@ def authenticate_client() -> Tuple[bool, Optional[DNSClient], Optional[str]]:
     if not valid:
         return False, None, error
     
-    # Buscar cliente
-    client = DNSClient.get_by_api_key(api_key)
+    # Buscar cliente (cache em memória antes do banco)
+    _ensure_invalidation_listener()
+    client = api_key_cache.get(api_key)
+    if client is None:
+        client = DNSClient.get_by_api_key(api_key)
+        if client and client.active:
+            api_key_cache.set(api_key, client)
     
     if not client:
         logger.warning(f"Tentativa de acesso com API key inválida: {api_key[:8]}...")
@@ -173,26 +345,17 @@ def require_admin_api(f):
 
 
 def log_api_request(client: DNSClient, endpoint: str, status_code: int, duration_ms: int):
-    """Registra requisição da API no banco"""
+    """Enfileira registro da requisição da API (gravado em lote no banco)"""
     try:
-        from backend.database.db import db
-        
-        query = """
-        INSERT INTO api_logs (client_id, endpoint, method, ip_address, status_code, duration_ms)
-        VALUES (%s, %s, %s, %s, %s, %s)
-        """
-        
-        db.execute_query(
-            query,
-            (
-                client.id,
-                endpoint,
-                request.method,
-                get_client_ip(request),
-                status_code,
-                duration_ms
-            ),
-            fetch=False
+        from backend.services.api_log_writer import api_log_writer
+        
+        api_log_writer.enqueue(
+            client.id,
+            endpoint,
+            request.method,
+            get_client_ip(request),
+            status_code,
+            duration_ms
         )
     except Exception as e:
         logger.error(f"Erro ao registrar log de API: {e}")
@@ -10,15 +10,20 @@ Versão: 3.0.0
 Data: 2026-02-08
 """
 
+import json
 import logging
 import time
 from datetime import datetime
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, make_response, request, stream_with_context
 
 from backend.api.auth import require_api_key, log_api_request
+from backend.config import Config
 from backend.models.domain import Domain
+from backend.models.domain_change import DomainChange
 from backend.models.sync_history import SyncHistory
+from backend.services.blocklist_publisher import BlocklistPublisher
+from backend.services.domain_compactor import DomainCompactor
 from backend.utils.helpers import get_client_ip
 
 logger = logging.getLogger(__name__)
@@ -26,6 +31,13 @@ logger = logging.getLogger(__name__)
 # Blueprint para rotas de clientes
 client_api = Blueprint('client_api', __name__, url_prefix='/api/v1/client')
 
+# Formatos disponíveis no modo streaming de /domains
+STREAM_CONTENT_TYPES = {
+    'txt': 'text/plain',
+    'rpz': 'text/plain',
+    'ndjson': 'application/x-ndjson'
+}
+
 
 @client_api.route('/ping', methods=['GET'])
 @require_api_key
@@ -66,62 +78,117 @@ def ping():
 @client_api.route('/domains', methods=['GET'])
 @require_api_key
 def get_domains():
-    """Retorna lista de domínios bloqueados"""
+    """
+    Retorna lista de domínios bloqueados
+    
+    Suporta GET condicional: a resposta traz ETag e X-Blocklist-Version com a
+    versão atual da lista; se o cliente enviar If-None-Match com essa versão,
+    responde 304 sem consultar a tabela de domínios.
+    
+    Os formatos são servidos a partir dos artefatos do BlocklistPublisher,
+    com Content-Encoding negociado (gzip/br) pelo Accept-Encoding.
+    
+    Com stream=true (txt, rpz) ou format=ndjson a lista é enviada em
+    streaming a partir de um cursor server-side, com memória constante.
+    
+    Com compact=true (json, txt, rpz) subdomínios de domínios listados são
+    omitidos; na zona RPZ o ancestral ganha um registro curinga (*.dominio).
+    O bloqueio fica mais amplo que o da lista completa: o curinga também
+    bloqueia subdomínios que não estão na lista.
+    """
     start_time = time.time()
     
     try:
         client = request.client
         
         # Parâmetros opcionais
-        format_type = request.args.get('format', 'json')  # json, txt, rpz
+        format_type = request.args.get('format', 'json')  # json, txt, rpz, ndjson
         include_metadata = request.args.get('metadata', 'false').lower() == 'true'
+        stream = request.args.get('stream', 'false').lower() == 'true' or format_type == 'ndjson'
+        compact = request.args.get('compact', 'false').lower() == 'true'
         
-        # Buscar domínios ativos
-        domains = Domain.get_active_domains_list()
+        if compact and format_type == 'ndjson':
+            return jsonify({
+                'success': False,
+                'error': 'compact=true não está disponível no formato ndjson'
+            }), 400
+        
+        # Versão atual da lista (lookup de linha única)
+        version = Domain.get_blocklist_version()
         
-        # Formato de resposta
-        if format_type == 'txt':
-            response = '\n'.join(domains)
-            content_type = 'text/plain'
-        elif format_type == 'rpz':
-            # Formato RPZ completo com cabeçalho de zona para Unbound
-            rpz_header = [
-                f'; BR10 Block Web - RPZ Zone File',
-                f'; Total domains: {len(domains)}',
-                f'; Generated: {datetime.now().isoformat()}',
-                f'$ORIGIN br10block.rpz.',
-                f'$TTL 60',
-                f'@ IN SOA localhost. root.localhost. ({int(datetime.now().timestamp())} 3600 900 604800 60)',
-                f'@ IN NS localhost.',
-                '',
-            ]
-            rpz_lines = [f'{domain} CNAME .' for domain in domains]
-            response = '\n'.join(rpz_header + rpz_lines)
-            content_type = 'text/plain'
-        else:  # json
+        if request.if_none_match.contains_weak(_version_etag(version, compact)):
+            response = make_response('', 304)
+            _set_version_headers(response, version, compact)
+            
+            duration_ms = int((time.time() - start_time) * 1000)
+            log_api_request(client, '/api/v1/client/domains', 304, duration_ms)
+            
+            return response
+        
+        if stream and not compact and format_type in STREAM_CONTENT_TYPES:
+            # Streaming: versão e linhas lidas no mesmo snapshot, para que
+            # ETag, X-Blocklist-Version e serial RPZ descrevam o corpo enviado
+            version, batches = Domain.open_active_domains_stream(batch_size=Config.STREAM_BATCH_SIZE)
+            try:
+                response = Response(
+                    stream_with_context(_stream_domains(format_type, version, batches, client, start_time)),
+                    mimetype=STREAM_CONTENT_TYPES[format_type]
+                )
+                _set_version_headers(response, version)
+            except Exception:
+                batches.close()
+                raise
+            return response
+        
+        if format_type == 'json' and include_metadata:
+            # Metadados são por cliente: resposta montada na hora
+            domains = Domain.get_active_domains_list()
+            compaction = None
+            if compact:
+                domains, wildcards, compaction = DomainCompactor.compact(domains)
             response_data = {
                 'success': True,
                 'total': len(domains),
+                'version': version,
                 'domains': domains,
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            if include_metadata:
-                response_data['metadata'] = {
+                'timestamp': datetime.now().isoformat(),
+                'metadata': {
                     'client_id': client.id,
                     'client_name': client.name,
                     'last_sync': client.last_sync.isoformat() if client.last_sync else None
                 }
+            }
+            if compaction is not None:
+                response_data.update({
+                    'compact': True,
+                    'wildcards': sorted(wildcards),
+                    'compaction': compaction
+                })
+            response = make_response(jsonify(response_data), 200)
+        else:
+            # Artefato pré-renderizado e pré-comprimido para a versão atual
+            artifact = BlocklistPublisher.get_artifact(format_type, version, compact)
+            version = artifact['version']
+            encoding = BlocklistPublisher.negotiate_encoding(
+                request.accept_encodings,
+                artifact['bodies']
+            )
             
-            response = jsonify(response_data)
-            content_type = 'application/json'
+            response = make_response(artifact['bodies'][encoding], 200)
+            response.headers['Content-Type'] = artifact['content_type']
+            response.headers['X-Content-SHA256'] = artifact['sha256']
+            response.headers['Vary'] = 'Accept-Encoding'
+            if encoding != 'identity':
+                response.headers['Content-Encoding'] = encoding
+            if artifact['compaction'] is not None:
+                response.headers['X-Blocklist-Covered'] = str(artifact['compaction']['covered'])
+        
+        _set_version_headers(response, version, compact)
         
         duration_ms = int((time.time() - start_time) * 1000)
         log_api_request(client, '/api/v1/client/domains', 200, duration_ms)
         
-        if format_type in ['txt', 'rpz']:
-            return response, 200, {'Content-Type': content_type}
-        return response, 200
+        return response
     
     except Exception as e:
         logger.error(f"Erro ao buscar domínios: {e}")
@@ -131,6 +198,110 @@ def get_domains():
         }), 500
 
 
+def _stream_domains(format_type: str, version: int, batches, client, start_time: float):
+    """Gera os blocos da resposta em streaming da lista de domínios"""
+    if format_type == 'rpz':
+        yield BlocklistPublisher.rpz_header(version, datetime.now()) + '\n'
+    
+    try:
+        for rows in batches:
+            batch = [row['domain'] for row in rows]
+            if format_type == 'rpz':
+                yield ''.join(f'{domain} CNAME .\n' for domain in batch)
+            elif format_type == 'ndjson':
+                yield ''.join(json.dumps({'domain': domain}) + '\n' for domain in batch)
+            else:
+                yield '\n'.join(batch) + '\n'
+    finally:
+        batches.close()
+    
+    duration_ms = int((time.time() - start_time) * 1000)
+    log_api_request(client, '/api/v1/client/domains', 200, duration_ms)
+
+
+@client_api.route('/domains/delta', methods=['GET'])
+@require_api_key
+def get_domains_delta():
+    """
+    Retorna apenas os domínios adicionados/removidos desde uma versão
+    
+    Query params:
+        since: última versão da lista aplicada pelo cliente
+    
+    Responde com snapshot completo (mode=full) quando a versão do cliente é
+    anterior ao changelog retido, posterior à versão atual, ou quando o
+    delta seria maior que Config.DELTA_MAX_CHANGES.
+    """
+    start_time = time.time()
+    
+    try:
+        client = request.client
+        
+        since = request.args.get('since', type=int)
+        version = Domain.get_blocklist_version()
+        
+        response_data = {
+            'success': True,
+            'version': version,
+            'since': since,
+            'timestamp': datetime.now().isoformat()
+        }
+        
+        full = since is None or since > version or since < DomainChange.get_changelog_floor()
+        
+        if not full:
+            added, removed = DomainChange.get_net_changes_since(
+                since,
+                version,
+                limit=Config.DELTA_MAX_CHANGES + 1
+            )
+            if len(added) + len(removed) > Config.DELTA_MAX_CHANGES:
+                full = True
+            else:
+                response_data.update({
+                    'mode': 'delta',
+                    'added': added,
+                    'removed': removed,
+                    'total_added': len(added),
+                    'total_removed': len(removed)
+                })
+        
+        if full:
+            domains = Domain.get_active_domains_list()
+            response_data.update({
+                'mode': 'full',
+                'domains': domains,
+                'total': len(domains)
+            })
+        
+        response = make_response(jsonify(response_data), 200)
+        _set_version_headers(response, version)
+        
+        duration_ms = int((time.time() - start_time) * 1000)
+        log_api_request(client, '/api/v1/client/domains/delta', 200, duration_ms)
+        
+        return response
+    
+    except Exception as e:
+        logger.error(f"Erro ao buscar delta de domínios: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+def _version_etag(version: int, compact: bool = False) -> str:
+    """ETag da lista: a variante compacta tem conteúdo diferente da completa"""
+    return f'{version}-compact' if compact else str(version)
+
+
+def _set_version_headers(response, version: int, compact: bool = False) -> None:
+    """Adiciona ETag e X-Blocklist-Version à resposta"""
+    response.set_etag(_version_etag(version, compact), weak=True)
+    response.headers['X-Blocklist-Version'] = str(version)
+    response.headers['Cache-Control'] = 'no-cache'
+
+
 @client_api.route('/domains/count', methods=['GET'])
 @require_api_key
 def get_domains_count():
@@ -28,9 +28,13 @@ from backend.models.user import User
 from backend.models.domain import Domain
 from backend.models.dns_client import DNSClient
 from backend.models.sync_history import SyncHistory
-from backend.models.pdf_upload import PDFUpload
+from backend.models.event_log import EventLog
 from backend.services.cache_service import cache
+from backend.services.health_sweeper import health_sweeper
 from backend.services.history_service import HistoryService
+from backend.services.job_queue import JobQueue
+from backend.services.statistics_service import StatisticsService
+from backend.utils.helpers import safe_int
 
 # Configurar logging
 logging.basicConfig(
@@ -69,9 +73,19 @@ def create_app(config=None):
     try:
         db.initialize()
         logger.info("Banco de dados inicializado")
+        
+        # Partições de events do mês atual e do próximo (fora dos triggers de
+        # escrita); depois, os workers de jobs as criam periodicamente
+        EventLog.ensure_partitions()
     except Exception as e:
         logger.error(f"Erro ao inicializar banco: {e}")
     
+    # Worker de jobs embutido (desativado quando há workers dedicados)
+    JobQueue.start_embedded_worker()
+    
+    # Varredura periódica de saúde dos clientes (uma por intervalo entre processos)
+    health_sweeper.start()
+    
     # Verificar Redis
     if cache.is_available:
         logger.info("Cache Redis disponível")
@@ -188,29 +202,8 @@ def index():
 def dashboard():
     """Dashboard principal"""
     try:
-        # Estatísticas gerais
-        clients_total = DNSClient.count(active_only=False)
-        clients_active = DNSClient.count(active_only=True)
-        all_clients = DNSClient.get_all()
-        clients_online = len([c for c in all_clients if c.status == 'online'])
-        
-        logger.info(f"Dashboard - Clientes: total={clients_total}, active={clients_active}, online={clients_online}, get_all={len(all_clients)}")
-        
-        stats = {
-            'domains': {
-                'total': Domain.count(active_only=False),
-                'active': Domain.count(active_only=True)
-            },
-            'clients': {
-                'total': clients_total,
-                'active': clients_active,
-                'online': clients_online
-            },
-            'uploads': {
-                'total': len(PDFUpload.get_recent(limit=1000)),
-                'recent': len(PDFUpload.get_recent(limit=10))
-            }
-        }
+        # Estatísticas gerais (contadores por trigger, cacheados no Redis)
+        stats = StatisticsService.get_statistics()
         
         # Timeline recente
         timeline = HistoryService.get_timeline(limit=20, days=7)
@@ -240,24 +233,36 @@ def dashboard():
 def domains_list():
     """Lista de domínios"""
     try:
-        page = int(request.args.get('page', 1))
+        page = max(safe_int(request.args.get('page', 1), 1), 1)
         search = request.args.get('search', '').strip()
+        per_page = 50
         
-        domains = Domain.get_all(active_only=True, search=search)
         total = Domain.count(active_only=True, search=search)
+        total_pages = max((total + per_page - 1) // per_page, 1)
+        page = min(page, total_pages)
+        
+        # Paginação feita no banco (LIMIT/OFFSET)
+        domains = Domain.get_all(
+            active_only=True,
+            search=search,
+            limit=per_page,
+            offset=(page - 1) * per_page
+        )
         
         return render_template(
             'domains.html',
-            domains=domains[:50],  # Limitar para performance
+            domains=domains,
             total=total,
             page=page,
+            total_pages=total_pages,
+            per_page=per_page,
             search=search
         )
     
     except Exception as e:
         logger.error(f"Erro ao listar domínios: {e}")
         flash('Erro ao carregar domínios', 'error')
-        return render_template('domains.html', domains=[], total=0)
+        return render_template('domains.html', domains=[], total=0, page=1, total_pages=1, per_page=50)
 
 
 @app.route('/domains/upload')
@@ -361,10 +366,11 @@ def settings():
         redis_stats = cache.get_stats()
         
         # Estatísticas do banco
+        stats = StatisticsService.get_statistics()
         db_stats = {
-            'domains': Domain.count(active_only=False),
-            'clients': DNSClient.count(active_only=False),
-            'uploads': len(PDFUpload.get_recent(limit=10000))
+            'domains': stats['domains']['total'],
+            'clients': stats['clients']['total'],
+            'uploads': stats['uploads']['total']
         }
         
         user_data = session.get('user', {})
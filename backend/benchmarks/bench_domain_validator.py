@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BR10 Block Web - Benchmark do Validador de Domínios
+=====================================================
+Compara a validação antiga (PDFExtractor.validate_domain até a v3.1,
+reproduzida abaixo) com backend.utils.domain_validator, por item e em
+lote, sobre candidatos parecidos com os extraídos de ofícios: domínios
+válidos, números de processo, datas, palavras de texto e lixo.
+
+Uso:
+    python -m backend.benchmarks.bench_domain_validator
+    python -m backend.benchmarks.bench_domain_validator --count 200000
+
+Autor: BR10 Team
+Versão: 3.2.0
+Data: 2026-10-17
+"""
+
+import argparse
+import random
+import re
+import string
+import time
+from typing import Callable, List
+
+from backend.utils.domain_validator import (
+    IGNORED_DOMAINS,
+    NOT_DOMAIN_WORDS,
+    filter_valid_domains,
+    is_valid_domain,
+)
+
+
+def legacy_validate_domain(domain: str) -> bool:
+    """Implementação anterior (uma regex por etapa, split e re.match por rótulo)"""
+    domain = domain.strip().lower()
+
+    if len(domain) < 4 or len(domain) > 255:
+        return False
+    if domain in IGNORED_DOMAINS:
+        return False
+    if '.' not in domain:
+        return False
+    if domain[0] in ('.', '-') or domain[-1] in ('.', '-'):
+        return False
+    if re.search(r'[^a-z0-9.\-]', domain):
+        return False
+
+    parts = domain.split('.')
+    for part in parts:
+        if not part:
+            return False
+        if part[0] == '-' or part[-1] == '-':
+            return False
+        if not re.match(r'^[a-z0-9\-]+$', part):
+            return False
+
+    tld = parts[-1]
+    if len(tld) < 2:
+        return False
+    if tld.isdigit():
+        return False
+    if len(parts) < 2:
+        return False
+    if len(parts[-2]) < 1:
+        return False
+    if len(parts) == 2 and parts[0] in NOT_DOMAIN_WORDS:
+        return False
+    if all(p.isdigit() for p in parts):
+        return False
+    if re.match(r'^\d+[-\d]*\.\d+', domain):
+        return False
+    if re.match(r'^\d+\.\d+\.\d+', domain):
+        return False
+
+    return True
+
+
+def generate_candidates(count: int, seed: int = 42) -> List[str]:
+    """Gera candidatos normalizados (minúsculos, sem espaços)"""
+    rng = random.Random(seed)
+    letters = string.ascii_lowercase + string.digits
+    tlds = ['com', 'com.br', 'net', 'bet', 'io', 'xyz', 'online', 'site', 'tv']
+    words = sorted(NOT_DOMAIN_WORDS)
+
+    def label() -> str:
+        return ''.join(rng.choice(letters) for _ in range(rng.randint(3, 14)))
+
+    makers: List[Callable[[], str]] = [
+        lambda: f"{label()}.{rng.choice(tlds)}",
+        lambda: f"{label()}.{label()}.{rng.choice(tlds)}",
+        lambda: f"{label()}-{label()}.{rng.choice(tlds)}",
+        lambda: f"{rng.randint(1000000, 9999999)}-{rng.randint(10, 99)}.{rng.randint(2000, 2030)}.8.26.0050",
+        lambda: f"{rng.randint(1, 28):02d}.{rng.randint(1, 12):02d}.{rng.randint(2000, 2030)}",
+        lambda: f"{rng.choice(words)}.{rng.randint(1, 99)}o",
+        lambda: f"-{label()}.com",
+        lambda: f"{label()}..{rng.choice(tlds)}",
+    ]
+
+    return [rng.choice(makers)() for _ in range(count)]
+
+
+def measure(name: str, func: Callable[[], List[str]], count: int) -> List[str]:
+    """Executa func, imprime a vazão e retorna os válidos"""
+    start = time.perf_counter()
+    valid = func()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<40} {elapsed:8.3f} s  {count / elapsed:>12,.0f} candidatos/s  ({len(valid):,} válidos)")
+    return valid
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark do validador de domínios')
+    parser.add_argument('--count', type=int, default=1_000_000, help='Número de candidatos')
+    args = parser.parse_args()
+
+    candidates = generate_candidates(args.count)
+    print(f"{args.count:,} candidatos\n")
+
+    before = measure(
+        'antes: validate_domain (legado)',
+        lambda: [d for d in candidates if legacy_validate_domain(d)],
+        args.count
+    )
+    single = measure(
+        'depois: is_valid_domain por item',
+        lambda: [d for d in candidates if is_valid_domain(d)],
+        args.count
+    )
+    batch = measure(
+        'depois: filter_valid_domains (lote)',
+        lambda: filter_valid_domains(candidates),
+        args.count
+    )
+
+    if before != single or single != batch:
+        raise SystemExit("Resultados divergentes entre as implementações")
+    print("\nResultados idênticos nas três implementações")
+
+
+if __name__ == '__main__':
+    main()
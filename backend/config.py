@@ -20,7 +20,8 @@ load_dotenv()
 # Diretórios base
 BASE_DIR = Path(__file__).resolve().parent.parent
 BACKEND_DIR = BASE_DIR / "backend"
-UPLOADS_DIR = BASE_DIR / "uploads"
+# Configurável para que aplicação e worker apontem para o mesmo volume
+UPLOADS_DIR = Path(os.getenv("UPLOAD_FOLDER", BASE_DIR / "uploads"))
 DATA_DIR = BASE_DIR / "data"
 BACKUPS_DIR = DATA_DIR / "backups"
 LOGS_DIR = BASE_DIR / "logs"
@@ -57,6 +58,7 @@ class Config:
     CACHE_TTL_DOMAINS = int(os.getenv("CACHE_TTL_DOMAINS", 300))  # 5 minutos
     CACHE_TTL_STATS = int(os.getenv("CACHE_TTL_STATS", 60))  # 1 minuto
     CACHE_TTL_CLIENTS = int(os.getenv("CACHE_TTL_CLIENTS", 120))  # 2 minutos
+    CACHE_TTL_TIMELINE = int(os.getenv("CACHE_TTL_TIMELINE", 15))  # timeline padrão do dashboard
     
     # Sessão
     SESSION_LIFETIME_HOURS = int(os.getenv("SESSION_LIFETIME_HOURS", 24))
@@ -66,10 +68,62 @@ class Config:
     MAX_CONTENT_LENGTH = int(os.getenv("MAX_CONTENT_LENGTH", 16 * 1024 * 1024))  # 16MB
     ALLOWED_EXTENSIONS = {"pdf"}
     UPLOAD_FOLDER = UPLOADS_DIR
+    PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", 0))  # processos de extração (0 = núcleos, 1 = em série)
+    PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", 16))  # abaixo disso, extração em série
+    PDF_CACHE_ENABLED = os.getenv("PDF_CACHE_ENABLED", "True").lower() == "true"  # cache de extrações por hash
+    PDF_CACHE_MAX_ENTRIES = int(os.getenv("PDF_CACHE_MAX_ENTRIES", 1000))  # acima disso, descarte LRU
+    PDF_CACHE_MAX_AGE_DAYS = int(os.getenv("PDF_CACHE_MAX_AGE_DAYS", 90))  # entradas sem uso há mais tempo são descartadas
+    
+    # Normalização de domínios importados (Public Suffix List incluída no projeto)
+    PUBLIC_SUFFIX_LIST = Path(os.getenv("PUBLIC_SUFFIX_LIST", BACKEND_DIR / "data" / "public_suffix_list.dat"))
+    # www.x.bet -> x.bet; desativado por padrão pelo mesmo motivo abaixo:
+    # bloquear x.bet não bloqueia www.x.bet na zona RPZ
+    DOMAIN_COLLAPSE_WWW = os.getenv("DOMAIN_COLLAPSE_WWW", "False").lower() == "true"
+    # a.x.bet -> x.bet; a zona RPZ bloqueia nomes exatos, então só habilitar
+    # se os resolvedores também bloquearem os subdomínios
+    DOMAIN_REDUCE_TO_REGISTRABLE = os.getenv("DOMAIN_REDUCE_TO_REGISTRABLE", "False").lower() == "true"
     
     # API
     API_KEY_LENGTH = 32
     API_RATE_LIMIT = int(os.getenv("API_RATE_LIMIT", 100))  # requisições por minuto
+    API_KEY_CACHE_TTL = int(os.getenv("API_KEY_CACHE_TTL", 60))  # segundos
+    API_KEY_CACHE_SIZE = int(os.getenv("API_KEY_CACHE_SIZE", 1024))  # clientes em memória
+    API_LOG_QUEUE_SIZE = int(os.getenv("API_LOG_QUEUE_SIZE", 10000))  # registros pendentes
+    API_LOG_BATCH_SIZE = int(os.getenv("API_LOG_BATCH_SIZE", 500))  # registros por INSERT
+    API_LOG_FLUSH_MS = int(os.getenv("API_LOG_FLUSH_MS", 1000))  # intervalo máximo entre gravações
+    HEARTBEAT_FLUSH_SECONDS = int(os.getenv("HEARTBEAT_FLUSH_SECONDS", 5))  # gravação em lote dos pings
+    
+    # Sincronização delta
+    DELTA_MAX_CHANGES = int(os.getenv("DELTA_MAX_CHANGES", 50000))  # acima disso, snapshot completo
+    DELTA_RETENTION_DAYS = int(os.getenv("DELTA_RETENTION_DAYS", 30))  # retenção do changelog
+    
+    # Timeline unificada (tabela events, particionada por mês)
+    EVENTS_RETENTION_MONTHS = int(os.getenv("EVENTS_RETENTION_MONTHS", 12))  # partições mantidas
+    
+    # Push para clientes (fan-out concorrente, sessão HTTP compartilhada)
+    SYNC_PUSH_CONCURRENCY = int(os.getenv("SYNC_PUSH_CONCURRENCY", 32))  # pushes simultâneos
+    SYNC_PUSH_TIMEOUT = float(os.getenv("SYNC_PUSH_TIMEOUT", 15))  # prazo por cliente, em segundos
+    SYNC_PUSH_CONNECT_TIMEOUT = float(os.getenv("SYNC_PUSH_CONNECT_TIMEOUT", 3))  # resolvedor fora do ar falha rápido
+    SYNC_PUSH_POOL_HOSTS = int(os.getenv("SYNC_PUSH_POOL_HOSTS", 256))  # clientes com conexão keep-alive mantida
+    SYNC_PUSH_GZIP = os.getenv("SYNC_PUSH_GZIP", "True").lower() == "true"  # corpo gzip para clientes do protocolo delta
+    SYNC_PUSH_GZIP_MIN_BYTES = int(os.getenv("SYNC_PUSH_GZIP_MIN_BYTES", 1024))  # corpos menores vão sem compressão
+    
+    # Varredura de saúde dos clientes (health_endpoint)
+    HEALTH_SWEEP_INTERVAL = int(os.getenv("HEALTH_SWEEP_INTERVAL", 60))  # segundos entre varreduras (0 desativa)
+    HEALTH_SWEEP_CONCURRENCY = int(os.getenv("HEALTH_SWEEP_CONCURRENCY", 32))  # verificações simultâneas
+    HEALTH_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", 5))  # segundos por cliente
+    HEALTH_SAMPLES = int(os.getenv("HEALTH_SAMPLES", 100))  # latências guardadas por cliente (buffer circular)
+    
+    # Download em streaming (linhas lidas do cursor server-side por lote)
+    STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", 5000))
+    
+    # Jobs em segundo plano (processamento de PDFs)
+    JOB_EMBEDDED_WORKER = os.getenv("JOB_EMBEDDED_WORKER", "True").lower() == "true"  # thread na própria aplicação
+    JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", 2))  # segundos entre consultas à fila
+    JOB_HEARTBEAT_SECONDS = int(os.getenv("JOB_HEARTBEAT_SECONDS", 30))  # sinal de vida do job em execução
+    JOB_STALE_MINUTES = int(os.getenv("JOB_STALE_MINUTES", 10))  # sem sinal de vida: volta para a fila
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 3))
+    JOB_MAINTENANCE_SECONDS = int(os.getenv("JOB_MAINTENANCE_SECONDS", 3600))  # tarefas periódicas (partições de events)
     
     # Unbound
     UNBOUND_ZONE_FILE = Path(os.getenv("UNBOUND_ZONE_FILE", "/var/lib/unbound/br10block-rpz.zone"))
@@ -11,6 +11,8 @@ Data: 2026-02-08
 """
 
 import logging
+import threading
+import uuid
 from contextlib import contextmanager
 from typing import Optional
 
@@ -35,10 +37,20 @@ class Database:
             cls._instance = super(Database, cls).__new__(cls)
         return cls._instance
     
-    def __init__(self):
-        """Inicializa o pool de conexões"""
+    _pool_lock = threading.Lock()
+    
+    @property
+    def connection_pool(self) -> pool.ThreadedConnectionPool:
+        """
+        Pool de conexões, criado no primeiro uso: importar o módulo não
+        conecta (os processos de extração de PDF importam o pacote backend
+        sem nunca usar o banco)
+        """
         if self._pool is None:
-            self._initialize_pool()
+            with self._pool_lock:
+                if self._pool is None:
+                    self._initialize_pool()
+        return self._pool
     
     def _initialize_pool(self) -> None:
         """Cria o pool de conexões"""
@@ -63,7 +75,7 @@ class Database:
         """Context manager para obter conexão do pool (sem auto-commit)."""
         conn = None
         try:
-            conn = self._pool.getconn()
+            conn = self.connection_pool.getconn()
             conn.autocommit = False
             yield conn
         except Exception as e:
@@ -76,7 +88,7 @@ class Database:
             raise
         finally:
             if conn:
-                self._pool.putconn(conn)
+                self.connection_pool.putconn(conn)
 
     @contextmanager
     def get_cursor(self, commit: bool = True):
@@ -84,7 +96,7 @@ class Database:
         conn = None
         cursor = None
         try:
-            conn = self._pool.getconn()
+            conn = self.connection_pool.getconn()
             conn.autocommit = False
             cursor = conn.cursor()
             yield cursor
@@ -107,7 +119,7 @@ class Database:
                 except Exception:
                     pass
             if conn:
-                self._pool.putconn(conn)
+                self.connection_pool.putconn(conn)
     
     def execute_query(self, query: str, params: tuple = None, fetch: bool = True):
         """
@@ -144,6 +156,51 @@ class Database:
                     return []
             return cursor.rowcount
     
+    def stream_query(self, query: str, params: tuple = None, batch_size: int = 5000,
+                     snapshot_query: Optional[str] = None):
+        """
+        Executa um SELECT com cursor server-side (nomeado) e produz as linhas
+        em lotes de batch_size, sem materializar o resultado inteiro.
+
+        Com snapshot_query, a transação é REPEATABLE READ e o primeiro item
+        produzido é a linha de snapshot_query, lida no mesmo snapshot que
+        as linhas de query.
+
+        A conexão fica reservada enquanto o gerador estiver ativo e é
+        devolvida ao pool ao final, inclusive se o consumidor parar antes.
+        """
+        conn = self.connection_pool.getconn()
+        cursor = None
+        try:
+            conn.autocommit = False
+            if snapshot_query:
+                with conn.cursor() as snapshot_cursor:
+                    snapshot_cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+                    snapshot_cursor.execute(snapshot_query)
+                    snapshot_row = snapshot_cursor.fetchone()
+                yield snapshot_row
+
+            cursor = conn.cursor(name=f"stream_{uuid.uuid4().hex}")
+            cursor.itersize = batch_size
+            cursor.execute(query, params)
+
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            if cursor:
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
+            try:
+                conn.rollback()
+            except Exception as e:
+                logger.error(f"Erro ao encerrar transação de streaming: {e}")
+            self.connection_pool.putconn(conn)
+
     def execute_many(self, query: str, params_list: list) -> int:
         """Executa múltiplas queries com diferentes parâmetros"""
         with self.get_cursor() as cursor:
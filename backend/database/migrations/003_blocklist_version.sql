@@ -0,0 +1,70 @@
+-- BR10 Block Web - Migration 003: Versão da Lista de Bloqueio
+-- Contador monotônico incrementado a cada alteração efetiva na tabela domains.
+-- Usado como ETag / X-Blocklist-Version em /api/v1/client/domains para que os
+-- clientes DNS recebam 304 Not Modified quando nada mudou.
+-- Versão: 3.2.0
+-- Data: 2026-10-17
+
+-- Tabela de linha única com a versão atual
+CREATE TABLE IF NOT EXISTS blocklist_version (
+    id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    version BIGINT NOT NULL DEFAULT 1,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO blocklist_version (id, version)
+VALUES (1, 1)
+ON CONFLICT (id) DO NOTHING;
+
+-- Incrementa a versão apenas quando o statement alterou o conjunto bloqueado.
+-- Triggers por statement com transition tables: um único UPDATE por
+-- statement, mesmo em inserções em massa, e nenhum incremento em
+-- INSERT ... ON CONFLICT DO NOTHING que não inseriu nada.
+CREATE OR REPLACE FUNCTION bump_blocklist_version()
+RETURNS TRIGGER AS $$
+DECLARE
+    changed BOOLEAN;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT EXISTS (SELECT 1 FROM new_rows) INTO changed;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT EXISTS (SELECT 1 FROM old_rows) INTO changed;
+    ELSE
+        SELECT EXISTS (
+            SELECT 1 FROM new_rows n
+            JOIN old_rows o ON o.id = n.id
+            WHERE n.active IS DISTINCT FROM o.active
+               OR n.domain IS DISTINCT FROM o.domain
+        ) INTO changed;
+    END IF;
+
+    IF changed THEN
+        UPDATE blocklist_version
+        SET version = version + 1,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE id = 1;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS bump_blocklist_version_insert ON domains;
+CREATE TRIGGER bump_blocklist_version_insert
+    AFTER INSERT ON domains
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_blocklist_version();
+
+DROP TRIGGER IF EXISTS bump_blocklist_version_update ON domains;
+CREATE TRIGGER bump_blocklist_version_update
+    AFTER UPDATE ON domains
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_blocklist_version();
+
+DROP TRIGGER IF EXISTS bump_blocklist_version_delete ON domains;
+CREATE TRIGGER bump_blocklist_version_delete
+    AFTER DELETE ON domains
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_blocklist_version();
+
+COMMENT ON TABLE blocklist_version IS 'Versão monotônica da lista de bloqueio (ETag da API de clientes)';
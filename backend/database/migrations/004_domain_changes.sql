@@ -0,0 +1,76 @@
+-- BR10 Block Web - Migration 004: Changelog de Domínios (sincronização delta)
+-- Registra cada entrada/saída do conjunto de domínios ativos com a versão da
+-- lista em que ocorreu, permitindo que clientes DNS baixem apenas as
+-- diferenças desde a última versão aplicada.
+-- Versão: 3.2.0
+-- Data: 2026-10-17
+
+CREATE TABLE IF NOT EXISTS domain_changes (
+    id BIGSERIAL PRIMARY KEY,
+    version BIGINT NOT NULL,
+    domain VARCHAR(255) NOT NULL,
+    action VARCHAR(10) NOT NULL,  -- 'added', 'removed'
+    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Índices para domain_changes
+CREATE INDEX IF NOT EXISTS idx_domain_changes_version ON domain_changes(version);
+CREATE INDEX IF NOT EXISTS idx_domain_changes_changed_at ON domain_changes(changed_at);
+
+-- Menor versão a partir da qual o changelog está completo. Clientes com
+-- versão anterior recebem snapshot completo.
+ALTER TABLE blocklist_version ADD COLUMN IF NOT EXISTS changelog_floor BIGINT;
+UPDATE blocklist_version SET changelog_floor = version WHERE changelog_floor IS NULL;
+
+-- Substitui a função da migração 003: grava o changelog e só incrementa a
+-- versão quando o conjunto de domínios ativos realmente mudou.
+CREATE OR REPLACE FUNCTION bump_blocklist_version()
+RETURNS TRIGGER AS $$
+DECLARE
+    next_version BIGINT;
+    changed INTEGER;
+BEGIN
+    SELECT version + 1 INTO next_version
+    FROM blocklist_version
+    WHERE id = 1
+    FOR UPDATE;
+
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO domain_changes (version, domain, action)
+        SELECT next_version, n.domain, 'added'
+        FROM new_rows n
+        WHERE n.active;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO domain_changes (version, domain, action)
+        SELECT next_version, o.domain, 'removed'
+        FROM old_rows o
+        WHERE o.active;
+    ELSE
+        INSERT INTO domain_changes (version, domain, action)
+        SELECT next_version, o.domain, 'removed'
+        FROM old_rows o
+        JOIN new_rows n ON n.id = o.id
+        WHERE o.active
+          AND (n.active IS NOT TRUE OR n.domain IS DISTINCT FROM o.domain)
+        UNION ALL
+        SELECT next_version, n.domain, 'added'
+        FROM old_rows o
+        JOIN new_rows n ON n.id = o.id
+        WHERE n.active
+          AND (o.active IS NOT TRUE OR n.domain IS DISTINCT FROM o.domain);
+    END IF;
+
+    GET DIAGNOSTICS changed = ROW_COUNT;
+
+    IF changed > 0 THEN
+        UPDATE blocklist_version
+        SET version = next_version,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE id = 1;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+COMMENT ON TABLE domain_changes IS 'Changelog do conjunto de domínios ativos por versão (sincronização delta)';
@@ -0,0 +1,12 @@
+-- BR10 Block Web - Migration 005: Índice para paginação por keyset
+-- A listagem administrativa de domínios ordena por (added_at DESC, id DESC)
+-- e continua a partir do último item visto com (added_at, id) < (x, y).
+-- Versão: 3.2.0
+-- Data: 2026-10-17
+
+CREATE INDEX IF NOT EXISTS idx_domains_added_at_id ON domains(added_at DESC, id DESC);
+
+-- Listagem padrão (somente ativos) sem precisar filtrar linhas inativas no índice
+CREATE INDEX IF NOT EXISTS idx_domains_active_added_at_id
+    ON domains(added_at DESC, id DESC)
+    WHERE active = TRUE;
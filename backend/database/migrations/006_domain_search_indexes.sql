@@ -0,0 +1,19 @@
+-- BR10 Block Web - Migration 006: Índices de busca de domínios
+-- Domain._search_condition escolhe o operador conforme o padrão digitado:
+--   'casino'  -> domain ILIKE '%casino%'        (GIN trigram)
+--   'casino*' -> domain LIKE 'casino%'          (btree text_pattern_ops)
+--   '*.bet'   -> reverse(domain) LIKE 'teb.%'   (btree em reverse(domain))
+-- O índice idx_domains_domain (btree padrão) não atende nenhum desses casos.
+-- Versão: 3.2.0
+-- Data: 2026-10-17
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_domains_domain_trgm
+    ON domains USING gin (domain gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_domains_domain_prefix
+    ON domains (domain text_pattern_ops);
+
+CREATE INDEX IF NOT EXISTS idx_domains_domain_suffix
+    ON domains (reverse(domain) text_pattern_ops);
@@ -0,0 +1,152 @@
+-- BR10 Block Web - Migration 007: Contadores de Estatísticas
+-- Contadores mantidos por trigger (por statement, com transition tables)
+-- para que dashboard e configurações não precisem de COUNT(*) nas tabelas.
+-- Versão: 3.2.0
+-- Data: 2026-10-17
+
+CREATE TABLE IF NOT EXISTS stats_counters (
+    name VARCHAR(50) PRIMARY KEY,
+    value BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Recalcula todos os contadores a partir das tabelas (carga inicial e correção)
+CREATE OR REPLACE FUNCTION refresh_stats_counters()
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO stats_counters (name, value)
+    SELECT 'domains_total', COUNT(*) FROM domains
+    UNION ALL SELECT 'domains_active', COUNT(*) FILTER (WHERE active) FROM domains
+    UNION ALL SELECT 'clients_total', COUNT(*) FROM dns_clients
+    UNION ALL SELECT 'clients_active', COUNT(*) FILTER (WHERE active) FROM dns_clients
+    UNION ALL SELECT 'clients_online', COUNT(*) FILTER (WHERE active AND status = 'online') FROM dns_clients
+    UNION ALL SELECT 'uploads_total', COUNT(*) FROM pdf_uploads
+    ON CONFLICT (name) DO UPDATE
+    SET value = EXCLUDED.value,
+        updated_at = CURRENT_TIMESTAMP;
+END;
+$$ language 'plpgsql';
+
+CREATE OR REPLACE FUNCTION adjust_stats_counter(counter_name VARCHAR, delta BIGINT)
+RETURNS VOID AS $$
+BEGIN
+    IF delta <> 0 THEN
+        UPDATE stats_counters
+        SET value = value + delta,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE name = counter_name;
+    END IF;
+END;
+$$ language 'plpgsql';
+
+-- domains: total e ativos
+CREATE OR REPLACE FUNCTION count_domains_stats()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM adjust_stats_counter('domains_total', (SELECT COUNT(*) FROM new_rows));
+        PERFORM adjust_stats_counter('domains_active', (SELECT COUNT(*) FROM new_rows WHERE active));
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM adjust_stats_counter('domains_total', -(SELECT COUNT(*) FROM old_rows));
+        PERFORM adjust_stats_counter('domains_active', -(SELECT COUNT(*) FROM old_rows WHERE active));
+    ELSE
+        PERFORM adjust_stats_counter('domains_active',
+            (SELECT COUNT(*) FROM new_rows WHERE active) - (SELECT COUNT(*) FROM old_rows WHERE active));
+    END IF;
+
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+-- dns_clients: total, ativos e online
+CREATE OR REPLACE FUNCTION count_clients_stats()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM adjust_stats_counter('clients_total', (SELECT COUNT(*) FROM new_rows));
+        PERFORM adjust_stats_counter('clients_active', (SELECT COUNT(*) FROM new_rows WHERE active));
+        PERFORM adjust_stats_counter('clients_online',
+            (SELECT COUNT(*) FROM new_rows WHERE active AND status = 'online'));
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM adjust_stats_counter('clients_total', -(SELECT COUNT(*) FROM old_rows));
+        PERFORM adjust_stats_counter('clients_active', -(SELECT COUNT(*) FROM old_rows WHERE active));
+        PERFORM adjust_stats_counter('clients_online',
+            -(SELECT COUNT(*) FROM old_rows WHERE active AND status = 'online'));
+    ELSE
+        PERFORM adjust_stats_counter('clients_active',
+            (SELECT COUNT(*) FROM new_rows WHERE active) - (SELECT COUNT(*) FROM old_rows WHERE active));
+        PERFORM adjust_stats_counter('clients_online',
+            (SELECT COUNT(*) FROM new_rows WHERE active AND status = 'online')
+            - (SELECT COUNT(*) FROM old_rows WHERE active AND status = 'online'));
+    END IF;
+
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+-- pdf_uploads: total
+CREATE OR REPLACE FUNCTION count_uploads_stats()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM adjust_stats_counter('uploads_total', (SELECT COUNT(*) FROM new_rows));
+    ELSE
+        PERFORM adjust_stats_counter('uploads_total', -(SELECT COUNT(*) FROM old_rows));
+    END IF;
+
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS count_domains_stats_insert ON domains;
+CREATE TRIGGER count_domains_stats_insert
+    AFTER INSERT ON domains
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION count_domains_stats();
+
+DROP TRIGGER IF EXISTS count_domains_stats_update ON domains;
+CREATE TRIGGER count_domains_stats_update
+    AFTER UPDATE ON domains
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION count_domains_stats();
+
+DROP TRIGGER IF EXISTS count_domains_stats_delete ON domains;
+CREATE TRIGGER count_domains_stats_delete
+    AFTER DELETE ON domains
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION count_domains_stats();
+
+DROP TRIGGER IF EXISTS count_clients_stats_insert ON dns_clients;
+CREATE TRIGGER count_clients_stats_insert
+    AFTER INSERT ON dns_clients
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION count_clients_stats();
+
+DROP TRIGGER IF EXISTS count_clients_stats_update ON dns_clients;
+CREATE TRIGGER count_clients_stats_update
+    AFTER UPDATE ON dns_clients
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION count_clients_stats();
+
+DROP TRIGGER IF EXISTS count_clients_stats_delete ON dns_clients;
+CREATE TRIGGER count_clients_stats_delete
+    AFTER DELETE ON dns_clients
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION count_clients_stats();
+
+DROP TRIGGER IF EXISTS count_uploads_stats_insert ON pdf_uploads;
+CREATE TRIGGER count_uploads_stats_insert
+    AFTER INSERT ON pdf_uploads
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION count_uploads_stats();
+
+DROP TRIGGER IF EXISTS count_uploads_stats_delete ON pdf_uploads;
+CREATE TRIGGER count_uploads_stats_delete
+    AFTER DELETE ON pdf_uploads
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION count_uploads_stats();
+
+-- Carga inicial (após os triggers, para não perder escritas concorrentes)
+SELECT refresh_stats_counters();
+
+COMMENT ON TABLE stats_counters IS 'Contadores agregados mantidos por trigger (dashboard/configurações)';
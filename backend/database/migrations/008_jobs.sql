@@ -0,0 +1,31 @@
+-- BR10 Block Web - Migration 008: Fila de Jobs
+-- Processamentos longos (extração/importação de PDFs) saem da requisição
+-- HTTP e são executados por workers que reservam jobs com
+-- SELECT ... FOR UPDATE SKIP LOCKED.
+-- Versão: 3.2.0
+-- Data: 2026-10-17
+
+CREATE TABLE IF NOT EXISTS jobs (
+    id BIGSERIAL PRIMARY KEY,
+    job_type VARCHAR(50) NOT NULL,  -- 'pdf_upload', 'pdf_removal'
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',  -- 'queued', 'running', 'done', 'failed'
+    payload JSONB DEFAULT '{}'::jsonb,
+    result JSONB,
+    error TEXT,
+    progress INTEGER DEFAULT 0,  -- 0 a 100
+    progress_message VARCHAR(255),
+    attempts INTEGER DEFAULT 0,
+    worker VARCHAR(100),
+    created_by VARCHAR(100),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    heartbeat_at TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
+-- Índices para jobs
+CREATE INDEX IF NOT EXISTS idx_jobs_queued ON jobs(id) WHERE status = 'queued';
+CREATE INDEX IF NOT EXISTS idx_jobs_running ON jobs(heartbeat_at) WHERE status = 'running';
+CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs(created_at DESC);
+
+COMMENT ON TABLE jobs IS 'Fila de processamentos em segundo plano (uploads de PDF)';
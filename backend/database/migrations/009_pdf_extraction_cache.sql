@@ -0,0 +1,25 @@
+-- BR10 Block Web - Migration 009: Cache de Extração de PDFs
+-- Resultado da extração (domínios + metadados) indexado pelo SHA-256 do
+-- arquivo: reenvios do mesmo ofício (ex.: bloqueio e depois remoção) não
+-- repetem a análise do PDF. Descarte por LRU (last_used_at) e idade.
+-- Versão: 3.2.0
+-- Data: 2026-10-17
+
+CREATE TABLE IF NOT EXISTS pdf_extraction_cache (
+    file_hash VARCHAR(64) NOT NULL,
+    method VARCHAR(20) NOT NULL,  -- 'auto', 'pdfplumber', 'pypdf2'
+    extractor_version INTEGER NOT NULL,
+    domains TEXT[] NOT NULL,
+    total_domains INTEGER NOT NULL,
+    file_size BIGINT,
+    extraction_metadata JSONB DEFAULT '{}'::jsonb,
+    hits INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_used_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (file_hash, method)
+);
+
+-- Índice para descarte LRU
+CREATE INDEX IF NOT EXISTS idx_pdf_extraction_cache_last_used ON pdf_extraction_cache(last_used_at);
+
+COMMENT ON TABLE pdf_extraction_cache IS 'Cache de domínios extraídos por hash de PDF';
@@ -0,0 +1,8 @@
+-- BR10 Block Web - Migration 010: Índices dos relatórios do histórico
+-- Os relatórios de sincronização agregam sync_history por período e,
+-- no relatório de um cliente, por (client_id, synced_at >= x).
+-- Versão: 3.2.0
+-- Data: 2026-10-17
+
+CREATE INDEX IF NOT EXISTS idx_sync_history_client_synced_at
+    ON sync_history(client_id, synced_at DESC);
@@ -0,0 +1,298 @@
+-- BR10 Block Web - Migration 011: Log unificado de eventos
+-- A timeline do dashboard e de /history lê uma única tabela, particionada
+-- por mês e mantida por trigger (por statement, com transition tables)
+-- a partir de domain_history, sync_history e pdf_uploads. Partições
+-- antigas são removidas com DROP TABLE, sem DELETE nas tabelas.
+-- Versão: 3.2.0
+-- Data: 2026-10-17
+
+CREATE TABLE IF NOT EXISTS events (
+    event_time TIMESTAMP NOT NULL,
+    type VARCHAR(10) NOT NULL,  -- 'domain', 'sync', 'upload'
+    source_id INTEGER NOT NULL,  -- id na tabela de origem
+    action VARCHAR(50),
+    subject TEXT,
+    actor VARCHAR(100),
+    status VARCHAR(20),
+    details JSONB DEFAULT '{}'::jsonb,
+    PRIMARY KEY (type, source_id, event_time)
+) PARTITION BY RANGE (event_time);
+
+CREATE INDEX IF NOT EXISTS idx_events_time_type ON events(event_time DESC, type);
+
+-- Cria as partições mensais (events_AAAA_MM) que cobrem o intervalo
+CREATE OR REPLACE FUNCTION ensure_events_partitions(from_time TIMESTAMP, to_time TIMESTAMP)
+RETURNS INTEGER AS $$
+DECLARE
+    month_start DATE := date_trunc('month', from_time)::date;
+    partition_name TEXT;
+    created INTEGER := 0;
+BEGIN
+    WHILE month_start <= to_time LOOP
+        partition_name := 'events_' || to_char(month_start, 'YYYY_MM');
+
+        IF to_regclass(partition_name) IS NULL THEN
+            BEGIN
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF events FOR VALUES FROM (%L) TO (%L)',
+                    partition_name, month_start, (month_start + INTERVAL '1 month')::date
+                );
+                created := created + 1;
+            EXCEPTION WHEN duplicate_table THEN
+                NULL;  -- criada por outra transação
+            END;
+        END IF;
+
+        month_start := (month_start + INTERVAL '1 month')::date;
+    END LOOP;
+
+    RETURN created;
+END;
+$$ language 'plpgsql';
+
+-- Remove as partições inteiramente anteriores a `before`
+CREATE OR REPLACE FUNCTION drop_events_partitions(before TIMESTAMP)
+RETURNS INTEGER AS $$
+DECLARE
+    partition_name TEXT;
+    dropped INTEGER := 0;
+BEGIN
+    FOR partition_name IN
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'events'::regclass
+          AND c.relname ~ '^events_[0-9]{4}_[0-9]{2}$'
+          AND to_date(substr(c.relname, 8), 'YYYY_MM') + INTERVAL '1 month' <= before
+        ORDER BY c.relname
+    LOOP
+        EXECUTE format('DROP TABLE %I', partition_name);
+        dropped := dropped + 1;
+    END LOOP;
+
+    RETURN dropped;
+END;
+$$ language 'plpgsql';
+
+-- domain_history -> events
+CREATE OR REPLACE FUNCTION log_domain_history_events()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        DELETE FROM events e
+        USING old_rows o
+        WHERE e.type = 'domain' AND e.source_id = o.id AND e.event_time = o.performed_at;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM ensure_events_partitions(MIN(performed_at), MAX(performed_at)) FROM new_rows;
+
+        INSERT INTO events (event_time, type, source_id, action, subject, actor, status, details)
+        SELECT performed_at, 'domain', id, action, domain, performed_by, NULL,
+               jsonb_build_object(
+                   'old_value', old_value,
+                   'new_value', new_value,
+                   'metadata', metadata
+               )
+        FROM new_rows
+        WHERE performed_at IS NOT NULL
+        ON CONFLICT (type, source_id, event_time) DO UPDATE
+        SET action = EXCLUDED.action,
+            subject = EXCLUDED.subject,
+            actor = EXCLUDED.actor,
+            status = EXCLUDED.status,
+            details = EXCLUDED.details;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+-- sync_history -> events (nome do cliente no momento da escrita)
+CREATE OR REPLACE FUNCTION log_sync_history_events()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        DELETE FROM events e
+        USING old_rows o
+        WHERE e.type = 'sync' AND e.source_id = o.id AND e.event_time = o.synced_at;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM ensure_events_partitions(MIN(synced_at), MAX(synced_at)) FROM new_rows;
+
+        INSERT INTO events (event_time, type, source_id, action, subject, actor, status, details)
+        SELECT s.synced_at, 'sync', s.id, 'sync', COALESCE(c.name, 'Unknown'), NULL, s.status,
+               jsonb_build_object(
+                   'domains_sent', s.domains_sent,
+                   'domains_applied', s.domains_applied,
+                   'duration', s.duration_seconds,
+                   'message', s.message,
+                   'error', s.error_details
+               )
+        FROM new_rows s
+        LEFT JOIN dns_clients c ON c.id = s.client_id
+        WHERE s.synced_at IS NOT NULL
+        ON CONFLICT (type, source_id, event_time) DO UPDATE
+        SET action = EXCLUDED.action,
+            subject = EXCLUDED.subject,
+            actor = EXCLUDED.actor,
+            status = EXCLUDED.status,
+            details = EXCLUDED.details;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+-- pdf_uploads -> events
+CREATE OR REPLACE FUNCTION log_pdf_upload_events()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        DELETE FROM events e
+        USING old_rows o
+        WHERE e.type = 'upload' AND e.source_id = o.id AND e.event_time = o.uploaded_at;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM ensure_events_partitions(MIN(uploaded_at), MAX(uploaded_at)) FROM new_rows;
+
+        INSERT INTO events (event_time, type, source_id, action, subject, actor, status, details)
+        SELECT uploaded_at, 'upload', id, 'pdf_upload', original_filename, uploaded_by,
+               CASE
+                   WHEN processing_error IS NOT NULL THEN 'failed'
+                   WHEN processed THEN 'processed'
+                   ELSE 'pending'
+               END,
+               jsonb_build_object(
+                   'domains_extracted', domains_extracted,
+                   'domains_added', domains_added,
+                   'domains_duplicated', domains_duplicated,
+                   'file_size', file_size,
+                   'processed', processed,
+                   'error', processing_error
+               )
+        FROM new_rows
+        WHERE uploaded_at IS NOT NULL
+        ON CONFLICT (type, source_id, event_time) DO UPDATE
+        SET action = EXCLUDED.action,
+            subject = EXCLUDED.subject,
+            actor = EXCLUDED.actor,
+            status = EXCLUDED.status,
+            details = EXCLUDED.details;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS log_domain_history_events_insert ON domain_history;
+CREATE TRIGGER log_domain_history_events_insert
+    AFTER INSERT ON domain_history
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION log_domain_history_events();
+
+DROP TRIGGER IF EXISTS log_domain_history_events_update ON domain_history;
+CREATE TRIGGER log_domain_history_events_update
+    AFTER UPDATE ON domain_history
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION log_domain_history_events();
+
+DROP TRIGGER IF EXISTS log_domain_history_events_delete ON domain_history;
+CREATE TRIGGER log_domain_history_events_delete
+    AFTER DELETE ON domain_history
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION log_domain_history_events();
+
+DROP TRIGGER IF EXISTS log_sync_history_events_insert ON sync_history;
+CREATE TRIGGER log_sync_history_events_insert
+    AFTER INSERT ON sync_history
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION log_sync_history_events();
+
+DROP TRIGGER IF EXISTS log_sync_history_events_update ON sync_history;
+CREATE TRIGGER log_sync_history_events_update
+    AFTER UPDATE ON sync_history
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION log_sync_history_events();
+
+DROP TRIGGER IF EXISTS log_sync_history_events_delete ON sync_history;
+CREATE TRIGGER log_sync_history_events_delete
+    AFTER DELETE ON sync_history
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION log_sync_history_events();
+
+DROP TRIGGER IF EXISTS log_pdf_upload_events_insert ON pdf_uploads;
+CREATE TRIGGER log_pdf_upload_events_insert
+    AFTER INSERT ON pdf_uploads
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION log_pdf_upload_events();
+
+DROP TRIGGER IF EXISTS log_pdf_upload_events_update ON pdf_uploads;
+CREATE TRIGGER log_pdf_upload_events_update
+    AFTER UPDATE ON pdf_uploads
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION log_pdf_upload_events();
+
+DROP TRIGGER IF EXISTS log_pdf_upload_events_delete ON pdf_uploads;
+CREATE TRIGGER log_pdf_upload_events_delete
+    AFTER DELETE ON pdf_uploads
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION log_pdf_upload_events();
+
+-- Carga inicial (após os triggers, para não perder escritas concorrentes)
+SELECT ensure_events_partitions(MIN(event_time), MAX(event_time))
+FROM (
+    SELECT MIN(performed_at) AS event_time FROM domain_history
+    UNION ALL SELECT MAX(performed_at) FROM domain_history
+    UNION ALL SELECT MIN(synced_at) FROM sync_history
+    UNION ALL SELECT MAX(synced_at) FROM sync_history
+    UNION ALL SELECT MIN(uploaded_at) FROM pdf_uploads
+    UNION ALL SELECT MAX(uploaded_at) FROM pdf_uploads
+) bounds;
+
+INSERT INTO events (event_time, type, source_id, action, subject, actor, status, details)
+SELECT performed_at, 'domain', id, action, domain, performed_by, NULL,
+       jsonb_build_object('old_value', old_value, 'new_value', new_value, 'metadata', metadata)
+FROM domain_history
+WHERE performed_at IS NOT NULL
+ON CONFLICT (type, source_id, event_time) DO NOTHING;
+
+INSERT INTO events (event_time, type, source_id, action, subject, actor, status, details)
+SELECT s.synced_at, 'sync', s.id, 'sync', COALESCE(c.name, 'Unknown'), NULL, s.status,
+       jsonb_build_object(
+           'domains_sent', s.domains_sent,
+           'domains_applied', s.domains_applied,
+           'duration', s.duration_seconds,
+           'message', s.message,
+           'error', s.error_details
+       )
+FROM sync_history s
+LEFT JOIN dns_clients c ON c.id = s.client_id
+WHERE s.synced_at IS NOT NULL
+ON CONFLICT (type, source_id, event_time) DO NOTHING;
+
+INSERT INTO events (event_time, type, source_id, action, subject, actor, status, details)
+SELECT uploaded_at, 'upload', id, 'pdf_upload', original_filename, uploaded_by,
+       CASE
+           WHEN processing_error IS NOT NULL THEN 'failed'
+           WHEN processed THEN 'processed'
+           ELSE 'pending'
+       END,
+       jsonb_build_object(
+           'domains_extracted', domains_extracted,
+           'domains_added', domains_added,
+           'domains_duplicated', domains_duplicated,
+           'file_size', file_size,
+           'processed', processed,
+           'error', processing_error
+       )
+FROM pdf_uploads
+WHERE uploaded_at IS NOT NULL
+ON CONFLICT (type, source_id, event_time) DO NOTHING;
+
+-- Mês atual e o seguinte, para a virada do mês não criar partição dentro de um trigger
+SELECT ensure_events_partitions(CURRENT_TIMESTAMP::timestamp, (CURRENT_TIMESTAMP + INTERVAL '1 month')::timestamp);
+
+COMMENT ON TABLE events IS 'Timeline unificada (domínios, sincronizações, uploads) mantida por trigger, particionada por mês';
@@ -16,6 +16,11 @@ from backend.models.dns_client import DNSClient
 from backend.models.sync_history import SyncHistory
 from backend.models.pdf_upload import PDFUpload
 from backend.models.domain_history import DomainHistory
+from backend.models.domain_change import DomainChange
+from backend.models.stats_counter import StatsCounter
+from backend.models.job import Job
+from backend.models.extraction_cache import ExtractionCache
+from backend.models.event_log import EventLog
 
 __all__ = [
     'User',
@@ -23,5 +28,10 @@ __all__ = [
     'DNSClient',
     'SyncHistory',
     'PDFUpload',
-    'DomainHistory'
+    'DomainHistory',
+    'DomainChange',
+    'StatsCounter',
+    'Job',
+    'ExtractionCache',
+    'EventLog'
 ]
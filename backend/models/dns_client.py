@@ -158,7 +158,7 @@ class DNSClient:
         result = db.execute_query(query, (client_id,))
         
         if result:
-            return cls.from_dict(result[0])
+            return cls._with_fresh_heartbeats([cls.from_dict(result[0])])[0]
         return None
     
     @classmethod
@@ -181,7 +181,13 @@ class DNSClient:
         
         result = db.execute_query(query)
         logger.info(f"DNSClient.get_all(active_only={active_only}): {len(result)} resultados")
-        return [cls.from_dict(row) for row in result]
+        return cls._with_fresh_heartbeats([cls.from_dict(row) for row in result])
+    
+    @staticmethod
+    def _with_fresh_heartbeats(clients: List['DNSClient']) -> List['DNSClient']:
+        """Aplica heartbeats ainda não gravados no banco (HeartbeatBuffer)"""
+        from backend.services.heartbeat_buffer import heartbeat_buffer
+        return heartbeat_buffer.apply(clients)
     
     @classmethod
     def count(cls, active_only: bool = True) -> int:
@@ -200,12 +206,17 @@ class DNSClient:
         """Atualiza dados do cliente"""
         allowed_fields = ['name', 'description', 'ip_address', 'status', 
                          'last_sync', 'last_heartbeat', 'domains_count', 
-                         'active', 'metadata']
+                         'active', 'metadata', 'metadata_merge', 'api_key']
         updates = []
         params = []
         
         for field, value in kwargs.items():
             if field in allowed_fields:
+                if field == 'metadata_merge':
+                    # Mescla chaves no JSONB atual em vez de sobrescrever
+                    updates.append("metadata = COALESCE(metadata, '{}'::jsonb) || %s::jsonb")
+                    params.append(json.dumps(value))
+                    continue
                 if field == 'metadata':
                     value = json.dumps(value)
                 updates.append(f"{field} = %s")
@@ -219,6 +230,10 @@ class DNSClient:
         
         db.execute_query(query, tuple(params), fetch=False)
         
+        # Chave regenerada ou cliente desativado: derrubar o cache de autenticação
+        if 'api_key' in kwargs or kwargs.get('active') is False:
+            self._invalidate_auth_cache()
+        
         # Recarregar dados
         updated = self.get_by_id(self.id)
         if updated:
@@ -228,14 +243,30 @@ class DNSClient:
         return False
     
     def update_heartbeat(self) -> bool:
-        """Atualiza timestamp de heartbeat"""
-        return self.update(
-            last_heartbeat=datetime.now(),
-            status='online'
-        )
+        """
+        Registra heartbeat. A gravação em dns_clients é feita em lote
+        pelo HeartbeatBuffer, não a cada chamada.
+        """
+        from backend.services.heartbeat_buffer import heartbeat_buffer
+        self.last_heartbeat = heartbeat_buffer.record(self.id)
+        if self.active and self.status == 'offline':
+            self.status = 'online'
+        return True
     
-    def update_sync_status(self, domains_count: int, status: str = 'success', unbound_status: str = None) -> bool:
-        """Atualiza status de sincronização"""
+    def update_sync_status(
+        self,
+        domains_count: int,
+        status: str = 'success',
+        unbound_status: str = None,
+        extra_metadata: Optional[Dict] = None
+    ) -> bool:
+        """
+        Atualiza status de sincronização
+        
+        Args:
+            extra_metadata: Chaves adicionais mescladas no metadata na mesma
+                gravação (ex: versão confirmada no push)
+        """
         # Determinar status geral e status granulares
         if status == 'success':
             client_status = 'online'
@@ -250,19 +281,21 @@ class DNSClient:
             sync_ok = False
             unbound_ok = False
         
-        # Atualizar metadata com status granulares
-        current_metadata = self.metadata or {}
-        current_metadata['sync_status'] = 'ok' if sync_ok else 'error'
-        current_metadata['unbound_status'] = 'ok' if unbound_ok else 'down'
-        if unbound_status:
-            current_metadata['unbound_status'] = unbound_status
-        current_metadata['last_sync_result'] = status
+        # Atualizar metadata com status granulares (mescla no banco, pois a
+        # instância pode vir do cache de autenticação com metadata antigo)
+        sync_metadata = {
+            'sync_status': 'ok' if sync_ok else 'error',
+            'unbound_status': unbound_status or ('ok' if unbound_ok else 'down'),
+            'last_sync_result': status
+        }
+        if extra_metadata:
+            sync_metadata.update(extra_metadata)
         
         return self.update(
             last_sync=datetime.now(),
             domains_count=domains_count,
             status=client_status,
-            metadata=current_metadata
+            metadata_merge=sync_metadata
         )
     
     def regenerate_api_key(self) -> str:
@@ -284,7 +317,13 @@ class DNSClient:
         """Remove cliente permanentemente"""
         query = "DELETE FROM dns_clients WHERE id = %s"
         db.execute_query(query, (self.id,), fetch=False)
+        self._invalidate_auth_cache()
         return True
     
+    def _invalidate_auth_cache(self) -> None:
+        """Remove a API key atual do cache de autenticação (todos os workers)"""
+        from backend.api.auth import invalidate_api_key_cache
+        invalidate_api_key_cache(self.api_key)
+    
     def __repr__(self) -> str:
         return f"<DNSClient {self.name} ({self.status})>"
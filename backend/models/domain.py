@@ -12,7 +12,9 @@ Data: 2026-02-08
 
 import json
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from psycopg2.extras import execute_values
 
 from backend.database.db import db
 
@@ -107,30 +109,119 @@ class Domain:
         domains: List[str],
         added_by: Optional[str] = None,
         source: str = 'bulk',
-        source_reference: Optional[str] = None
+        source_reference: Optional[str] = None,
+        log_history: bool = True
     ) -> Tuple[int, int]:
         """
         Cria múltiplos domínios de uma vez
+        
+        Tudo em uma única transação: os domínios vão para uma tabela
+        temporária (execute_values), um único INSERT ... ON CONFLICT DO NOTHING
+        RETURNING grava os novos e, no mesmo statement, o histórico 'added'
+        exatamente das linhas inseridas.
+        
         Retorna: (quantidade_adicionada, quantidade_duplicada)
         """
-        query = """
-        INSERT INTO domains (domain, added_by, source, source_reference)
-        VALUES (%s, %s, %s, %s)
-        ON CONFLICT (domain) DO NOTHING
-        """
-        
         params_list = [
-            (domain.strip().lower(), added_by, source, source_reference)
+            (domain.strip().lower(),)
             for domain in domains
             if domain.strip()
         ]
         
         total = len(params_list)
-        added = db.execute_many(query, params_list)
+        if total == 0:
+            return 0, 0
+        
+        history_metadata = json.dumps({'source': source} if source else {})
+        
+        with db.get_cursor() as cursor:
+            cursor.execute("""
+            CREATE TEMP TABLE bulk_domains (domain VARCHAR(255)) ON COMMIT DROP
+            """)
+            execute_values(
+                cursor,
+                "INSERT INTO bulk_domains (domain) VALUES %s",
+                params_list,
+                page_size=5000
+            )
+            cursor.execute("""
+            WITH inserted AS (
+                INSERT INTO domains (domain, added_by, source, source_reference)
+                SELECT DISTINCT domain, %s, %s, %s FROM bulk_domains
+                ON CONFLICT (domain) DO NOTHING
+                RETURNING id, domain
+            ),
+            history AS (
+                INSERT INTO domain_history (domain_id, domain, action, performed_by, new_value, metadata)
+                SELECT id, domain, 'added', %s, '{"active": true}', %s
+                FROM inserted
+                WHERE %s
+            )
+            SELECT COUNT(*) AS added FROM inserted
+            """, (added_by, source, source_reference, added_by, history_metadata, log_history))
+            added = cursor.fetchone()['added']
+        
         duplicated = total - added
         
         return added, duplicated
     
+    @classmethod
+    def bulk_remove(
+        cls,
+        domains: List[str],
+        performed_by: Optional[str] = None,
+        permanent: bool = False
+    ) -> List[str]:
+        """
+        Remove múltiplos domínios em uma única transação, registrando o
+        histórico em um único INSERT multi-linha.
+        
+        Soft delete: UPDATE ... WHERE domain = ANY(...) RETURNING, com o
+        histórico 'deactivated' no mesmo statement.
+        Permanente: histórico 'removed' gravado antes do DELETE (como em
+        remove_domain), para que domain_id seja anulado pela FK.
+        
+        Retorna: lista dos domínios encontrados e removidos
+        """
+        if not domains:
+            return []
+        
+        with db.get_cursor() as cursor:
+            if permanent:
+                cursor.execute("""
+                WITH target AS (
+                    SELECT id, domain FROM domains
+                    WHERE domain = ANY(%s)
+                    FOR UPDATE
+                )
+                INSERT INTO domain_history (domain_id, domain, action, performed_by, old_value, new_value)
+                SELECT id, domain, 'removed', %s, '{"active": true}', '{"active": false}'
+                FROM target
+                RETURNING domain_id
+                """, (domains, performed_by))
+                ids = [row['domain_id'] for row in cursor.fetchall()]
+                
+                cursor.execute(
+                    "DELETE FROM domains WHERE id = ANY(%s) RETURNING domain",
+                    (ids,)
+                )
+            else:
+                cursor.execute("""
+                WITH updated AS (
+                    UPDATE domains SET active = FALSE
+                    WHERE domain = ANY(%s)
+                    RETURNING id, domain
+                ),
+                history AS (
+                    INSERT INTO domain_history (domain_id, domain, action, performed_by, old_value, new_value)
+                    SELECT id, domain, 'deactivated', %s, '{"active": true}', '{"active": false}'
+                    FROM updated
+                )
+                SELECT domain FROM updated
+                """, (domains, performed_by))
+            
+            return [row['domain'] for row in cursor.fetchall()]
+    
     @classmethod
     def get_by_id(cls, domain_id: int) -> Optional['Domain']:
         """Busca domínio por ID"""
@@ -158,15 +249,45 @@ class Domain:
         result = db.execute_query(query, (domain.lower(),))
         return result[0]['count'] > 0
     
+    @staticmethod
+    def _search_condition(search: str) -> Tuple[str, str]:
+        """
+        Monta o filtro de busca conforme o padrão informado:
+        - '*.bet'   -> sufixo, via índice em reverse(domain)
+        - 'casino*' -> prefixo, via índice text_pattern_ops
+        - 'casino'  -> contém, via índice trigram (pg_trgm)
+        Os demais '*' valem como curinga; '%' e '_' são literais.
+        """
+        term = search.strip().lower()
+        
+        def escape(value: str) -> str:
+            return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        
+        if term.startswith('*') and '*' not in term[1:]:
+            return "reverse(domain) LIKE %s", escape(term[1:][::-1]) + '%'
+        
+        if term.endswith('*') and '*' not in term[:-1]:
+            return "domain LIKE %s", escape(term[:-1]) + '%'
+        
+        return "domain ILIKE %s", '%' + escape(term.strip('*')).replace('*', '%') + '%'
+    
     @classmethod
     def get_all(
         cls,
         active_only: bool = True,
         limit: Optional[int] = None,
         offset: int = 0,
-        search: Optional[str] = None
+        search: Optional[str] = None,
+        after_added_at: Optional[datetime] = None,
+        after_id: Optional[int] = None
     ) -> List['Domain']:
-        """Lista domínios com filtros"""
+        """
+        Lista domínios com filtros, do mais recente para o mais antigo.
+        
+        Paginação por LIMIT/OFFSET ou por keyset: com after_added_at/after_id
+        (último item da página anterior) a consulta continua a partir dele
+        pelo índice (added_at, id), sem percorrer as páginas anteriores.
+        """
         conditions = []
         params = []
         
@@ -174,19 +295,25 @@ class Domain:
             conditions.append("active = TRUE")
         
         if search:
-            conditions.append("domain ILIKE %s")
-            params.append(f"%{search}%")
+            condition, pattern = cls._search_condition(search)
+            conditions.append(condition)
+            params.append(pattern)
+        
+        if after_added_at is not None and after_id is not None:
+            conditions.append("(added_at, id) < (%s, %s)")
+            params.extend([after_added_at, after_id])
         
         where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
         
         query = f"""
         SELECT * FROM domains
         {where_clause}
-        ORDER BY added_at DESC
+        ORDER BY added_at DESC, id DESC
         """
         
         if limit:
-            query += f" LIMIT {limit} OFFSET {offset}"
+            query += " LIMIT %s OFFSET %s"
+            params.extend([limit, offset])
         
         result = db.execute_query(query, tuple(params) if params else None)
         return [cls.from_dict(row) for row in result]
@@ -201,8 +328,9 @@ class Domain:
             conditions.append("active = TRUE")
         
         if search:
-            conditions.append("domain ILIKE %s")
-            params.append(f"%{search}%")
+            condition, pattern = cls._search_condition(search)
+            conditions.append(condition)
+            params.append(pattern)
         
         where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
         
@@ -217,6 +345,38 @@ class Domain:
         result = db.execute_query(query)
         return [row['domain'] for row in result]
     
+    @classmethod
+    def open_active_domains_stream(cls, batch_size: int = 5000) -> Tuple[int, Iterator[List[Dict]]]:
+        """
+        Abre o streaming dos domínios ativos junto com a versão da lista,
+        ambos lidos no mesmo snapshot (REPEATABLE READ): a versão retornada
+        corresponde exatamente às linhas produzidas.
+        
+        O gerador já está iniciado; close() devolve a conexão ao pool
+        mesmo que os lotes não sejam consumidos.
+        
+        Returns:
+            Tupla (versão, gerador de lotes de linhas com a coluna domain)
+        """
+        rows = db.stream_query(
+            "SELECT domain FROM domains WHERE active = TRUE ORDER BY domain",
+            batch_size=batch_size,
+            snapshot_query="SELECT version FROM blocklist_version WHERE id = 1"
+        )
+        snapshot = next(rows)
+        return (snapshot['version'] if snapshot else 0), rows
+    
+    @classmethod
+    def get_blocklist_version(cls) -> int:
+        """
+        Retorna a versão atual da lista de bloqueio.
+        Incrementada por trigger a cada alteração efetiva em domains
+        (migração 003), sem precisar ler a tabela de domínios.
+        """
+        query = "SELECT version FROM blocklist_version WHERE id = 1"
+        result = db.execute_query(query)
+        return result[0]['version'] if result else 0
+    
     def update(self, **kwargs) -> bool:
         """Atualiza dados do domínio"""
         allowed_fields = ['active', 'notes', 'metadata']
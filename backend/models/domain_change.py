@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BR10 Block Web - Domain Change Model
+======================================
+Changelog do conjunto de domínios ativos (sincronização delta)
+
+Os registros são gravados por trigger na tabela domains (migração 004);
+este modelo apenas consulta e faz a limpeza do changelog.
+
+Autor: BR10 Team
+Versão: 3.2.0
+Data: 2026-10-17
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from backend.database.db import db
+
+
+class DomainChange:
+    """Modelo de alteração no conjunto de domínios ativos"""
+
+    def __init__(
+        self,
+        id: Optional[int] = None,
+        version: int = 0,
+        domain: str = None,
+        action: str = None,
+        changed_at: Optional[datetime] = None
+    ):
+        self.id = id
+        self.version = version
+        self.domain = domain
+        self.action = action
+        self.changed_at = changed_at
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'DomainChange':
+        """Cria instância a partir de dicionário"""
+        return cls(
+            id=data.get('id'),
+            version=data.get('version', 0),
+            domain=data.get('domain'),
+            action=data.get('action'),
+            changed_at=data.get('changed_at')
+        )
+
+    def to_dict(self) -> Dict:
+        """Converte para dicionário"""
+        return {
+            'id': self.id,
+            'version': self.version,
+            'domain': self.domain,
+            'action': self.action,
+            'changed_at': self.changed_at.isoformat() if self.changed_at else None
+        }
+
+    @classmethod
+    def get_changelog_floor(cls) -> int:
+        """Retorna a menor versão a partir da qual o changelog está completo"""
+        query = "SELECT changelog_floor FROM blocklist_version WHERE id = 1"
+        result = db.execute_query(query)
+        if result and result[0]['changelog_floor'] is not None:
+            return result[0]['changelog_floor']
+        return 0
+
+    @classmethod
+    def get_net_changes_since(
+        cls,
+        version: int,
+        until_version: int,
+        limit: Optional[int] = None
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Retorna o efeito líquido das alterações no intervalo (version, until_version].
+        Para cada domínio vale apenas a última ação registrada.
+
+        Args:
+            version: Última versão aplicada pelo cliente
+            until_version: Versão que o cliente passará a ter após aplicar o delta
+            limit: Máximo de domínios retornados (None = sem limite)
+
+        Returns:
+            (adicionados, removidos)
+        """
+        query = """
+        SELECT DISTINCT ON (domain) domain, action
+        FROM domain_changes
+        WHERE version > %s AND version <= %s
+        ORDER BY domain, version DESC, id DESC
+        """
+        params = [version, until_version]
+
+        if limit:
+            query += " LIMIT %s"
+            params.append(limit)
+
+        result = db.execute_query(query, tuple(params))
+
+        added = [row['domain'] for row in result if row['action'] == 'added']
+        removed = [row['domain'] for row in result if row['action'] == 'removed']
+        return added, removed
+
+    @classmethod
+    def get_recent(cls, limit: int = 100) -> List['DomainChange']:
+        """Lista alterações recentes"""
+        query = """
+        SELECT * FROM domain_changes
+        ORDER BY version DESC, id DESC
+        LIMIT %s
+        """
+
+        result = db.execute_query(query, (limit,))
+        return [cls.from_dict(row) for row in result]
+
+    @classmethod
+    def prune(cls, retention_days: int) -> int:
+        """
+        Remove alterações mais antigas que o período de retenção e avança o
+        changelog_floor, para que clientes mais antigos recebam snapshot completo.
+
+        Returns:
+            Quantidade de registros removidos
+        """
+        threshold = datetime.now() - timedelta(days=retention_days)
+
+        query = """
+        WITH deleted AS (
+            DELETE FROM domain_changes
+            WHERE changed_at < %s
+            RETURNING version
+        ), floor_update AS (
+            UPDATE blocklist_version
+            SET changelog_floor = GREATEST(changelog_floor, (SELECT MAX(version) FROM deleted))
+            WHERE id = 1 AND EXISTS (SELECT 1 FROM deleted)
+        )
+        SELECT COUNT(*) AS count FROM deleted
+        """
+
+        with db.get_cursor() as cursor:
+            cursor.execute(query, (threshold,))
+            return cursor.fetchone()['count']
+
+    def __repr__(self) -> str:
+        return f"<DomainChange v{self.version} {self.action} {self.domain}>"
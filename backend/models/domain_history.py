@@ -233,5 +233,47 @@ class DomainHistory:
         result = db.execute_query(query, (action, limit))
         return [cls.from_dict(row) for row in result]
     
+    @classmethod
+    def get_period_summary(cls, since: datetime) -> Dict:
+        """
+        Contagem de alterações desde `since` por ação, por fonte (adições)
+        e por usuário, em uma única consulta com GROUPING SETS
+        
+        Returns:
+            Dict com totals (por ação), by_source e by_user
+        """
+        query = """
+        SELECT
+            GROUPING(source) AS source_grouped,
+            GROUPING(performed_by) AS user_grouped,
+            source,
+            performed_by,
+            COUNT(*) AS total,
+            COUNT(*) FILTER (WHERE action = 'added') AS added,
+            COUNT(*) FILTER (WHERE action = 'removed') AS removed,
+            COUNT(*) FILTER (WHERE action = 'activated') AS activated,
+            COUNT(*) FILTER (WHERE action = 'deactivated') AS deactivated
+        FROM (
+            SELECT action, performed_by, COALESCE(metadata->>'source', 'unknown') AS source
+            FROM domain_history
+            WHERE performed_at >= %s
+        ) h
+        GROUP BY GROUPING SETS ((), (source), (performed_by))
+        """
+        
+        summary = {'totals': None, 'by_source': {}, 'by_user': {}}
+        
+        for row in db.execute_query(query, (since,)):
+            if row['source_grouped'] == 0:
+                if row['added']:
+                    summary['by_source'][row['source']] = row['added']
+            elif row['user_grouped'] == 0:
+                if row['performed_by']:
+                    summary['by_user'][row['performed_by']] = row['total']
+            else:
+                summary['totals'] = row
+        
+        return summary
+    
     def __repr__(self) -> str:
         return f"<DomainHistory {self.domain} action={self.action}>"
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BR10 Block Web - Event Log Model
+==================================
+Timeline unificada de eventos (tabela events)
+
+As linhas são mantidas por trigger a partir de domain_history,
+sync_history e pdf_uploads (migração 011); a tabela é particionada por
+mês e a leitura da timeline é uma varredura do índice
+(event_time DESC, type).
+
+Autor: BR10 Team
+Versão: 3.2.0
+Data: 2026-10-17
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from backend.database.db import db
+
+
+class EventLog:
+    """Acesso à tabela events"""
+
+    TYPES = ('domain', 'sync', 'upload')
+
+    @classmethod
+    def get_recent(cls, since: datetime, types: List[str], limit: int = 100) -> List[Dict]:
+        """
+        Eventos desde `since` dos tipos pedidos, do mais recente ao mais
+        antigo (mesmas colunas da exportação do histórico)
+        """
+        query = """
+        SELECT event_time, type AS event_type, action, subject, actor, status, details
+        FROM events
+        WHERE event_time >= %s AND type = ANY(%s)
+        ORDER BY event_time DESC
+        LIMIT %s
+        """
+
+        return db.execute_query(query, (since, list(types), limit))
+
+    @classmethod
+    def ensure_partitions(cls, months_ahead: int = 1) -> int:
+        """
+        Cria as partições do mês atual e dos próximos `months_ahead` meses
+
+        Returns:
+            Quantidade de partições criadas
+        """
+        now = datetime.now()
+        # get_cursor para garantir commit (execute_query não commita SELECT)
+        with db.get_cursor() as cursor:
+            cursor.execute(
+                "SELECT ensure_events_partitions(%s, %s) AS created",
+                (now, now + timedelta(days=31 * months_ahead))
+            )
+            return cursor.fetchone()['created']
+
+    @classmethod
+    def drop_partitions(cls, retention_months: int) -> int:
+        """
+        Remove as partições mensais inteiramente anteriores ao período de
+        retenção (DROP TABLE, sem DELETE linha a linha)
+
+        Returns:
+            Quantidade de partições removidas
+        """
+        month_start = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        year, month = divmod(month_start.year * 12 + month_start.month - 1 - retention_months, 12)
+        cutoff = month_start.replace(year=year, month=month + 1)
+
+        with db.get_cursor() as cursor:
+            cursor.execute("SELECT drop_events_partitions(%s) AS dropped", (cutoff,))
+            return cursor.fetchone()['dropped']
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BR10 Block Web - Extraction Cache Model
+=========================================
+Cache persistente de extrações de PDF (tabela pdf_extraction_cache)
+
+Autor: BR10 Team
+Versão: 3.2.0
+Data: 2026-10-17
+"""
+
+import json
+from typing import Dict, Optional
+
+from backend.database.db import db
+
+
+class ExtractionCache:
+    """Resultados de extração indexados por (hash do arquivo, método)"""
+
+    @classmethod
+    def get(cls, file_hash: str, method: str, extractor_version: int) -> Optional[Dict]:
+        """
+        Busca extração em cache e registra o uso (para o descarte LRU).
+        Entradas de outra versão do extrator são ignoradas.
+        """
+        query = """
+        UPDATE pdf_extraction_cache
+        SET hits = hits + 1, last_used_at = CURRENT_TIMESTAMP
+        WHERE file_hash = %s AND method = %s AND extractor_version = %s
+        RETURNING domains, total_domains, file_size, extraction_metadata
+        """
+
+        # get_cursor: um miss é o caso comum e não deve gerar o aviso de
+        # RETURNING vazio de execute_query
+        with db.get_cursor() as cursor:
+            cursor.execute(query, (file_hash, method, extractor_version))
+            return cursor.fetchone()
+
+    @classmethod
+    def store(
+        cls,
+        file_hash: str,
+        method: str,
+        extractor_version: int,
+        domains: list,
+        file_size: int,
+        extraction_metadata: Dict
+    ) -> None:
+        """Grava (ou substitui) a extração de um arquivo"""
+        query = """
+        INSERT INTO pdf_extraction_cache
+            (file_hash, method, extractor_version, domains, total_domains, file_size, extraction_metadata)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+        ON CONFLICT (file_hash, method) DO UPDATE
+        SET extractor_version = EXCLUDED.extractor_version,
+            domains = EXCLUDED.domains,
+            total_domains = EXCLUDED.total_domains,
+            file_size = EXCLUDED.file_size,
+            extraction_metadata = EXCLUDED.extraction_metadata,
+            hits = 0,
+            created_at = CURRENT_TIMESTAMP,
+            last_used_at = CURRENT_TIMESTAMP
+        """
+
+        db.execute_query(
+            query,
+            (file_hash, method, extractor_version, list(domains), len(domains),
+             file_size, json.dumps(extraction_metadata, default=str)),
+            fetch=False
+        )
+
+    @classmethod
+    def evict(cls, max_entries: int, max_age_days: int) -> int:
+        """
+        Descarta entradas sem uso há mais de max_age_days e, acima de
+        max_entries, as usadas há mais tempo (LRU)
+
+        Returns:
+            Número de entradas removidas
+        """
+        query = """
+        DELETE FROM pdf_extraction_cache
+        WHERE last_used_at < CURRENT_TIMESTAMP - (%s * INTERVAL '1 day')
+           OR (file_hash, method) IN (
+               SELECT file_hash, method FROM pdf_extraction_cache
+               ORDER BY last_used_at DESC
+               OFFSET %s
+           )
+        """
+
+        return db.execute_query(query, (max_age_days, max_entries), fetch=False)
+
+    @classmethod
+    def purge(cls, file_hash: Optional[str] = None) -> int:
+        """Remove as entradas de um arquivo (ou todas, sem file_hash)"""
+        if file_hash:
+            query = "DELETE FROM pdf_extraction_cache WHERE file_hash = %s"
+            return db.execute_query(query, (file_hash,), fetch=False)
+
+        return db.execute_query("DELETE FROM pdf_extraction_cache", fetch=False)
+
+    @classmethod
+    def get_stats(cls) -> Dict:
+        """Retorna estatísticas do cache"""
+        query = """
+        SELECT
+            COUNT(*) AS entries,
+            COALESCE(SUM(total_domains), 0) AS domains,
+            COALESCE(SUM(hits), 0) AS hits,
+            MIN(last_used_at) AS oldest_used_at
+        FROM pdf_extraction_cache
+        """
+
+        row = db.execute_query(query)[0]
+        return {
+            'entries': row['entries'],
+            'domains': row['domains'],
+            'hits': row['hits'],
+            'oldest_used_at': row['oldest_used_at'].isoformat() if row['oldest_used_at'] else None
+        }
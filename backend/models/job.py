@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BR10 Block Web - Job Model
+============================
+Fila de processamentos em segundo plano (tabela jobs)
+
+Autor: BR10 Team
+Versão: 3.2.0
+Data: 2026-10-17
+"""
+
+import json
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from backend.database.db import db
+
+
+class Job:
+    """Modelo de job em segundo plano"""
+
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+
+    def __init__(
+        self,
+        id: Optional[int] = None,
+        job_type: str = None,
+        status: str = 'queued',
+        payload: Optional[Dict] = None,
+        result: Optional[Dict] = None,
+        error: Optional[str] = None,
+        progress: int = 0,
+        progress_message: Optional[str] = None,
+        attempts: int = 0,
+        worker: Optional[str] = None,
+        created_by: Optional[str] = None,
+        created_at: Optional[datetime] = None,
+        started_at: Optional[datetime] = None,
+        heartbeat_at: Optional[datetime] = None,
+        finished_at: Optional[datetime] = None
+    ):
+        self.id = id
+        self.job_type = job_type
+        self.status = status
+        self.payload = payload or {}
+        self.result = result
+        self.error = error
+        self.progress = progress
+        self.progress_message = progress_message
+        self.attempts = attempts
+        self.worker = worker
+        self.created_by = created_by
+        self.created_at = created_at
+        self.started_at = started_at
+        self.heartbeat_at = heartbeat_at
+        self.finished_at = finished_at
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Job':
+        """Cria instância a partir de dicionário"""
+        payload = data.get('payload', {})
+        if isinstance(payload, str):
+            payload = json.loads(payload)
+
+        result = data.get('result')
+        if isinstance(result, str):
+            result = json.loads(result)
+
+        return cls(
+            id=data.get('id'),
+            job_type=data.get('job_type'),
+            status=data.get('status', 'queued'),
+            payload=payload,
+            result=result,
+            error=data.get('error'),
+            progress=data.get('progress', 0),
+            progress_message=data.get('progress_message'),
+            attempts=data.get('attempts', 0),
+            worker=data.get('worker'),
+            created_by=data.get('created_by'),
+            created_at=data.get('created_at'),
+            started_at=data.get('started_at'),
+            heartbeat_at=data.get('heartbeat_at'),
+            finished_at=data.get('finished_at')
+        )
+
+    def to_dict(self) -> Dict:
+        """Converte para dicionário"""
+        return {
+            'id': self.id,
+            'job_type': self.job_type,
+            'status': self.status,
+            'payload': self.payload,
+            'result': self.result,
+            'error': self.error,
+            'progress': self.progress,
+            'progress_message': self.progress_message,
+            'attempts': self.attempts,
+            'worker': self.worker,
+            'created_by': self.created_by,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+    @classmethod
+    def create(
+        cls,
+        job_type: str,
+        payload: Optional[Dict] = None,
+        created_by: Optional[str] = None
+    ) -> 'Job':
+        """Enfileira novo job"""
+        query = """
+        INSERT INTO jobs (job_type, payload, created_by)
+        VALUES (%s, %s, %s)
+        RETURNING *
+        """
+
+        result = db.execute_query(query, (job_type, json.dumps(payload or {}), created_by))
+        return cls.from_dict(result[0])
+
+    @classmethod
+    def get_by_id(cls, job_id: int) -> Optional['Job']:
+        """Busca job por ID"""
+        query = "SELECT * FROM jobs WHERE id = %s"
+        result = db.execute_query(query, (job_id,))
+
+        if result:
+            return cls.from_dict(result[0])
+        return None
+
+    @classmethod
+    def get_recent(
+        cls,
+        limit: int = 50,
+        job_type: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> List['Job']:
+        """Lista jobs recentes com filtros opcionais"""
+        conditions = []
+        params = []
+
+        if job_type:
+            conditions.append("job_type = %s")
+            params.append(job_type)
+
+        if status:
+            conditions.append("status = %s")
+            params.append(status)
+
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        params.append(limit)
+
+        query = f"""
+        SELECT * FROM jobs
+        {where_clause}
+        ORDER BY created_at DESC
+        LIMIT %s
+        """
+
+        result = db.execute_query(query, tuple(params))
+        return [cls.from_dict(row) for row in result]
+
+    @classmethod
+    def claim_next(cls, worker: str, job_types: List[str]) -> Optional['Job']:
+        """
+        Reserva o job mais antigo na fila para este worker.
+        FOR UPDATE SKIP LOCKED permite vários workers sem disputa.
+        """
+        query = """
+        UPDATE jobs
+        SET status = 'running',
+            worker = %s,
+            attempts = attempts + 1,
+            started_at = CURRENT_TIMESTAMP,
+            heartbeat_at = CURRENT_TIMESTAMP,
+            progress = 0,
+            error = NULL
+        WHERE id = (
+            SELECT id FROM jobs
+            WHERE status = 'queued' AND job_type = ANY(%s)
+            ORDER BY id
+            FOR UPDATE SKIP LOCKED
+            LIMIT 1
+        )
+        RETURNING *
+        """
+
+        result = db.execute_query(query, (worker, list(job_types)))
+
+        if result:
+            return cls.from_dict(result[0])
+        return None
+
+    @classmethod
+    def requeue_stale(cls, stale_minutes: int, max_attempts: int) -> int:
+        """
+        Devolve à fila jobs 'running' cujo worker parou de dar sinal de vida
+        (processo morto/reiniciado). Após max_attempts, marca como falha.
+        """
+        query = """
+        UPDATE jobs
+        SET status = CASE WHEN attempts >= %s THEN 'failed' ELSE 'queued' END,
+            error = CASE WHEN attempts >= %s
+                         THEN 'Worker interrompido durante o processamento'
+                         ELSE error END,
+            finished_at = CASE WHEN attempts >= %s THEN CURRENT_TIMESTAMP ELSE NULL END,
+            worker = NULL
+        WHERE status = 'running'
+          AND heartbeat_at < CURRENT_TIMESTAMP - (%s * INTERVAL '1 minute')
+        """
+
+        return db.execute_query(
+            query,
+            (max_attempts, max_attempts, max_attempts, stale_minutes),
+            fetch=False
+        )
+
+    def update_progress(self, progress: int, message: Optional[str] = None) -> bool:
+        """Atualiza progresso (e o sinal de vida do worker)"""
+        query = """
+        UPDATE jobs
+        SET progress = %s, progress_message = %s, heartbeat_at = CURRENT_TIMESTAMP
+        WHERE id = %s
+        """
+
+        db.execute_query(query, (progress, message, self.id), fetch=False)
+        self.progress = progress
+        self.progress_message = message
+        return True
+
+    def mark_done(self, result: Dict) -> bool:
+        """Marca job como concluído"""
+        return self._finish(self.STATUS_DONE, result=result)
+
+    def mark_failed(self, error: str, result: Optional[Dict] = None) -> bool:
+        """Marca job como falho"""
+        return self._finish(self.STATUS_FAILED, result=result, error=error)
+
+    def _finish(self, status: str, result: Optional[Dict] = None, error: Optional[str] = None) -> bool:
+        """Grava o estado final do job"""
+        query = """
+        UPDATE jobs
+        SET status = %s, result = %s, error = %s, progress = 100,
+            finished_at = CURRENT_TIMESTAMP, heartbeat_at = CURRENT_TIMESTAMP
+        WHERE id = %s
+        """
+
+        result_json = json.dumps(result, default=str) if result is not None else None
+        db.execute_query(query, (status, result_json, error, self.id), fetch=False)
+        self.status = status
+        self.result = result
+        self.error = error
+        self.progress = 100
+        return True
+
+    def __repr__(self) -> str:
+        return f"<Job {self.id} {self.job_type} ({self.status})>"
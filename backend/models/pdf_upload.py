@@ -164,6 +164,42 @@ class PDFUpload:
         result = db.execute_query(query, (username, limit))
         return [cls.from_dict(row) for row in result]
     
+    @classmethod
+    def get_period_stats(cls, since: datetime) -> Dict:
+        """
+        Agregados dos uploads desde `since`, no total e por usuário, em uma
+        única consulta sobre o índice de uploaded_at
+        
+        Returns:
+            Dict com totals e by_user
+        """
+        query = """
+        SELECT
+            GROUPING(uploaded_by) AS user_grouped,
+            uploaded_by,
+            COUNT(*) AS total_uploads,
+            COUNT(*) FILTER (WHERE processed) AS processed,
+            COUNT(*) FILTER (WHERE processing_error <> '') AS with_errors,
+            COALESCE(SUM(domains_extracted), 0) AS total_domains_extracted,
+            COALESCE(SUM(domains_added), 0) AS total_domains_added,
+            COALESCE(SUM(domains_duplicated), 0) AS total_domains_duplicated,
+            COALESCE(SUM(file_size), 0) AS total_file_size
+        FROM pdf_uploads
+        WHERE uploaded_at >= %s
+        GROUP BY GROUPING SETS ((), (uploaded_by))
+        """
+        
+        stats = {'totals': None, 'by_user': {}}
+        
+        for row in db.execute_query(query, (since,)):
+            if row['user_grouped'] == 0:
+                if row['uploaded_by']:
+                    stats['by_user'][row['uploaded_by']] = row['total_uploads']
+            else:
+                stats['totals'] = row
+        
+        return stats
+    
     def update(self, **kwargs) -> bool:
         """Atualiza dados do upload"""
         allowed_fields = ['domains_extracted', 'domains_added', 'domains_duplicated',
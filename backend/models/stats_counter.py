@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BR10 Block Web - Stats Counter Model
+======================================
+Contadores agregados (domínios, clientes, uploads)
+
+Os valores são mantidos por trigger nas tabelas de origem (migração 007);
+ler os contadores custa o mesmo independente do tamanho das tabelas.
+
+Autor: BR10 Team
+Versão: 3.2.0
+Data: 2026-10-17
+"""
+
+from typing import Dict
+
+from backend.database.db import db
+
+
+class StatsCounter:
+    """Acesso à tabela stats_counters"""
+
+    NAMES = (
+        'domains_total',
+        'domains_active',
+        'clients_total',
+        'clients_active',
+        'clients_online',
+        'uploads_total',
+    )
+
+    @classmethod
+    def get_all(cls) -> Dict[str, int]:
+        """Retorna todos os contadores (0 para os ausentes)"""
+        query = "SELECT name, value FROM stats_counters"
+        result = db.execute_query(query)
+        counters = {name: 0 for name in cls.NAMES}
+        counters.update({row['name']: row['value'] for row in result})
+        return counters
+
+    @classmethod
+    def refresh(cls) -> Dict[str, int]:
+        """Recalcula os contadores a partir das tabelas (COUNT completo)"""
+        # get_cursor para garantir commit (execute_query não commita SELECT)
+        with db.get_cursor() as cursor:
+            cursor.execute("SELECT refresh_stats_counters()")
+        return cls.get_all()
@@ -145,6 +145,48 @@ class SyncHistory:
         result = db.execute_query(query, (limit,))
         return [cls.from_dict(row) for row in result]
     
+    @classmethod
+    def get_period_stats(cls, since: datetime, client_id: Optional[int] = None) -> Dict:
+        """
+        Agregados das sincronizações desde `since` (opcionalmente de um
+        cliente) em uma única consulta sobre o índice de synced_at
+        """
+        query = """
+        SELECT
+            COUNT(*) AS total_syncs,
+            COUNT(*) FILTER (WHERE status = 'success') AS successful,
+            COUNT(*) FILTER (WHERE status = 'failed') AS failed,
+            COUNT(*) FILTER (WHERE status = 'pending') AS pending,
+            COALESCE(SUM(domains_sent), 0) AS total_domains_sent,
+            COALESCE(SUM(domains_applied), 0) AS total_domains_applied,
+            COALESCE(FLOOR(AVG(duration_seconds) FILTER (WHERE duration_seconds > 0)), 0)::int AS average_duration,
+            MAX(synced_at) AS last_sync,
+            MAX(synced_at) FILTER (WHERE status = 'success') AS last_success
+        FROM sync_history
+        WHERE synced_at >= %s
+        """
+        params = [since]
+        
+        if client_id is not None:
+            query += " AND client_id = %s"
+            params.append(client_id)
+        
+        result = db.execute_query(query, tuple(params))
+        return dict(result[0])
+    
+    @classmethod
+    def get_recent_failures(cls, client_id: int, since: datetime, limit: int = 5) -> List['SyncHistory']:
+        """Últimas sincronizações com falha de um cliente desde `since`"""
+        query = """
+        SELECT * FROM sync_history
+        WHERE client_id = %s AND status = 'failed' AND synced_at >= %s
+        ORDER BY synced_at DESC
+        LIMIT %s
+        """
+        
+        result = db.execute_query(query, (client_id, since, limit))
+        return [cls.from_dict(row) for row in result]
+    
     def update(self, **kwargs) -> bool:
         """Atualiza dados da sincronização"""
         allowed_fields = ['domains_applied', 'status', 'message', 
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BR10 Block Web - API Log Writer
+=================================
+Gravação assíncrona e em lote da tabela api_logs
+
+As requisições dos clientes DNS apenas enfileiram o registro em memória;
+uma thread em segundo plano drena a fila e grava lotes com um único
+INSERT multi-linha a cada API_LOG_BATCH_SIZE registros ou
+API_LOG_FLUSH_MS milissegundos. A fila é limitada: se o banco não
+acompanhar, novos registros são descartados e contabilizados.
+
+Autor: BR10 Team
+Versão: 3.2.0
+Data: 2026-10-17
+"""
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from psycopg2.extras import execute_values
+
+from backend.config import Config
+from backend.database.db import db
+
+logger = logging.getLogger(__name__)
+
+
+class ApiLogWriter:
+    """Fila limitada + thread de gravação em lote para api_logs"""
+
+    # client_id é resolvido via JOIN para que um cliente removido entre o
+    # enfileiramento e a gravação vire NULL (como o ON DELETE SET NULL)
+    # em vez de derrubar o lote inteiro com erro de chave estrangeira.
+    INSERT_QUERY = """
+    INSERT INTO api_logs (client_id, endpoint, method, ip_address, status_code, duration_ms, created_at)
+    SELECT c.id, v.endpoint, v.method, v.ip_address::inet, v.status_code, v.duration_ms, v.created_at
+    FROM (VALUES %s) AS v(client_id, endpoint, method, ip_address, status_code, duration_ms, created_at)
+    LEFT JOIN dns_clients c ON c.id = v.client_id
+    """
+
+    def __init__(self, max_queue: int, batch_size: int, flush_ms: int):
+        self.batch_size = batch_size
+        self.flush_interval = flush_ms / 1000.0
+        self._queue: 'queue.Queue[Tuple]' = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self._stop = threading.Event()
+        self.dropped = 0
+        self.written = 0
+        self.batches = 0
+        self.failed = 0
+
+    def enqueue(
+        self,
+        client_id: Optional[int],
+        endpoint: str,
+        method: str,
+        ip_address: Optional[str],
+        status_code: int,
+        duration_ms: int
+    ) -> bool:
+        """Enfileira um registro; retorna False se a fila estiver cheia"""
+        self._ensure_started()
+
+        try:
+            self._queue.put_nowait(
+                (client_id, endpoint, method, ip_address, status_code, duration_ms, datetime.now())
+            )
+            return True
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped % 1000 == 1:
+                logger.warning(f"Fila de api_logs cheia: {self.dropped} registros descartados")
+            return False
+
+    def _ensure_started(self) -> None:
+        """Inicia a thread sob demanda (uma por processo, após o fork do Gunicorn)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        with self._thread_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run,
+                name='api-log-writer',
+                daemon=True
+            )
+            self._thread.start()
+
+    def _drain(self, batch: List[Tuple]) -> List[Tuple]:
+        """Completa o lote com o que já estiver na fila, sem bloquear"""
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        """Loop da thread: junta registros até encher o lote ou vencer o intervalo"""
+        while not self._stop.is_set():
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            deadline = time.monotonic() + self.flush_interval
+            batch = self._drain([first])
+            while len(batch) < self.batch_size and not self._stop.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+                self._drain(batch)
+
+            self._write(batch)
+
+    def _write(self, batch: List[Tuple]) -> None:
+        """Grava um lote em uma única transação"""
+        if not batch:
+            return
+
+        try:
+            with db.get_cursor() as cursor:
+                execute_values(cursor, self.INSERT_QUERY, batch, page_size=self.batch_size)
+            self.written += len(batch)
+            self.batches += 1
+        except Exception as e:
+            self.failed += len(batch)
+            logger.error(f"Erro ao gravar lote de {len(batch)} api_logs: {e}")
+
+    def flush(self) -> None:
+        """Grava imediatamente tudo o que estiver na fila"""
+        while True:
+            batch = self._drain([])
+            if not batch:
+                break
+            self._write(batch)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Para a thread e grava o restante da fila"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.flush()
+
+    def get_stats(self) -> Dict:
+        """Retorna contadores da fila"""
+        return {
+            'queued': self._queue.qsize(),
+            'max_queue': self._queue.maxsize,
+            'written': self.written,
+            'batches': self.batches,
+            'dropped': self.dropped,
+            'failed': self.failed
+        }
+
+
+# Instância global do writer
+api_log_writer = ApiLogWriter(
+    Config.API_LOG_QUEUE_SIZE,
+    Config.API_LOG_BATCH_SIZE,
+    Config.API_LOG_FLUSH_MS
+)
+
+atexit.register(api_log_writer.shutdown)
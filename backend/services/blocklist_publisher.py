@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BR10 Block Web - Blocklist Publisher
+======================================
+Artefatos pré-renderizados da lista de bloqueio (json, txt, rpz)
+
+Os três formatos são gerados uma única vez por versão da lista
+(Domain.get_blocklist_version) e mantidos em memória já comprimidos
+(gzip e, se disponível, brotli), junto com o hash SHA-256 do conteúdo.
+Servir uma requisição passa a ser apenas escolher o corpo certo.
+
+A variante compacta (compact=true) é gerada sob demanda a partir do
+conjunto mínimo de cobertura do DomainCompactor: subdomínios de um
+domínio listado são omitidos e o ancestral recebe um registro curinga.
+O curinga bloqueia todos os subdomínios do ancestral, inclusive os que
+não estão na lista: a variante compacta bloqueia mais que a completa.
+
+Autor: BR10 Team
+Versão: 3.2.0
+Data: 2026-10-17
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from backend.models.domain import Domain
+from backend.services.domain_compactor import DomainCompactor
+
+try:
+    import brotli
+except ImportError:  # brotli é opcional; sem ele servimos gzip/identity
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+
+class BlocklistPublisher:
+    """Gera e mantém em memória os artefatos da lista de bloqueio"""
+
+    FORMATS = ('json', 'txt', 'rpz')
+
+    CONTENT_TYPES = {
+        'json': 'application/json',
+        'txt': 'text/plain',
+        'rpz': 'text/plain',
+    }
+
+    # Ordem de preferência em caso de empate na qualidade do Accept-Encoding
+    PREFERRED_ENCODINGS = ('br', 'gzip')
+
+    GZIP_LEVEL = 9
+    BROTLI_QUALITY = 9
+
+    _lock = threading.Lock()
+    # (versão, variante ('full' ou 'compact') -> formato -> artefato),
+    # substituída por inteiro sob o lock e lida sem lock como um único valor
+    _published: Tuple[Optional[int], Dict[str, Dict[str, Dict]]] = (None, {})
+
+    @staticmethod
+    def render_txt(domains: List[str]) -> str:
+        """Renderiza lista em texto plano, um domínio por linha"""
+        return '\n'.join(domains)
+
+    @staticmethod
+    def rpz_header(
+        version: int,
+        generated_at: datetime,
+        total: Optional[int] = None,
+        compaction: Optional[Dict] = None
+    ) -> str:
+        """Cabeçalho da zona RPZ (SOA/NS) para Unbound"""
+        rpz_header = [f'; BR10 Block Web - RPZ Zone File']
+        if total is not None:
+            rpz_header.append(f'; Total domains: {total}')
+        if compaction is not None:
+            rpz_header.append(
+                f"; Compact: {compaction['covered']} subdomains covered by "
+                f"{compaction['wildcards']} wildcards ({compaction['savings_percent']}% fewer domains)"
+            )
+            rpz_header.append(
+                '; Wildcards block every subdomain of their parent, including unlisted ones'
+            )
+        rpz_header += [
+            f'; Blocklist version: {version}',
+            f'; Generated: {generated_at.isoformat()}',
+            f'$ORIGIN br10block.rpz.',
+            f'$TTL 60',
+            f'@ IN SOA localhost. root.localhost. ({int(generated_at.timestamp())} 3600 900 604800 60)',
+            f'@ IN NS localhost.',
+            '',
+        ]
+        return '\n'.join(rpz_header)
+
+    @classmethod
+    def render_rpz(
+        cls,
+        domains: List[str],
+        version: int,
+        generated_at: datetime,
+        wildcards: Optional[Set[str]] = None,
+        compaction: Optional[Dict] = None
+    ) -> str:
+        """
+        Renderiza zona RPZ completa com cabeçalho para Unbound.
+        Domínios em `wildcards` também bloqueiam os subdomínios (*.dominio).
+        """
+        wildcards = wildcards or set()
+        rpz_lines = []
+        for domain in domains:
+            rpz_lines.append(f'{domain} CNAME .')
+            if domain in wildcards:
+                rpz_lines.append(f'*.{domain} CNAME .')
+        header = cls.rpz_header(version, generated_at, len(domains), compaction)
+        return '\n'.join([header] + rpz_lines)
+
+    @staticmethod
+    def render_json(
+        domains: List[str],
+        version: int,
+        generated_at: datetime,
+        wildcards: Optional[Set[str]] = None,
+        compaction: Optional[Dict] = None
+    ) -> str:
+        """Renderiza documento JSON no mesmo formato de /api/v1/client/domains"""
+        document = {
+            'success': True,
+            'total': len(domains),
+            'version': version,
+            'domains': domains,
+            'timestamp': generated_at.isoformat()
+        }
+        if compaction is not None:
+            document['compact'] = True
+            document['wildcards'] = sorted(wildcards or ())
+            document['compaction'] = compaction
+        return json.dumps(document, separators=(',', ':'))
+
+    @classmethod
+    def _encode(cls, body: bytes) -> Dict[str, bytes]:
+        """Gera as variantes comprimidas de um corpo"""
+        bodies = {
+            'identity': body,
+            'gzip': gzip.compress(body, compresslevel=cls.GZIP_LEVEL, mtime=0)
+        }
+        if brotli is not None:
+            bodies['br'] = brotli.compress(body, quality=cls.BROTLI_QUALITY)
+        return bodies
+
+    @classmethod
+    def _build(cls, version: int, compact: bool = False) -> Dict[str, Dict]:
+        """Lê a lista ativa uma vez e gera os três artefatos"""
+        start = datetime.now()
+        domains = Domain.get_active_domains_list()
+        wildcards: Set[str] = set()
+        compaction = None
+
+        if compact:
+            domains, wildcards, compaction = DomainCompactor.compact(domains)
+
+        rendered = {
+            'json': cls.render_json(domains, version, start, wildcards, compaction),
+            'txt': cls.render_txt(domains),
+            'rpz': cls.render_rpz(domains, version, start, wildcards, compaction),
+        }
+
+        artifacts = {}
+        for format_type, text in rendered.items():
+            body = text.encode('utf-8')
+            artifacts[format_type] = {
+                'version': version,
+                'total': len(domains),
+                'content_type': cls.CONTENT_TYPES[format_type],
+                'sha256': hashlib.sha256(body).hexdigest(),
+                'generated_at': start,
+                'compaction': compaction,
+                'bodies': cls._encode(body)
+            }
+
+        duration_ms = int((datetime.now() - start).total_seconds() * 1000)
+        if compaction is not None:
+            logger.info(
+                f"Artefatos compactos da lista de bloqueio gerados: versão {version}, "
+                f"{compaction['total']} -> {len(domains)} domínios "
+                f"({compaction['savings_percent']}% menos) em {duration_ms}ms"
+            )
+        else:
+            logger.info(
+                f"Artefatos da lista de bloqueio gerados: versão {version}, "
+                f"{len(domains)} domínios em {duration_ms}ms"
+            )
+        return artifacts
+
+    @classmethod
+    def get_artifact(cls, format_type: str, version: int, compact: bool = False) -> Dict:
+        """
+        Retorna o artefato de um formato para a versão informada (ou mais
+        nova), regenerando todos os formatos da variante (completa ou
+        compacta) quando a versão avançou.
+
+        A versão publicada nunca retrocede: uma requisição que leu uma
+        versão anterior recebe o artefato já publicado (o campo 'version'
+        do artefato indica a versão servida).
+        """
+        if format_type not in cls.FORMATS:
+            format_type = 'json'
+        variant = 'compact' if compact else 'full'
+
+        published_version, artifacts = cls._published
+        if variant in artifacts and published_version >= version:
+            return artifacts[variant][format_type]
+
+        with cls._lock:
+            # Outra thread pode ter publicado enquanto esperávamos o lock
+            published_version, artifacts = cls._published
+            if published_version is None or version > published_version:
+                published_version, artifacts = version, {}
+            if variant not in artifacts:
+                artifacts = {**artifacts, variant: cls._build(published_version, compact)}
+                cls._published = (published_version, artifacts)
+
+        return artifacts[variant][format_type]
+
+    @classmethod
+    def negotiate_encoding(cls, accept_encodings, available: Dict[str, bytes]) -> str:
+        """
+        Escolhe a codificação a partir do Accept-Encoding da requisição
+        (objeto werkzeug Accept). Sem header, responde sem compressão.
+        """
+        best = 'identity'
+        best_quality = 0
+
+        for encoding in cls.PREFERRED_ENCODINGS:
+            if encoding not in available:
+                continue
+            quality = accept_encodings.quality(encoding)
+            if quality > best_quality:
+                best = encoding
+                best_quality = quality
+
+        return best
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Descarta os artefatos em memória"""
+        with cls._lock:
+            cls._published = (None, {})
+
+    @classmethod
+    def get_info(cls) -> Dict:
+        """Retorna informações dos artefatos em memória (e a economia da variante compacta)"""
+        version, published = cls._published
+        return {
+            'version': version,
+            'artifacts': {
+                variant: {
+                    format_type: {
+                        'total': artifact['total'],
+                        'sha256': artifact['sha256'],
+                        'generated_at': artifact['generated_at'].isoformat(),
+                        'sizes': {enc: len(body) for enc, body in artifact['bodies'].items()}
+                    }
+                    for format_type, artifact in artifacts.items()
+                }
+                for variant, artifacts in published.items()
+            },
+            'compaction': published.get('compact', {}).get('json', {}).get('compaction')
+        }
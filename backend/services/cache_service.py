@@ -13,7 +13,7 @@ Data: 2026-02-08
 import json
 import logging
 from functools import wraps
-from typing import Any, Callable, Optional, Union
+from typing import Any, Callable, Dict, Optional, Union
 
 import redis
 
@@ -186,6 +186,104 @@ class CacheService:
         except:
             return None
     
+    def hset(self, key: str, field: str, value: str) -> bool:
+        """Define campo de um hash"""
+        if not self.is_available:
+            return False
+        
+        try:
+            self._redis_client.hset(key, field, value)
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao definir campo {field} do hash {key}: {e}")
+            return False
+    
+    def hmget(self, key: str, fields: list) -> list:
+        """Busca vários campos de um hash (None para campos ausentes)"""
+        if not self.is_available or not fields:
+            return [None] * len(fields)
+        
+        try:
+            return self._redis_client.hmget(key, fields)
+        except Exception as e:
+            logger.error(f"Erro ao buscar campos do hash {key}: {e}")
+            return [None] * len(fields)
+    
+    def set_if_absent(self, key: str, value: str, ttl: int) -> bool:
+        """Define a chave apenas se ela não existir (SET NX EX); False se já existir"""
+        if not self.is_available:
+            return False
+        
+        try:
+            return bool(self._redis_client.set(key, value, nx=True, ex=ttl))
+        except Exception as e:
+            logger.error(f"Erro ao definir {key} (NX): {e}")
+            return False
+    
+    def push_capped(self, items: Dict[str, list], maxlen: int) -> bool:
+        """
+        Insere valores no início de várias listas e as corta em maxlen
+        (buffer circular), em um único pipeline
+        """
+        if not self.is_available or not items:
+            return False
+        
+        try:
+            pipe = self._redis_client.pipeline(transaction=False)
+            for key, values in items.items():
+                if values:
+                    pipe.lpush(key, *values)
+                    pipe.ltrim(key, 0, maxlen - 1)
+            pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao gravar listas limitadas: {e}")
+            return False
+    
+    def lrange_many(self, keys: list, count: int) -> list:
+        """Primeiros `count` itens de várias listas, em um único pipeline"""
+        if not self.is_available or not keys:
+            return [[] for _ in keys]
+        
+        try:
+            pipe = self._redis_client.pipeline(transaction=False)
+            for key in keys:
+                pipe.lrange(key, 0, count - 1)
+            return pipe.execute()
+        except Exception as e:
+            logger.error(f"Erro ao ler listas: {e}")
+            return [[] for _ in keys]
+    
+    def publish(self, channel: str, message: str) -> bool:
+        """Publica mensagem em um canal pub/sub"""
+        if not self.is_available:
+            return False
+        
+        try:
+            self._redis_client.publish(channel, message)
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao publicar no canal {channel}: {e}")
+            return False
+    
+    def subscribe(self, channel: str):
+        """
+        Assina um canal pub/sub
+        
+        Returns:
+            Objeto PubSub do redis-py ou None se Redis indisponível
+        """
+        if not self.is_available:
+            return None
+        
+        try:
+            pubsub = self._redis_client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(channel)
+            return pubsub
+        except Exception as e:
+            logger.error(f"Erro ao assinar canal {channel}: {e}")
+            return None
+    
     def flush_all(self) -> bool:
         """Limpa todo o cache (use com cuidado!)"""
         if not self.is_available:
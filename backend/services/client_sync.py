@@ -10,25 +10,315 @@ Versão: 3.0.0
 Data: 2026-02-08
 """
 
+import gzip
+import json
 import logging
+import threading
 import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Deque, Dict, Iterator, List, Optional, Set, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from backend.config import Config
 from backend.models.dns_client import DNSClient
 from backend.models.domain import Domain
+from backend.models.domain_change import DomainChange
 from backend.models.sync_history import SyncHistory
+from backend.services.cache_service import cached
 
 logger = logging.getLogger(__name__)
 
 
+# Versão do protocolo de push registrada em dns_clients.metadata['push_protocol']
+# quando o cliente confirma um push informando a versão aplicada
+PUSH_PROTOCOL_VERSION = 2
+
+
+class PushPayloads:
+    """
+    Corpos de push de um fan-out, na versão atual da lista
+    
+    Snapshot e deltas (um por versão de origem) são serializados e
+    comprimidos uma única vez e compartilhados entre os clientes; a
+    identificação da sincronização vai no cabeçalho X-Sync-Id. Clientes
+    que ainda não confirmaram versão recebem o corpo legado (snapshot sem
+    compressão, com sync_id no JSON).
+    """
+    
+    GZIP_LEVEL = 6
+    
+    def __init__(self, domains: Optional[List[str]] = None):
+        # Lista explícita: sempre snapshot com esses domínios
+        self.version = Domain.get_blocklist_version()
+        self.timestamp = datetime.now().isoformat()
+        self._domains = domains
+        self._floor: Optional[int] = None
+        self._bodies: Dict[Tuple, Optional[Tuple[bytes, Dict]]] = {}
+        self._gzipped: Dict[Tuple, bytes] = {}
+    
+    def _full(self) -> Tuple[bytes, Dict]:
+        """Snapshot completo (carregado na primeira vez que um cliente precisa)"""
+        key = ('full',)
+        if key not in self._bodies:
+            domains = self._domains if self._domains is not None else Domain.get_active_domains_list()
+            body = json.dumps({
+                'mode': 'full',
+                'version': self.version,
+                'domains': domains,
+                'total': len(domains),
+                'timestamp': self.timestamp
+            }).encode('utf-8')
+            self._bodies[key] = (body, {
+                'mode': 'full',
+                'version': self.version,
+                'sent': len(domains)
+            })
+        return self._bodies[key]
+    
+    def _delta(self, since: int) -> Optional[Tuple[bytes, Dict]]:
+        """Delta desde `since`; None quando só o snapshot serve"""
+        if self._domains is not None or since > self.version:
+            return None
+        
+        if self._floor is None:
+            self._floor = DomainChange.get_changelog_floor()
+        if since < self._floor:
+            return None
+        
+        key = ('delta', since)
+        if key not in self._bodies:
+            added, removed = DomainChange.get_net_changes_since(
+                since,
+                self.version,
+                limit=Config.DELTA_MAX_CHANGES + 1
+            )
+            if len(added) + len(removed) > Config.DELTA_MAX_CHANGES:
+                self._bodies[key] = None
+            else:
+                body = json.dumps({
+                    'mode': 'delta',
+                    'version': self.version,
+                    'since': since,
+                    'added': added,
+                    'removed': removed,
+                    'total_added': len(added),
+                    'total_removed': len(removed),
+                    'timestamp': self.timestamp
+                }).encode('utf-8')
+                self._bodies[key] = (body, {
+                    'mode': 'delta',
+                    'version': self.version,
+                    'since': since,
+                    'sent': len(added) + len(removed),
+                    'added': len(added),
+                    'removed': len(removed)
+                })
+        return self._bodies[key]
+    
+    def select(self, client: DNSClient, force_full: bool = False) -> Dict:
+        """Descrição do push para o cliente (modo, versões, quantidade enviada)"""
+        since = client.metadata.get('push_version')
+        if not force_full and isinstance(since, int) and ClientSyncService.supports_delta(client):
+            delta = self._delta(since)
+            if delta is not None:
+                return dict(delta[1])
+        return dict(self._full()[1])
+    
+    def encode(self, client: DNSClient, info: Dict, sync_id: int) -> Tuple[bytes, Dict[str, str]]:
+        """Corpo e cabeçalhos do envio descrito por `info`"""
+        key = ('delta', info['since']) if info['mode'] == 'delta' else ('full',)
+        body = self._bodies[key][0]
+        headers = {
+            'Content-Type': 'application/json',
+            'X-Sync-Id': str(sync_id),
+            'X-Blocklist-Version': str(self.version)
+        }
+        
+        if not ClientSyncService.supports_delta(client):
+            # Corpo legado: sync_id dentro do JSON, sem compressão
+            return body[:-1] + f', "sync_id": {sync_id}}}'.encode('utf-8'), headers
+        
+        if Config.SYNC_PUSH_GZIP and len(body) >= Config.SYNC_PUSH_GZIP_MIN_BYTES:
+            if key not in self._gzipped:
+                self._gzipped[key] = gzip.compress(body, compresslevel=self.GZIP_LEVEL, mtime=0)
+            body = self._gzipped[key]
+            headers['Content-Encoding'] = 'gzip'
+        
+        return body, headers
+
+
 class ClientSyncService:
     """Serviço de sincronização com clientes DNS"""
     
     DEFAULT_TIMEOUT = 30  # segundos
     
+    _session: Optional[requests.Session] = None
+    _session_lock = threading.Lock()
+    
+    @classmethod
+    def get_session(cls) -> requests.Session:
+        """
+        Sessão HTTP compartilhada pelos pushes: conexões keep-alive
+        reaproveitadas entre clientes e entre fan-outs (uma por processo)
+        """
+        if cls._session is not None:
+            return cls._session
+        
+        with cls._session_lock:
+            if cls._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=Config.SYNC_PUSH_POOL_HOSTS,
+                    pool_maxsize=Config.SYNC_PUSH_CONCURRENCY
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers['User-Agent'] = 'BR10-Server/3.0'
+                cls._session = session
+        
+        return cls._session
+    
+    @staticmethod
+    def supports_delta(client: DNSClient) -> bool:
+        """Cliente já confirmou um push com versão (protocolo delta + gzip)"""
+        return client.metadata.get('push_protocol', 1) >= PUSH_PROTOCOL_VERSION
+    
+    @staticmethod
+    def _start_push(
+        client: DNSClient,
+        payloads: 'PushPayloads',
+        force_full: bool = False
+    ) -> Tuple[SyncHistory, Dict, bytes, Dict[str, str]]:
+        """Escolhe o corpo do push, cria o registro de sincronização e codifica o envio"""
+        info = payloads.select(client, force_full)
+        
+        sync = SyncHistory.create(
+            client_id=client.id,
+            domains_sent=info['sent'],
+            status='pending',
+            message=f"Sincronização push iniciada ({info['mode']})",
+            metadata=info
+        )
+        
+        body, headers = payloads.encode(client, info, sync.id)
+        return sync, info, body, headers
+    
+    @staticmethod
+    def _send_push(
+        client: DNSClient,
+        body: bytes,
+        headers: Dict[str, str],
+        timeout: float,
+        session: requests.Session
+    ) -> Dict:
+        """
+        Envia o push a um cliente. Só faz a requisição HTTP, sem acesso ao
+        banco, para poder rodar nas threads do fan-out.
+        
+        Returns:
+            Dict com success e duration; em caso de sucesso, o que o cliente
+            informou (domains_applied, version, total); em caso de falha,
+            error e mismatch (cliente em versão diferente da esperada)
+        """
+        start_time = time.time()
+        
+        try:
+            response = session.post(
+                client.metadata['push_endpoint'],
+                data=body,
+                headers={**headers, 'X-API-Key': client.api_key},
+                timeout=(Config.SYNC_PUSH_CONNECT_TIMEOUT, timeout)
+            )
+            duration = int(time.time() - start_time)
+            
+            if response.status_code == 200:
+                result = response.json()
+                version = result.get('version')
+                return {
+                    'success': True,
+                    'domains_applied': result.get('domains_applied'),
+                    'version': version if isinstance(version, int) else None,
+                    'total': result.get('total'),
+                    'duration': duration
+                }
+            
+            return {
+                'success': False,
+                'mismatch': response.status_code == 409,
+                'error': f"HTTP {response.status_code}: {response.text[:500]}",
+                'duration': duration
+            }
+        
+        except requests.exceptions.Timeout:
+            return {
+                'success': False,
+                'error': 'Timeout na conexão com cliente',
+                'duration': int(time.time() - start_time)
+            }
+        
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'duration': int(time.time() - start_time)
+            }
+    
+    @staticmethod
+    def _finish_push(client: DNSClient, sync: SyncHistory, info: Dict, outcome: Dict) -> Dict:
+        """Registra o resultado do push na sincronização e no cliente"""
+        if outcome['success']:
+            domains_applied = outcome['domains_applied']
+            if domains_applied is None:
+                domains_applied = info['sent']
+            sync.mark_success(domains_applied, outcome['duration'])
+            
+            # Total de domínios no cliente após aplicar
+            domains_count = outcome.get('total')
+            if not isinstance(domains_count, int):
+                if info['mode'] == 'full':
+                    domains_count = domains_applied
+                else:
+                    domains_count = max(0, (client.domains_count or 0) + info['added'] - info['removed'])
+            
+            # Versão confirmada: próximos pushes vão em delta a partir dela
+            ack = {}
+            if outcome.get('version') is not None:
+                ack = {'push_version': outcome['version'], 'push_protocol': PUSH_PROTOCOL_VERSION}
+            client.update_sync_status(domains_count, 'success', extra_metadata=ack)
+            
+            logger.info(
+                f"Push {info['mode']} bem-sucedido para {client.name}: "
+                f"{domains_applied} domínios (versão {info['version']})"
+            )
+            
+            return {
+                'success': True,
+                'sync_id': sync.id,
+                'mode': info['mode'],
+                'version': info['version'],
+                'domains_sent': info['sent'],
+                'domains_applied': domains_applied,
+                'duration': outcome['duration']
+            }
+        
+        sync.mark_failed(outcome['error'], outcome.get('duration'))
+        if outcome.get('mismatch'):
+            # Versão confirmada não vale mais: próximo push é snapshot completo
+            client.update(metadata_merge={'push_version': None})
+        logger.error(f"Erro no push para {client.name}: {outcome['error']}")
+        
+        return {
+            'success': False,
+            'error': outcome['error'],
+            'sync_id': sync.id,
+            'mode': info['mode'],
+            'mismatch': bool(outcome.get('mismatch'))
+        }
+    
     @staticmethod
     def push_domains_to_client(
         client: DNSClient,
@@ -38,27 +328,22 @@ class ClientSyncService:
         """
         Envia domínios para um cliente via push (se cliente suportar)
         
+        Sem `domains`, envia a lista ativa: em delta desde a versão que o
+        cliente confirmou, quando possível, com snapshot completo se ele
+        responder 409 (versão divergente).
+        
         Returns:
             Dict com resultado da operação
         """
         try:
-            start_time = time.time()
-            
-            # Se não forneceu domínios, buscar ativos
-            if domains is None:
-                domains = Domain.get_active_domains_list()
-            
-            # Criar registro de sincronização
-            sync = SyncHistory.create(
-                client_id=client.id,
-                domains_sent=len(domains),
-                status='pending',
-                message='Sincronização push iniciada'
-            )
-            
             # Verificar se cliente tem endpoint configurado
-            push_endpoint = client.metadata.get('push_endpoint')
-            if not push_endpoint:
+            if not client.metadata.get('push_endpoint'):
+                sync = SyncHistory.create(
+                    client_id=client.id,
+                    domains_sent=0,
+                    status='pending',
+                    message='Sincronização push iniciada'
+                )
                 sync.mark_failed("Cliente não possui endpoint de push configurado")
                 return {
                     'success': False,
@@ -66,87 +351,176 @@ class ClientSyncService:
                     'sync_id': sync.id
                 }
             
-            # Preparar payload
-            payload = {
-                'domains': domains,
-                'total': len(domains),
-                'timestamp': datetime.now().isoformat(),
-                'sync_id': sync.id
-            }
-            
-            # Headers com API key
-            headers = {
-                'Content-Type': 'application/json',
-                'X-API-Key': client.api_key,
-                'User-Agent': 'BR10-Server/3.0'
-            }
+            payloads = PushPayloads(domains)
+            session = ClientSyncService.get_session()
             
-            # Enviar requisição
-            response = requests.post(
-                push_endpoint,
-                json=payload,
-                headers=headers,
-                timeout=timeout
-            )
+            sync, info, body, headers = ClientSyncService._start_push(client, payloads)
+            outcome = ClientSyncService._send_push(client, body, headers, timeout, session)
+            result = ClientSyncService._finish_push(client, sync, info, outcome)
             
-            duration = int(time.time() - start_time)
+            if result.get('mismatch') and info['mode'] == 'delta':
+                sync, info, body, headers = ClientSyncService._start_push(client, payloads, force_full=True)
+                outcome = ClientSyncService._send_push(client, body, headers, timeout, session)
+                result = ClientSyncService._finish_push(client, sync, info, outcome)
             
-            if response.status_code == 200:
-                result = response.json()
-                domains_applied = result.get('domains_applied', len(domains))
-                
-                # Atualizar sincronização
-                sync.mark_success(domains_applied, duration)
-                
-                # Atualizar cliente
-                client.update_sync_status(domains_applied, 'success')
+            return result
+        
+        except Exception as e:
+            logger.error(f"Erro no push para {client.name}: {e}")
+            return {'success': False, 'error': str(e)}
+    
+    @staticmethod
+    def iter_push_results(
+        clients: List[DNSClient],
+        domains: Optional[List[str]] = None,
+        concurrency: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> Iterator[Dict]:
+        """
+        Fan-out do push: envia a todos os clientes com até `concurrency`
+        requisições simultâneas e produz o resultado de cada cliente assim
+        que ele termina (clientes sem endpoint primeiro, como 'skipped').
+        
+        Cada cliente tem prazo de `timeout` segundos a partir do início do
+        seu envio; ao estourar, é reportado como falha sem esperar a
+        requisição. Os registros no banco e a montagem dos corpos são
+        feitos na thread que consome o gerador; as threads do pool só
+        fazem HTTP. Cliente que recusa o delta (409) volta para a fila com
+        snapshot completo.
+        """
+        concurrency = max(1, concurrency or Config.SYNC_PUSH_CONCURRENCY)
+        timeout = timeout or Config.SYNC_PUSH_TIMEOUT
+        
+        # (cliente, forçar snapshot completo)
+        pending: Deque[Tuple[DNSClient, bool]] = deque()
+        for client in clients:
+            if client.metadata.get('push_endpoint'):
+                pending.append((client, False))
+            else:
+                yield {
+                    'client_id': client.id,
+                    'client_name': client.name,
+                    'status': 'skipped',
+                    'reason': 'No push endpoint'
+                }
+        
+        if not pending:
+            return
+        
+        payloads = PushPayloads(domains)
+        session = ClientSyncService.get_session()
+        
+        executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='sync-push')
+        running: Dict[Future, Tuple[DNSClient, SyncHistory, Dict, float]] = {}
+        # Requisições que estouraram o prazo mas ainda ocupam uma thread
+        overdue: Set[Future] = set()
+        
+        try:
+            while pending or running:
+                overdue = {f for f in overdue if not f.done()}
                 
-                logger.info(f"Push bem-sucedido para {client.name}: {domains_applied} domínios")
+                while pending and len(running) + len(overdue) < concurrency:
+                    client, force_full = pending.popleft()
+                    try:
+                        sync, info, body, headers = ClientSyncService._start_push(
+                            client, payloads, force_full
+                        )
+                    except Exception as e:
+                        logger.error(f"Erro ao preparar push para {client.name}: {e}")
+                        yield {
+                            'client_id': client.id,
+                            'client_name': client.name,
+                            'status': 'failed',
+                            'sync_id': None,
+                            'error': str(e)
+                        }
+                        continue
+                    
+                    future = executor.submit(
+                        ClientSyncService._send_push, client, body, headers, timeout, session
+                    )
+                    running[future] = (client, sync, info, time.monotonic() + timeout)
                 
-                return {
-                    'success': True,
-                    'sync_id': sync.id,
-                    'domains_sent': len(domains),
-                    'domains_applied': domains_applied,
-                    'duration': duration
-                }
-            else:
-                error_msg = f"HTTP {response.status_code}: {response.text}"
-                sync.mark_failed(error_msg, duration)
+                if not running:
+                    if overdue:
+                        wait(overdue, return_when=FIRST_COMPLETED)
+                    continue
                 
-                logger.error(f"Erro no push para {client.name}: {error_msg}")
+                next_deadline = min(deadline for _, _, _, deadline in running.values())
+                wait(
+                    set(running) | overdue,
+                    timeout=max(0.0, next_deadline - time.monotonic()),
+                    return_when=FIRST_COMPLETED
+                )
                 
-                return {
-                    'success': False,
-                    'error': error_msg,
-                    'sync_id': sync.id
-                }
-        
-        except requests.exceptions.Timeout:
-            error_msg = "Timeout na conexão com cliente"
-            sync.mark_failed(error_msg)
-            logger.error(f"Timeout no push para {client.name}")
-            return {'success': False, 'error': error_msg, 'sync_id': sync.id}
+                now = time.monotonic()
+                for future in list(running):
+                    client, sync, info, deadline = running[future]
+                    
+                    if future.done():
+                        outcome = future.result()
+                    elif now >= deadline:
+                        outcome = {
+                            'success': False,
+                            'error': f"Prazo de {timeout:g}s excedido no push",
+                            'duration': int(timeout)
+                        }
+                        overdue.add(future)
+                    else:
+                        continue
+                    
+                    del running[future]
+                    
+                    try:
+                        result = ClientSyncService._finish_push(client, sync, info, outcome)
+                    except Exception as e:
+                        logger.error(f"Erro ao registrar resultado do push para {client.name}: {e}")
+                        result = {'success': False, 'sync_id': sync.id, 'error': str(e)}
+                    
+                    if result.get('mismatch') and info['mode'] == 'delta':
+                        logger.info(f"{client.name} recusou o delta; reenviando snapshot completo")
+                        pending.appendleft((client, True))
+                        continue
+                    
+                    yield {
+                        'client_id': client.id,
+                        'client_name': client.name,
+                        'status': 'success' if result['success'] else 'failed',
+                        'sync_id': result.get('sync_id'),
+                        'mode': info['mode'],
+                        'domains_sent': info['sent'],
+                        'domains_applied': result.get('domains_applied'),
+                        'duration': result.get('duration', outcome.get('duration')),
+                        'error': result.get('error')
+                    }
         
-        except Exception as e:
-            error_msg = str(e)
-            sync.mark_failed(error_msg)
-            logger.error(f"Erro no push para {client.name}: {e}")
-            return {'success': False, 'error': error_msg, 'sync_id': sync.id}
+        finally:
+            # Consumidor parou antes do fim: pushes em andamento ficam sem resultado
+            for client, sync, _, _ in running.values():
+                try:
+                    sync.mark_failed('Fan-out interrompido antes do resultado')
+                except Exception as e:
+                    logger.error(f"Erro ao encerrar push para {client.name}: {e}")
+            executor.shutdown(wait=False, cancel_futures=True)
     
     @staticmethod
     def push_to_all_clients(
         active_only: bool = True,
-        parallel: bool = False
+        parallel: bool = True
     ) -> Dict:
         """
         Envia domínios para todos os clientes
         
+        Args:
+            active_only: Apenas clientes ativos
+            parallel: Envio concorrente (Config.SYNC_PUSH_CONCURRENCY);
+                False envia um cliente por vez
+        
         Returns:
             Dict com resumo das operações
         """
+        start_time = time.time()
         clients = DNSClient.get_all(active_only=active_only)
-        domains = Domain.get_active_domains_list()
         
         results = {
             'total_clients': len(clients),
@@ -156,51 +530,36 @@ class ClientSyncService:
             'details': []
         }
         
-        for client in clients:
-            # Verificar se cliente suporta push
-            if not client.metadata.get('push_endpoint'):
-                results['skipped'] += 1
-                results['details'].append({
-                    'client_id': client.id,
-                    'client_name': client.name,
-                    'status': 'skipped',
-                    'reason': 'No push endpoint'
-                })
-                continue
-            
-            # Enviar domínios
-            result = ClientSyncService.push_domains_to_client(client, domains)
-            
-            if result['success']:
-                results['success'] += 1
-                status = 'success'
-            else:
-                results['failed'] += 1
-                status = 'failed'
-            
-            results['details'].append({
-                'client_id': client.id,
-                'client_name': client.name,
-                'status': status,
-                'sync_id': result.get('sync_id'),
-                'error': result.get('error')
-            })
+        for detail in ClientSyncService.iter_push_results(
+            clients,
+            concurrency=None if parallel else 1
+        ):
+            results[detail['status']] += 1
+            results['details'].append(detail)
+        
+        results['duration'] = round(time.time() - start_time, 3)
         
         logger.info(f"Push para todos os clientes: {results['success']} sucesso, "
-                   f"{results['failed']} falhas, {results['skipped']} ignorados")
+                   f"{results['failed']} falhas, {results['skipped']} ignorados "
+                   f"em {results['duration']}s")
         
         return results
     
     @staticmethod
     def check_client_health(
         client: DNSClient,
-        timeout: int = 10
+        timeout: int = 10,
+        session: Optional[requests.Session] = None
     ) -> Dict:
         """
         Verifica saúde de um cliente
         
+        Args:
+            session: Sessão HTTP a reutilizar (varredura da frota)
+        
         Returns:
-            Dict com status de saúde
+            Dict com status de saúde: online, error (respondeu com erro),
+            timeout ou unreachable (conexão recusada / host inacessível)
         """
         try:
             health_endpoint = client.metadata.get('health_endpoint')
@@ -212,7 +571,7 @@ class ClientSyncService:
             
             start_time = time.time()
             
-            response = requests.get(
+            response = (session or requests).get(
                 health_endpoint,
                 headers={'X-API-Key': client.api_key},
                 timeout=timeout
@@ -242,6 +601,13 @@ class ClientSyncService:
                 'error': 'Timeout na conexão'
             }
         
+        except requests.exceptions.ConnectionError as e:
+            return {
+                'success': False,
+                'status': 'unreachable',
+                'error': str(e)
+            }
+        
         except Exception as e:
             return {
                 'success': False,
@@ -286,35 +652,30 @@ class ClientSyncService:
         return offline
     
     @staticmethod
+    @cached('stats:syncs', ttl=Config.CACHE_TTL_STATS,
+            key_builder=lambda days=7: f'stats:syncs:{days}')
     def get_sync_statistics(days: int = 7) -> Dict:
         """
-        Retorna estatísticas de sincronização
+        Retorna estatísticas de sincronização (agregadas no banco, em
+        cache por período)
         
         Returns:
             Dict com estatísticas
         """
         threshold = datetime.now() - timedelta(days=days)
-        recent_syncs = SyncHistory.get_recent(limit=1000)
-        
-        # Filtrar por período
-        period_syncs = [s for s in recent_syncs if s.synced_at >= threshold]
+        period = SyncHistory.get_period_stats(threshold)
         
         stats = {
             'period_days': days,
-            'total_syncs': len(period_syncs),
-            'successful': len([s for s in period_syncs if s.status == 'success']),
-            'failed': len([s for s in period_syncs if s.status == 'failed']),
-            'pending': len([s for s in period_syncs if s.status == 'pending']),
-            'total_domains_sent': sum(s.domains_sent for s in period_syncs),
-            'total_domains_applied': sum(s.domains_applied for s in period_syncs),
-            'average_duration': 0
+            'total_syncs': period['total_syncs'],
+            'successful': period['successful'],
+            'failed': period['failed'],
+            'pending': period['pending'],
+            'total_domains_sent': period['total_domains_sent'],
+            'total_domains_applied': period['total_domains_applied'],
+            'average_duration': period['average_duration']
         }
         
-        # Calcular duração média
-        durations = [s.duration_seconds for s in period_syncs if s.duration_seconds]
-        if durations:
-            stats['average_duration'] = sum(durations) // len(durations)
-        
         # Taxa de sucesso
         if stats['total_syncs'] > 0:
             stats['success_rate'] = (stats['successful'] / stats['total_syncs']) * 100
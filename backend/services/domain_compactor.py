@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BR10 Block Web - Domain Compactor
+===================================
+Compactação da lista de bloqueio por cobertura de subdomínios
+
+Um domínio cujo ancestral também está na lista (a.x.bet com x.bet) é
+redundante quando o ancestral é publicado com um registro curinga
+(*.x.bet). A compactação calcula o conjunto mínimo de cobertura: os
+domínios sem nenhum ancestral na lista, e quais deles precisam do
+curinga por cobrirem subdomínios listados.
+
+A lista ativa funciona como uma trie de rótulos invertidos implícita:
+cada nome é um nó terminal e percorrer os sufixos de um domínio
+(bet -> x.bet -> a.x.bet) é descer pela trie a partir da raiz. O primeiro
+sufixo presente no conjunto é o ancestral de topo que cobre o domínio.
+Assim não é preciso um dicionário por rótulo, e a memória fica em
+O(n) sobre strings que já estão carregadas.
+
+Autor: BR10 Team
+Versão: 3.2.0
+Data: 2026-10-17
+"""
+
+import logging
+from typing import Dict, List, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class DomainCompactor:
+    """Conjunto mínimo de cobertura da lista de bloqueio"""
+
+    @staticmethod
+    def covering_parent(domain: str, active: Set[str]) -> str:
+        """
+        Ancestral de topo de `domain` presente em `active`, ou string
+        vazia se nenhum ancestral estiver bloqueado
+        """
+        pos = len(domain)
+        while pos > 0:
+            pos = domain.rfind('.', 0, pos)
+            if pos <= 0:
+                break
+            suffix = domain[pos + 1:]
+            if suffix in active:
+                return suffix
+        return ''
+
+    @classmethod
+    def compact(cls, domains: List[str]) -> Tuple[List[str], Set[str], Dict]:
+        """
+        Remove os domínios cobertos por um ancestral também listado
+
+        Returns:
+            (domínios mantidos na ordem original,
+             domínios mantidos que cobrem subdomínios — recebem curinga,
+             estatísticas de economia)
+        """
+        active = set(domains)
+        kept: List[str] = []
+        wildcards: Set[str] = set()
+
+        for domain in domains:
+            parent = cls.covering_parent(domain, active)
+            if parent:
+                wildcards.add(parent)
+            else:
+                kept.append(domain)
+
+        total = len(active)
+        removed = total - len(kept)
+        stats = {
+            'total': total,
+            'compact_total': len(kept),
+            'covered': removed,
+            'wildcards': len(wildcards),
+            'savings_percent': round(removed * 100 / total, 2) if total else 0.0
+        }
+
+        logger.debug(
+            f"Compactação: {total} -> {len(kept)} domínios "
+            f"({removed} cobertos por {len(wildcards)} curingas)"
+        )
+        return kept, wildcards, stats
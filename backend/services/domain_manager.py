@@ -10,10 +10,9 @@ Versão: 3.1.0
 Data: 2026-03-12
 """
 
-import hashlib
 import logging
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 from backend.config import Config
 from backend.models.domain import Domain
@@ -21,6 +20,8 @@ from backend.models.domain_history import DomainHistory
 from backend.models.pdf_upload import PDFUpload
 from backend.models.pdf_removal import PDFRemoval
 from backend.services.pdf_extractor import PDFExtractor
+from backend.utils.domain_normalizer import normalize_domains
+from backend.utils.domain_validator import filter_valid_domains
 
 logger = logging.getLogger(__name__)
 
@@ -96,11 +97,12 @@ class DomainManager:
             Dict com estatísticas da operação
         """
         try:
-            # Filtrar domínios válidos
-            valid_domains = [d.strip().lower() for d in domains if d.strip()]
-            valid_domains = [d for d in valid_domains if PDFExtractor.validate_domain(d)]
+            # Normalizar o lote (IDN, ponto final, www, sufixos públicos) e
+            # filtrar os válidos, antes de qualquer acesso ao banco
+            normalized, normalization = normalize_domains(domains)
+            valid_domains = filter_valid_domains(normalized)
 
-            # Adicionar em massa
+            # Adicionar em massa (domínios e histórico na mesma transação)
             added, duplicated = Domain.bulk_create(
                 domains=valid_domains,
                 added_by=added_by,
@@ -108,19 +110,6 @@ class DomainManager:
                 source_reference=source_reference
             )
 
-            # Registrar no histórico (apenas os adicionados)
-            if added > 0:
-                # Buscar domínios recém adicionados para registrar no histórico
-                recent_domains = Domain.get_all(limit=added)
-                for domain in recent_domains:
-                    if domain.source == source and domain.source_reference == source_reference:
-                        DomainHistory.log_addition(
-                            domain_id=domain.id,
-                            domain=domain.domain,
-                            performed_by=added_by,
-                            source=source
-                        )
-
             logger.info(f"Adição em massa: {added} adicionados, {duplicated} duplicados")
 
             return {
@@ -128,7 +117,8 @@ class DomainManager:
                 'total_submitted': len(valid_domains),
                 'added': added,
                 'duplicated': duplicated,
-                'invalid': len(domains) - len(valid_domains)
+                'merged': normalization['merged'],
+                'invalid': len(domains) - normalization['merged'] - len(valid_domains)
             }
 
         except Exception as e:
@@ -144,16 +134,23 @@ class DomainManager:
     def process_pdf_upload(
         file_path: Path,
         original_filename: str,
-        uploaded_by: Optional[str] = None
+        uploaded_by: Optional[str] = None,
+        progress: Optional[Callable[[int, str], None]] = None
     ) -> Dict:
         """
         Processa upload de PDF e extrai domínios para BLOQUEIO
 
+        Args:
+            progress: callback opcional (percentual, mensagem), usado pela fila de jobs
+
         Returns:
             Dict com resultado do processamento
         """
+        progress = progress or (lambda value, message: None)
+        pdf_upload = None
         try:
-            # Calcular hash e tamanho
+            # Calcular hash e tamanho (uma única leitura; reaproveitado na extração)
+            progress(5, 'Calculando hash do arquivo')
             file_hash = PDFExtractor.calculate_file_hash(file_path)
             file_size = file_path.stat().st_size
 
@@ -177,7 +174,8 @@ class DomainManager:
             )
 
             # Extrair domínios
-            extraction_result = PDFExtractor.extract_domains(file_path)
+            progress(10, 'Extraindo domínios do PDF')
+            extraction_result = PDFExtractor.extract_domains(file_path, file_hash=file_hash)
 
             if not extraction_result['success'] or not extraction_result['domains']:
                 pdf_upload.mark_error("Nenhum domínio encontrado no PDF")
@@ -190,6 +188,7 @@ class DomainManager:
             domains = extraction_result['domains']
 
             # Adicionar domínios ao banco
+            progress(70, f'Importando {len(domains)} domínios')
             bulk_result = DomainManager.add_domains_bulk(
                 domains=domains,
                 added_by=uploaded_by,
@@ -212,12 +211,18 @@ class DomainManager:
                 'domains_extracted': len(domains),
                 'domains_added': bulk_result['added'],
                 'domains_duplicated': bulk_result['duplicated'],
+                'domains_merged': bulk_result.get('merged', 0),
                 'domains_preview': PDFExtractor.preview_domains(domains),
                 'extraction_metadata': extraction_result['extraction_metadata']
             }
 
         except Exception as e:
             logger.error(f"Erro ao processar PDF {original_filename}: {e}")
+            if pdf_upload is not None:
+                try:
+                    pdf_upload.mark_error(str(e))
+                except Exception as mark_err:
+                    logger.error(f"Erro ao registrar falha do upload {pdf_upload.id}: {mark_err}")
             return {
                 'success': False,
                 'error': str(e)
@@ -278,37 +283,43 @@ class DomainManager:
         Returns:
             Dict com estatísticas: removed, not_found, errors
         """
-        removed = 0
-        not_found = 0
-        errors = 0
-        removed_list: List[str] = []
-        not_found_list: List[str] = []
-
-        for domain in domains:
-            domain = domain.strip().lower()
-            if not domain:
-                continue
-            try:
-                success, message = DomainManager.remove_domain(
-                    domain=domain,
-                    performed_by=performed_by,
-                    permanent=permanent
-                )
-                if success:
-                    removed += 1
-                    removed_list.append(domain)
-                else:
-                    not_found += 1
-                    not_found_list.append(domain)
-            except Exception as e:
-                logger.error(f"Erro ao remover domínio {domain}: {e}")
-                errors += 1
+        # Apenas minúsculas e sem ponto final: cada nome removido é o nome
+        # exato bloqueado (remover "www.x.bet" não pode desativar x.bet)
+        unique_domains = list(dict.fromkeys(
+            d.strip().rstrip('.').lower() for d in domains if d.strip().rstrip('.')
+        ))
+
+        try:
+            removed_list = Domain.bulk_remove(
+                domains=unique_domains,
+                performed_by=performed_by,
+                permanent=permanent
+            )
+        except Exception as e:
+            logger.error(f"Erro na remoção em massa: {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'removed': 0,
+                'not_found': 0,
+                'errors': len(unique_domains),
+                'removed_list': [],
+                'not_found_list': []
+            }
+
+        removed_set = set(removed_list)
+        not_found_list = [d for d in unique_domains if d not in removed_set]
+
+        logger.info(
+            f"Remoção em massa ({'permanente' if permanent else 'desativação'}): "
+            f"{len(removed_list)} removidos, {len(not_found_list)} não encontrados"
+        )
 
         return {
             'success': True,
-            'removed': removed,
-            'not_found': not_found,
-            'errors': errors,
+            'removed': len(removed_list),
+            'not_found': len(not_found_list),
+            'errors': 0,
             'removed_list': removed_list,
             'not_found_list': not_found_list
         }
@@ -318,16 +329,22 @@ class DomainManager:
         file_path: Path,
         original_filename: str,
         uploaded_by: Optional[str] = None,
-        permanent: bool = False
+        permanent: bool = False,
+        progress: Optional[Callable[[int, str], None]] = None
     ) -> Dict:
         """
         Processa um PDF e REMOVE os domínios encontrados da lista de bloqueio.
 
+        Args:
+            progress: callback opcional (percentual, mensagem), usado pela fila de jobs
+
         Returns:
             Dict com resultado do processamento
         """
+        progress = progress or (lambda value, message: None)
         try:
             # Extrair domínios do PDF (reutiliza o mesmo extrator)
+            progress(10, 'Extraindo domínios do PDF')
             extraction_result = PDFExtractor.extract_domains(file_path)
 
             if not extraction_result['success']:
@@ -344,22 +361,26 @@ class DomainManager:
                     'error': 'Nenhum domínio encontrado no PDF'
                 }
 
-            # Calcular hash do arquivo
-            file_hash = hashlib.sha256(file_path.read_bytes()).hexdigest()
-
             # Remover domínios em lote
+            progress(70, f'Removendo {len(domains)} domínios')
             bulk_result = DomainManager.remove_domains_bulk(
                 domains=domains,
                 performed_by=uploaded_by,
                 permanent=permanent
             )
 
+            if not bulk_result['success']:
+                return {
+                    'success': False,
+                    'error': bulk_result['error']
+                }
+
             # Registrar no histórico de remoções
             PDFRemoval.create(
                 filename=file_path.name,
                 original_filename=original_filename,
-                file_size=file_path.stat().st_size,
-                file_hash=file_hash,
+                file_size=extraction_result['file_size'],
+                file_hash=extraction_result['file_hash'],
                 domains_extracted=len(domains),
                 domains_removed=bulk_result['removed'],
                 domains_not_found=bulk_result['not_found'],
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BR10 Block Web - Health Sweeper
+=================================
+Varredura periódica de saúde da frota de clientes DNS
+
+A cada HEALTH_SWEEP_INTERVAL segundos, uma thread consulta o
+health_endpoint de todos os clientes ativos em paralelo (até
+HEALTH_SWEEP_CONCURRENCY requisições, reaproveitando a sessão HTTP do
+push) e:
+
+  - guarda a latência de cada resposta em um buffer circular por
+    cliente (lista Redis clients:latency:<id>, ou memória local sem
+    Redis), com as últimas HEALTH_SAMPLES amostras;
+  - calcula p50/p95/p99 por cliente e da frota, mais o histograma da
+    última latência, e publica o relatório no Redis;
+  - grava status e metadata.health de todos os clientes verificados com
+    um único UPDATE ... FROM (VALUES ...).
+
+Com vários processos, um lock no Redis garante uma varredura por
+intervalo.
+
+Autor: BR10 Team
+Versão: 3.2.0
+Data: 2026-10-17
+"""
+
+import logging
+import math
+import os
+import socket
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Deque, Dict, List, Optional
+
+from psycopg2.extras import Json, execute_values
+
+from backend.config import Config
+from backend.database.db import db
+from backend.models.dns_client import DNSClient
+from backend.services.cache_service import cache
+from backend.services.client_sync import ClientSyncService
+
+logger = logging.getLogger(__name__)
+
+LATENCY_KEY = 'clients:latency:{}'
+REPORT_KEY = 'clients:health:report'
+LOCK_KEY = 'clients:health:sweep-lock'
+
+# Limites (ms) do histograma de latência; o último balde é "acima de"
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500)
+
+# Status da verificação -> dns_clients.status
+CLIENT_STATUS = {
+    'online': 'online',
+    'error': 'error',
+    'timeout': 'offline',
+    'unreachable': 'offline'
+}
+
+
+def percentiles(samples: List[float]) -> Dict[str, Optional[float]]:
+    """p50/p95/p99 por posição mais próxima (None sem amostras)"""
+    if not samples:
+        return {'p50': None, 'p95': None, 'p99': None}
+
+    ordered = sorted(samples)
+    count = len(ordered)
+    return {
+        f'p{p}': ordered[max(0, math.ceil(p / 100 * count) - 1)]
+        for p in (50, 95, 99)
+    }
+
+
+def histogram(latencies: List[float]) -> Dict[str, int]:
+    """Contagem de latências por balde de LATENCY_BUCKETS_MS"""
+    counts = {f'<={bound}': 0 for bound in LATENCY_BUCKETS_MS}
+    counts[f'>{LATENCY_BUCKETS_MS[-1]}'] = 0
+
+    for latency in latencies:
+        for bound in LATENCY_BUCKETS_MS:
+            if latency <= bound:
+                counts[f'<={bound}'] += 1
+                break
+        else:
+            counts[f'>{LATENCY_BUCKETS_MS[-1]}'] += 1
+
+    return counts
+
+
+class HealthSweeper:
+    """Verificação de saúde concorrente de todos os clientes"""
+
+    UPDATE_QUERY = """
+    UPDATE dns_clients AS c
+    SET status = v.status,
+        metadata = COALESCE(c.metadata, '{}'::jsonb) || jsonb_build_object('health', v.health::jsonb)
+    FROM (VALUES %s) AS v(id, status, health)
+    WHERE c.id = v.id
+    """
+
+    def __init__(self, interval: int, concurrency: int, max_samples: int):
+        self.interval = interval
+        self.concurrency = concurrency
+        self.max_samples = max_samples
+        self._samples: Dict[int, Deque[float]] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.last_report: Optional[Dict] = None
+
+    def start(self) -> None:
+        """Inicia a thread de varredura (uma por processo; intervalo 0 desativa)"""
+        if self.interval <= 0:
+            return
+
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run,
+                name='health-sweeper',
+                daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Para a thread de varredura"""
+        self._stop.set()
+
+    def _run(self) -> None:
+        """Loop da thread: uma varredura a cada intervalo"""
+        while not self._stop.wait(self.interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"Erro na varredura de saúde dos clientes: {e}")
+
+    def _acquire_slot(self) -> bool:
+        """Reserva a varredura deste intervalo entre os processos"""
+        if not cache.is_available:
+            return True
+        owner = f"{socket.gethostname()}:{os.getpid()}"
+        return cache.set_if_absent(LOCK_KEY, owner, max(1, self.interval - 1))
+
+    def _record_samples(self, latencies: Dict[int, float]) -> None:
+        """Guarda as latências nos buffers circulares (Redis e memória local)"""
+        with self._lock:
+            for client_id, latency in latencies.items():
+                buffer = self._samples.setdefault(client_id, deque(maxlen=self.max_samples))
+                buffer.append(latency)
+
+        cache.push_capped(
+            {LATENCY_KEY.format(client_id): [latency] for client_id, latency in latencies.items()},
+            self.max_samples
+        )
+
+    def _windows(self, client_ids: List[int]) -> Dict[int, List[float]]:
+        """
+        Janelas de amostras por cliente: do Redis, compartilhadas entre os
+        processos que já varreram; sem Redis, as deste processo
+        """
+        if cache.is_available:
+            keys = [LATENCY_KEY.format(client_id) for client_id in client_ids]
+            values = cache.lrange_many(keys, self.max_samples)
+            return {
+                client_id: [float(v) for v in window]
+                for client_id, window in zip(client_ids, values)
+            }
+
+        with self._lock:
+            return {
+                client_id: list(self._samples.get(client_id, ()))
+                for client_id in client_ids
+            }
+
+    def sweep(self, force: bool = False) -> Optional[Dict]:
+        """
+        Executa uma varredura
+
+        Args:
+            force: Ignora o lock entre processos (varredura manual)
+
+        Returns:
+            Relatório da varredura ou None se outro processo já varreu
+            neste intervalo
+        """
+        if not force and not self._acquire_slot():
+            return None
+
+        start_time = time.time()
+        checked_at = datetime.now()
+
+        clients = [c for c in DNSClient.get_all(active_only=True) if c.metadata.get('health_endpoint')]
+        session = ClientSyncService.get_session()
+
+        def probe(client: DNSClient) -> Dict:
+            return ClientSyncService.check_client_health(
+                client,
+                timeout=Config.HEALTH_CHECK_TIMEOUT,
+                session=session
+            )
+
+        results: List[Dict] = []
+        if clients:
+            with ThreadPoolExecutor(
+                max_workers=max(1, min(self.concurrency, len(clients))),
+                thread_name_prefix='health-probe'
+            ) as executor:
+                results = list(executor.map(probe, clients))
+
+        latencies = {
+            client.id: result['latency_ms']
+            for client, result in zip(clients, results)
+            if result.get('success')
+        }
+        self._record_samples(latencies)
+        windows = self._windows([client.id for client in clients])
+
+        rows = []
+        report_clients = {}
+        counts = {'online': 0, 'error': 0, 'offline': 0}
+
+        for client, result in zip(clients, results):
+            status = CLIENT_STATUS.get(result.get('status'), 'error')
+            counts[status] += 1
+
+            health = {
+                'status': result.get('status', 'error'),
+                'latency_ms': result.get('latency_ms'),
+                'checked_at': checked_at.isoformat(),
+                'error': result.get('error')
+            }
+            rows.append((client.id, status, Json(health)))
+
+            report_clients[str(client.id)] = {
+                'name': client.name,
+                'client_status': status,
+                **health,
+                'samples': len(windows[client.id]),
+                **percentiles(windows[client.id])
+            }
+
+        if rows:
+            try:
+                with db.get_cursor() as cursor:
+                    execute_values(cursor, self.UPDATE_QUERY, rows)
+            except Exception as e:
+                logger.error(f"Erro ao gravar status de {len(rows)} clientes: {e}")
+
+        fleet_samples = [latency for window in windows.values() for latency in window]
+        report = {
+            'checked_at': checked_at.isoformat(),
+            'duration_ms': int((time.time() - start_time) * 1000),
+            'total': len(clients),
+            **counts,
+            'fleet': {
+                'samples': len(fleet_samples),
+                **percentiles(fleet_samples),
+                'histogram': histogram(list(latencies.values()))
+            },
+            'clients': report_clients
+        }
+
+        self.last_report = report
+        cache.set(REPORT_KEY, report, ttl=max(self.interval * 3, 300))
+
+        logger.info(
+            f"Varredura de saúde: {len(clients)} clientes em {report['duration_ms']} ms "
+            f"({counts['online']} online, {counts['error']} com erro, {counts['offline']} offline)"
+        )
+        return report
+
+    def get_report(self) -> Optional[Dict]:
+        """Último relatório (de qualquer processo, via Redis)"""
+        return cache.get(REPORT_KEY) or self.last_report
+
+
+# Instância global da varredura
+health_sweeper = HealthSweeper(
+    Config.HEALTH_SWEEP_INTERVAL,
+    Config.HEALTH_SWEEP_CONCURRENCY,
+    Config.HEALTH_SAMPLES
+)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BR10 Block Web - Heartbeat Buffer
+===================================
+Coalescência dos heartbeats de /api/v1/client/ping
+
+Cada ping apenas registra o horário em memória (e no hash Redis
+HEARTBEAT_REDIS_KEY, visível para todos os workers). Uma thread grava
+os heartbeats acumulados em dns_clients com um único
+UPDATE ... FROM (VALUES ...) a cada HEARTBEAT_FLUSH_SECONDS, em vez de
+um UPDATE por requisição. Leituras usam apply() para sobrepor o valor
+mais recente ao que está no banco.
+
+Autor: BR10 Team
+Versão: 3.2.0
+Data: 2026-10-17
+"""
+
+import atexit
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from psycopg2.extras import execute_values
+
+from backend.config import Config
+from backend.database.db import db
+from backend.services.cache_service import cache
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_REDIS_KEY = 'clients:heartbeat'
+
+
+class HeartbeatBuffer:
+    """Acumula heartbeats por cliente e grava em lote"""
+
+    # Só avança o heartbeat (nunca volta no tempo se dois workers gravarem
+    # fora de ordem). O status só passa a online para clientes ativos que
+    # estavam offline: 'error' da sincronização e o offline de clientes
+    # desativados não são sobrescritos por um ping gravado depois.
+    FLUSH_QUERY = """
+    UPDATE dns_clients AS c
+    SET last_heartbeat = v.last_heartbeat,
+        status = CASE WHEN c.active AND c.status = 'offline' THEN 'online' ELSE c.status END
+    FROM (VALUES %s) AS v(id, last_heartbeat)
+    WHERE c.id = v.id
+      AND (c.last_heartbeat IS NULL OR c.last_heartbeat < v.last_heartbeat)
+    """
+
+    def __init__(self, flush_seconds: int):
+        self.flush_seconds = flush_seconds
+        self._pending: Dict[int, datetime] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.flushed = 0
+
+    def record(self, client_id: int, timestamp: Optional[datetime] = None) -> datetime:
+        """Registra heartbeat do cliente; retorna o horário registrado"""
+        timestamp = timestamp or datetime.now()
+
+        with self._lock:
+            self._pending[client_id] = timestamp
+        self._ensure_started()
+
+        cache.hset(HEARTBEAT_REDIS_KEY, str(client_id), timestamp.isoformat())
+        return timestamp
+
+    def _ensure_started(self) -> None:
+        """Inicia a thread de gravação sob demanda (uma por processo)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run,
+                name='heartbeat-flush',
+                daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        """Loop da thread: grava o acumulado a cada intervalo"""
+        while not self._stop.wait(self.flush_seconds):
+            self.flush()
+
+    def flush(self) -> int:
+        """Grava no banco os heartbeats pendentes; retorna quantos clientes"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        if not pending:
+            return 0
+
+        try:
+            with db.get_cursor() as cursor:
+                execute_values(cursor, self.FLUSH_QUERY, list(pending.items()))
+            self.flushed += len(pending)
+            return len(pending)
+        except Exception as e:
+            logger.error(f"Erro ao gravar heartbeats de {len(pending)} clientes: {e}")
+            # Devolver ao buffer sem sobrescrever heartbeats mais novos
+            with self._lock:
+                for client_id, timestamp in pending.items():
+                    if self._pending.get(client_id, timestamp) <= timestamp:
+                        self._pending[client_id] = timestamp
+            return 0
+
+    def shutdown(self) -> None:
+        """Para a thread e grava o que restou"""
+        self._stop.set()
+        self.flush()
+
+    def get_latest(self, client_ids: List[int]) -> Dict[int, datetime]:
+        """Heartbeats ainda não refletidos no banco (Redis + memória local)"""
+        latest: Dict[int, datetime] = {}
+
+        values = cache.hmget(HEARTBEAT_REDIS_KEY, [str(client_id) for client_id in client_ids])
+        for client_id, value in zip(client_ids, values):
+            if value:
+                try:
+                    latest[client_id] = datetime.fromisoformat(value)
+                except ValueError:
+                    pass
+
+        with self._lock:
+            for client_id in client_ids:
+                timestamp = self._pending.get(client_id)
+                if timestamp and (client_id not in latest or latest[client_id] < timestamp):
+                    latest[client_id] = timestamp
+
+        return latest
+
+    def apply(self, clients: List) -> List:
+        """
+        Sobrepõe aos clientes carregados do banco o heartbeat mais recente
+        (o status continua o do banco)
+        """
+        if not clients:
+            return clients
+
+        latest = self.get_latest([client.id for client in clients])
+        for client in clients:
+            timestamp = latest.get(client.id)
+            if timestamp and (not client.last_heartbeat or client.last_heartbeat < timestamp):
+                client.last_heartbeat = timestamp
+
+        return clients
+
+    def get_stats(self) -> Dict:
+        """Retorna contadores do buffer"""
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            'pending': pending,
+            'flushed': self.flushed,
+            'flush_seconds': self.flush_seconds
+        }
+
+
+# Instância global do buffer
+heartbeat_buffer = HeartbeatBuffer(Config.HEARTBEAT_FLUSH_SECONDS)
+
+atexit.register(heartbeat_buffer.shutdown)
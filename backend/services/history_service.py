@@ -10,14 +10,21 @@ Versão: 3.0.0
 Data: 2026-02-08
 """
 
+import csv
+import io
+import json
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 
+from backend.config import Config
+from backend.database.db import db
 from backend.models.domain_history import DomainHistory
 from backend.models.sync_history import SyncHistory
 from backend.models.pdf_upload import PDFUpload
 from backend.models.dns_client import DNSClient
+from backend.models.event_log import EventLog
+from backend.services.cache_service import cache, cached
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +32,9 @@ logger = logging.getLogger(__name__)
 class HistoryService:
     """Serviço de gerenciamento de histórico"""
     
+    # Consulta padrão do dashboard, servida do cache por CACHE_TTL_TIMELINE
+    DASHBOARD_TIMELINE = (20, 7)
+    
     @staticmethod
     def get_timeline(
         limit: int = 100,
@@ -34,6 +44,10 @@ class HistoryService:
         """
         Retorna timeline unificada de eventos
         
+        Lida da tabela events (mantida por trigger, particionada por mês):
+        uma varredura do índice (event_time DESC, type) no período, com o
+        nome do cliente das sincronizações já gravado no evento.
+        
         Args:
             limit: Número máximo de eventos
             days: Dias para trás
@@ -42,135 +56,120 @@ class HistoryService:
         Returns:
             Lista de eventos ordenados por data
         """
-        if event_types is None:
-            event_types = ['domains', 'syncs', 'uploads']
+        types = HistoryService._resolve_event_types(event_types)
+        if not types:
+            return []
+        
+        cache_key = None
+        if event_types is None and (limit, days) == HistoryService.DASHBOARD_TIMELINE:
+            cache_key = f'history:timeline:{limit}:{days}'
+            cached_events = cache.get(cache_key)
+            if cached_events is not None:
+                for event in cached_events:
+                    event['timestamp'] = datetime.fromisoformat(event['timestamp'])
+                return cached_events
         
         threshold = datetime.now() - timedelta(days=days)
-        events = []
-        
-        # Eventos de domínios
-        if 'domains' in event_types:
-            domain_history = DomainHistory.get_recent(limit=limit)
-            for item in domain_history:
-                if item.performed_at >= threshold:
-                    events.append({
-                        'type': 'domain',
-                        'action': item.action,
-                        'timestamp': item.performed_at,
-                        'domain': item.domain,
-                        'performed_by': item.performed_by,
-                        'details': {
-                            'old_value': item.old_value,
-                            'new_value': item.new_value
-                        }
-                    })
-        
-        # Eventos de sincronização
-        if 'syncs' in event_types:
-            sync_history = SyncHistory.get_recent(limit=limit)
-            for item in sync_history:
-                if item.synced_at >= threshold:
-                    client = DNSClient.get_by_id(item.client_id)
-                    events.append({
-                        'type': 'sync',
-                        'action': 'sync',
-                        'timestamp': item.synced_at,
-                        'client_name': client.name if client else 'Unknown',
-                        'status': item.status,
-                        'details': {
-                            'domains_sent': item.domains_sent,
-                            'domains_applied': item.domains_applied,
-                            'duration': item.duration_seconds,
-                            'message': item.message
-                        }
-                    })
-        
-        # Eventos de upload
-        if 'uploads' in event_types:
-            uploads = PDFUpload.get_recent(limit=limit)
-            for item in uploads:
-                if item.uploaded_at >= threshold:
-                    events.append({
-                        'type': 'upload',
-                        'action': 'pdf_upload',
-                        'timestamp': item.uploaded_at,
-                        'filename': item.original_filename,
-                        'uploaded_by': item.uploaded_by,
-                        'processed': item.processed,
-                        'details': {
-                            'domains_extracted': item.domains_extracted,
-                            'domains_added': item.domains_added,
-                            'domains_duplicated': item.domains_duplicated,
-                            'file_size': item.file_size,
-                            'error': item.processing_error
-                        }
-                    })
-        
-        # Ordenar por timestamp (mais recente primeiro)
-        events.sort(key=lambda x: x['timestamp'], reverse=True)
-        
-        return events[:limit]
+        events = [
+            HistoryService._timeline_event(row)
+            for row in EventLog.get_recent(threshold, types, limit)
+        ]
+        
+        if cache_key:
+            cache.set(
+                cache_key,
+                [{**event, 'timestamp': event['timestamp'].isoformat()} for event in events],
+                ttl=Config.CACHE_TTL_TIMELINE
+            )
+        
+        return events
+    
+    @staticmethod
+    def _timeline_event(row: Dict) -> Dict:
+        """Converte uma linha de events no formato de evento da timeline"""
+        details = row['details'] or {}
+        event = {
+            'type': row['event_type'],
+            'action': row['action'],
+            'timestamp': row['event_time']
+        }
+        
+        if row['event_type'] == 'domain':
+            event['domain'] = row['subject']
+            event['performed_by'] = row['actor']
+            event['details'] = {
+                'old_value': details.get('old_value'),
+                'new_value': details.get('new_value')
+            }
+        elif row['event_type'] == 'sync':
+            event['client_name'] = row['subject']
+            event['status'] = row['status']
+            event['details'] = {
+                'domains_sent': details.get('domains_sent'),
+                'domains_applied': details.get('domains_applied'),
+                'duration': details.get('duration'),
+                'message': details.get('message')
+            }
+        else:
+            event['filename'] = row['subject']
+            event['uploaded_by'] = row['actor']
+            event['processed'] = details.get('processed')
+            event['details'] = {
+                'domains_extracted': details.get('domains_extracted'),
+                'domains_added': details.get('domains_added'),
+                'domains_duplicated': details.get('domains_duplicated'),
+                'file_size': details.get('file_size'),
+                'error': details.get('error')
+            }
+        
+        return event
     
     @staticmethod
+    @cached('stats:history', ttl=Config.CACHE_TTL_STATS,
+            key_builder=lambda days=7: f'stats:history:domain_changes:{days}')
     def get_domain_changes_summary(days: int = 7) -> Dict:
         """
-        Retorna resumo de mudanças em domínios
+        Retorna resumo de mudanças em domínios (agregado no banco,
+        em cache por período)
         
         Returns:
             Dict com estatísticas de mudanças
         """
         threshold = datetime.now() - timedelta(days=days)
-        history = DomainHistory.get_recent(limit=1000)
-        
-        # Filtrar por período
-        period_history = [h for h in history if h.performed_at >= threshold]
+        period = DomainHistory.get_period_summary(threshold)
+        totals = period['totals']
         
         summary = {
             'period_days': days,
-            'total_changes': len(period_history),
-            'added': len([h for h in period_history if h.action == 'added']),
-            'removed': len([h for h in period_history if h.action == 'removed']),
-            'activated': len([h for h in period_history if h.action == 'activated']),
-            'deactivated': len([h for h in period_history if h.action == 'deactivated']),
-            'by_source': {},
-            'by_user': {},
-            'top_contributors': []
-        }
-        
-        # Agrupar por fonte
-        for item in period_history:
-            if item.action == 'added':
-                source = item.metadata.get('source', 'unknown')
-                summary['by_source'][source] = summary['by_source'].get(source, 0) + 1
-        
-        # Agrupar por usuário
-        for item in period_history:
-            if item.performed_by:
-                summary['by_user'][item.performed_by] = summary['by_user'].get(item.performed_by, 0) + 1
-        
-        # Top contribuidores
-        if summary['by_user']:
-            summary['top_contributors'] = sorted(
-                summary['by_user'].items(),
+            'total_changes': totals['total'],
+            'added': totals['added'],
+            'removed': totals['removed'],
+            'activated': totals['activated'],
+            'deactivated': totals['deactivated'],
+            'by_source': period['by_source'],
+            'by_user': period['by_user'],
+            'top_contributors': sorted(
+                period['by_user'].items(),
                 key=lambda x: x[1],
                 reverse=True
             )[:5]
+        }
         
         return summary
     
     @staticmethod
+    @cached('stats:history', ttl=Config.CACHE_TTL_STATS,
+            key_builder=lambda client_id, days=30: f'stats:history:client_sync:{client_id}:{days}')
     def get_client_sync_report(client_id: int, days: int = 30) -> Dict:
         """
-        Retorna relatório de sincronização de um cliente
+        Retorna relatório de sincronização de um cliente (agregado no
+        banco, em cache por período)
         
         Returns:
             Dict com relatório detalhado
         """
         threshold = datetime.now() - timedelta(days=days)
-        history = SyncHistory.get_by_client(client_id, limit=1000)
-        
-        # Filtrar por período
-        period_history = [h for h in history if h.synced_at >= threshold]
+        stats = SyncHistory.get_period_stats(threshold, client_id=client_id)
         
         client = DNSClient.get_by_id(client_id)
         
@@ -178,16 +177,16 @@ class HistoryService:
             'client_id': client_id,
             'client_name': client.name if client else 'Unknown',
             'period_days': days,
-            'total_syncs': len(period_history),
-            'successful': len([h for h in period_history if h.status == 'success']),
-            'failed': len([h for h in period_history if h.status == 'failed']),
-            'pending': len([h for h in period_history if h.status == 'pending']),
+            'total_syncs': stats['total_syncs'],
+            'successful': stats['successful'],
+            'failed': stats['failed'],
+            'pending': stats['pending'],
             'success_rate': 0,
-            'total_domains_sent': sum(h.domains_sent for h in period_history),
-            'total_domains_applied': sum(h.domains_applied for h in period_history),
-            'average_duration': 0,
-            'last_sync': None,
-            'last_success': None,
+            'total_domains_sent': stats['total_domains_sent'],
+            'total_domains_applied': stats['total_domains_applied'],
+            'average_duration': stats['average_duration'],
+            'last_sync': stats['last_sync'].isoformat() if stats['last_sync'] else None,
+            'last_success': stats['last_success'].isoformat() if stats['last_success'] else None,
             'recent_errors': []
         }
         
@@ -195,66 +194,48 @@ class HistoryService:
         if report['total_syncs'] > 0:
             report['success_rate'] = (report['successful'] / report['total_syncs']) * 100
         
-        # Duração média
-        durations = [h.duration_seconds for h in period_history if h.duration_seconds]
-        if durations:
-            report['average_duration'] = sum(durations) // len(durations)
-        
-        # Última sincronização
-        if period_history:
-            report['last_sync'] = period_history[0].synced_at.isoformat()
-        
-        # Última sincronização bem-sucedida
-        successful = [h for h in period_history if h.status == 'success']
-        if successful:
-            report['last_success'] = successful[0].synced_at.isoformat()
-        
         # Erros recentes
-        failed = [h for h in period_history if h.status == 'failed'][:5]
-        report['recent_errors'] = [
-            {
-                'timestamp': h.synced_at.isoformat(),
-                'error': h.error_details,
-                'message': h.message
-            }
-            for h in failed
-        ]
+        if report['failed']:
+            report['recent_errors'] = [
+                {
+                    'timestamp': h.synced_at.isoformat(),
+                    'error': h.error_details,
+                    'message': h.message
+                }
+                for h in SyncHistory.get_recent_failures(client_id, threshold, limit=5)
+            ]
         
         return report
     
     @staticmethod
+    @cached('stats:history', ttl=Config.CACHE_TTL_STATS,
+            key_builder=lambda days=30: f'stats:history:uploads:{days}')
     def get_upload_statistics(days: int = 30) -> Dict:
         """
-        Retorna estatísticas de uploads de PDF
+        Retorna estatísticas de uploads de PDF (agregadas no banco, em
+        cache por período)
         
         Returns:
             Dict com estatísticas
         """
         threshold = datetime.now() - timedelta(days=days)
-        uploads = PDFUpload.get_recent(limit=1000)
-        
-        # Filtrar por período
-        period_uploads = [u for u in uploads if u.uploaded_at >= threshold]
+        period = PDFUpload.get_period_stats(threshold)
+        totals = period['totals']
         
         stats = {
             'period_days': days,
-            'total_uploads': len(period_uploads),
-            'processed': len([u for u in period_uploads if u.processed]),
-            'with_errors': len([u for u in period_uploads if u.processing_error]),
-            'total_domains_extracted': sum(u.domains_extracted for u in period_uploads),
-            'total_domains_added': sum(u.domains_added for u in period_uploads),
-            'total_domains_duplicated': sum(u.domains_duplicated for u in period_uploads),
-            'total_file_size': sum(u.file_size for u in period_uploads),
-            'by_user': {},
+            'total_uploads': totals['total_uploads'],
+            'processed': totals['processed'],
+            'with_errors': totals['with_errors'],
+            'total_domains_extracted': totals['total_domains_extracted'],
+            'total_domains_added': totals['total_domains_added'],
+            'total_domains_duplicated': totals['total_domains_duplicated'],
+            'total_file_size': totals['total_file_size'],
+            'by_user': period['by_user'],
             'recent_uploads': []
         }
         
-        # Agrupar por usuário
-        for upload in period_uploads:
-            if upload.uploaded_by:
-                stats['by_user'][upload.uploaded_by] = stats['by_user'].get(upload.uploaded_by, 0) + 1
-        
-        # Uploads recentes
+        # Uploads recentes (os 10 mais novos, se estiverem no período)
         stats['recent_uploads'] = [
             {
                 'filename': u.original_filename,
@@ -265,51 +246,208 @@ class HistoryService:
                 'processed': u.processed,
                 'error': u.processing_error
             }
-            for u in period_uploads[:10]
+            for u in PDFUpload.get_recent(limit=10)
+            if u.uploaded_at >= threshold
         ]
         
         return stats
     
+    # Tipos aceitos nos filtros (nomes da timeline e do filtro da página)
+    EXPORT_EVENT_TYPES = {
+        'domains': 'domain', 'domain': 'domain',
+        'syncs': 'sync', 'sync': 'sync',
+        'uploads': 'upload', 'upload': 'upload'
+    }
+    
+    EXPORT_COLUMNS = ['timestamp', 'type', 'action', 'subject', 'actor', 'status', 'details']
+    
+    # Uma consulta por tipo; todas com as mesmas colunas para o UNION ALL
+    # (o mesmo mapeamento dos triggers de events, migração 011)
+    _EXPORT_SELECTS = {
+        'domain': """
+            SELECT performed_at AS event_time, 'domain'::text AS event_type,
+                   action::text AS action, domain::text AS subject,
+                   performed_by::text AS actor, NULL::text AS status,
+                   jsonb_build_object(
+                       'old_value', old_value,
+                       'new_value', new_value,
+                       'metadata', metadata
+                   ) AS details
+            FROM domain_history
+            WHERE performed_at >= %s
+        """,
+        'sync': """
+            SELECT s.synced_at AS event_time, 'sync'::text AS event_type,
+                   'sync'::text AS action, COALESCE(c.name, 'Unknown')::text AS subject,
+                   NULL::text AS actor, s.status::text AS status,
+                   jsonb_build_object(
+                       'domains_sent', s.domains_sent,
+                       'domains_applied', s.domains_applied,
+                       'duration', s.duration_seconds,
+                       'message', s.message,
+                       'error', s.error_details
+                   ) AS details
+            FROM sync_history s
+            LEFT JOIN dns_clients c ON c.id = s.client_id
+            WHERE s.synced_at >= %s
+        """,
+        'upload': """
+            SELECT uploaded_at AS event_time, 'upload'::text AS event_type,
+                   'pdf_upload'::text AS action, original_filename::text AS subject,
+                   uploaded_by::text AS actor,
+                   CASE
+                       WHEN processing_error IS NOT NULL THEN 'failed'
+                       WHEN processed THEN 'processed'
+                       ELSE 'pending'
+                   END AS status,
+                   jsonb_build_object(
+                       'domains_extracted', domains_extracted,
+                       'domains_added', domains_added,
+                       'domains_duplicated', domains_duplicated,
+                       'file_size', file_size,
+                       'processed', processed,
+                       'error', processing_error
+                   ) AS details
+            FROM pdf_uploads
+            WHERE uploaded_at >= %s
+        """
+    }
+    
     @staticmethod
-    def export_history_to_csv(
+    def _resolve_event_types(event_types: Optional[List[str]]) -> List[str]:
+        """
+        Normaliza os filtros de tipo ('domains' ou 'domain', ...) para os
+        nomes das consultas, sem repetição
+        
+        Raises:
+            ValueError: Tipo de evento inválido
+        """
+        if event_types is None:
+            return ['domain', 'sync', 'upload']
+        
+        types = []
+        for event_type in event_types:
+            name = HistoryService.EXPORT_EVENT_TYPES.get(event_type)
+            if name is None:
+                raise ValueError(f"Tipo de evento inválido: {event_type}")
+            if name not in types:
+                types.append(name)
+        
+        return types
+    
+    @staticmethod
+    def iter_history_rows(
+        days: int = 30,
+        event_types: Optional[List[str]] = None,
+        batch_size: Optional[int] = None
+    ) -> Iterator[List[Dict]]:
+        """
+        Eventos do período em lotes, do mais recente ao mais antigo, com
+        um único UNION ALL lido por cursor server-side
+        
+        Os filtros são validados na chamada; a conexão só é reservada
+        quando o primeiro lote é consumido.
+        
+        Args:
+            days: Dias para trás (0 = todo o histórico)
+            event_types: Tipos a incluir ('domains', 'syncs', 'uploads')
+            batch_size: Linhas por lote (padrão Config.STREAM_BATCH_SIZE)
+        """
+        types = HistoryService._resolve_event_types(event_types)
+        if not types:
+            return iter(())
+        
+        threshold = datetime.now() - timedelta(days=days) if days > 0 else datetime(1970, 1, 1)
+        query = (
+            ' UNION ALL '.join(HistoryService._EXPORT_SELECTS[t] for t in types)
+            + ' ORDER BY event_time DESC'
+        )
+        params = tuple(threshold for _ in types)
+        
+        return db.stream_query(query, params, batch_size=batch_size or Config.STREAM_BATCH_SIZE)
+    
+    @staticmethod
+    def stream_history_export(
+        export_format: str = 'csv',
+        days: int = 30,
+        event_types: Optional[List[str]] = None,
+        batch_size: Optional[int] = None
+    ) -> Iterator[str]:
+        """
+        Exportação do histórico em blocos de texto (um por lote), em
+        memória constante
+        
+        Args:
+            export_format: 'csv' ou 'ndjson'
+        
+        Raises:
+            ValueError: Formato ou tipo de evento inválido (levantado na
+                chamada, antes do primeiro bloco)
+        """
+        if export_format not in ('csv', 'ndjson'):
+            raise ValueError(f"Formato de exportação inválido: {export_format}")
+        
+        batches = HistoryService.iter_history_rows(days, event_types, batch_size)
+        return HistoryService._render_export(batches, export_format)
+    
+    @staticmethod
+    def _render_export(batches: Iterator[List[Dict]], export_format: str) -> Iterator[str]:
+        """Serializa os lotes de eventos em CSV ou NDJSON"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        
+        if export_format == 'csv':
+            writer.writerow(HistoryService.EXPORT_COLUMNS)
+            yield buffer.getvalue()
+        
+        for rows in batches:
+            buffer.seek(0)
+            buffer.truncate()
+            
+            for row in rows:
+                timestamp = row['event_time'].isoformat() if row['event_time'] else None
+                details = row['details'] or {}
+                
+                if export_format == 'csv':
+                    writer.writerow([
+                        timestamp,
+                        row['event_type'],
+                        row['action'],
+                        row['subject'],
+                        row['actor'],
+                        row['status'],
+                        json.dumps(details, ensure_ascii=False, default=str)
+                    ])
+                else:
+                    buffer.write(json.dumps({
+                        'timestamp': timestamp,
+                        'type': row['event_type'],
+                        'action': row['action'],
+                        'subject': row['subject'],
+                        'actor': row['actor'],
+                        'status': row['status'],
+                        'details': details
+                    }, ensure_ascii=False, default=str) + '\n')
+            
+            yield buffer.getvalue()
+    
+    @staticmethod
+    def export_history_to_file(
         output_path: str,
+        export_format: str = 'csv',
         event_types: Optional[List[str]] = None,
         days: int = 30
     ) -> bool:
         """
-        Exporta histórico para arquivo CSV
+        Exporta histórico para arquivo CSV ou NDJSON, gravando lote a lote
         
         Returns:
             True se sucesso
         """
         try:
-            import csv
-            
-            timeline = HistoryService.get_timeline(
-                limit=10000,
-                days=days,
-                event_types=event_types
-            )
-            
             with open(output_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                
-                # Cabeçalho
-                writer.writerow([
-                    'Timestamp',
-                    'Type',
-                    'Action',
-                    'Details'
-                ])
-                
-                # Dados
-                for event in timeline:
-                    writer.writerow([
-                        event['timestamp'].isoformat(),
-                        event['type'],
-                        event['action'],
-                        str(event.get('details', {}))
-                    ])
+                for chunk in HistoryService.stream_history_export(export_format, days, event_types):
+                    f.write(chunk)
             
             logger.info(f"Histórico exportado para: {output_path}")
             return True
@@ -317,3 +455,17 @@ class HistoryService:
         except Exception as e:
             logger.error(f"Erro ao exportar histórico: {e}")
             return False
+    
+    @staticmethod
+    def export_history_to_csv(
+        output_path: str,
+        event_types: Optional[List[str]] = None,
+        days: int = 30
+    ) -> bool:
+        """
+        Exporta histórico para arquivo CSV
+        
+        Returns:
+            True se sucesso
+        """
+        return HistoryService.export_history_to_file(output_path, 'csv', event_types, days)
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BR10 Block Web - Job Queue
+============================
+Execução em segundo plano dos processamentos de PDF
+
+As rotas de upload apenas salvam o arquivo e enfileiram um job na tabela
+jobs; workers (processo dedicado `python -m backend.worker` ou thread
+embutida na aplicação, conforme JOB_EMBEDDED_WORKER) reservam os jobs
+com SKIP LOCKED e executam o handler registrado para o tipo.
+
+Autor: BR10 Team
+Versão: 3.2.0
+Data: 2026-10-17
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from backend.config import Config
+from backend.models.event_log import EventLog
+from backend.models.job import Job
+from backend.services.domain_manager import DomainManager
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[int, str], None]
+
+
+def _run_pdf_upload(job: Job, progress: ProgressCallback) -> Dict:
+    """Handler: extração e importação de PDF para bloqueio"""
+    payload = job.payload
+    return DomainManager.process_pdf_upload(
+        file_path=Path(payload['file_path']),
+        original_filename=payload['original_filename'],
+        uploaded_by=payload.get('uploaded_by'),
+        progress=progress
+    )
+
+
+def _run_pdf_removal(job: Job, progress: ProgressCallback) -> Dict:
+    """Handler: extração de PDF e remoção dos domínios encontrados"""
+    payload = job.payload
+    return DomainManager.process_pdf_removal(
+        file_path=Path(payload['file_path']),
+        original_filename=payload['original_filename'],
+        uploaded_by=payload.get('uploaded_by'),
+        permanent=payload.get('permanent', False),
+        progress=progress
+    )
+
+
+class JobQueue:
+    """Fila de jobs com workers em thread"""
+
+    HANDLERS: Dict[str, Callable[[Job, ProgressCallback], Dict]] = {
+        'pdf_upload': _run_pdf_upload,
+        'pdf_removal': _run_pdf_removal,
+    }
+
+    _embedded: Optional[threading.Thread] = None
+    _embedded_lock = threading.Lock()
+    _stop = threading.Event()
+    _maintenance_lock = threading.Lock()
+    _next_maintenance = 0.0
+
+    @staticmethod
+    def enqueue(job_type: str, payload: Dict, created_by: Optional[str] = None) -> Job:
+        """Enfileira job e garante a thread embutida, se habilitada"""
+        if job_type not in JobQueue.HANDLERS:
+            raise ValueError(f"Tipo de job desconhecido: {job_type}")
+
+        job = Job.create(job_type, payload, created_by)
+        logger.info(f"Job enfileirado: {job.id} ({job_type})")
+
+        JobQueue.start_embedded_worker()
+        return job
+
+    @staticmethod
+    def worker_name() -> str:
+        """Identificação do worker gravada em jobs.worker"""
+        return f"{socket.gethostname()}:{os.getpid()}:{threading.current_thread().name}"
+
+    @staticmethod
+    def run_job(job: Job) -> None:
+        """Executa um job já reservado e grava o resultado"""
+        handler = JobQueue.HANDLERS.get(job.job_type)
+        if handler is None:
+            job.mark_failed(f"Tipo de job desconhecido: {job.job_type}")
+            return
+
+        # Sinal de vida enquanto o handler roda, para requeue_stale não
+        # devolver à fila um job longo que ainda está em andamento
+        done = threading.Event()
+        state = {'progress': 0, 'message': 'Iniciando'}
+
+        def keepalive():
+            while not done.wait(Config.JOB_HEARTBEAT_SECONDS):
+                try:
+                    job.update_progress(state['progress'], state['message'])
+                except Exception as e:
+                    logger.warning(f"Erro ao atualizar sinal de vida do job {job.id}: {e}")
+
+        def progress(value: int, message: str) -> None:
+            state['progress'] = value
+            state['message'] = message
+            job.update_progress(value, message)
+
+        keepalive_thread = threading.Thread(target=keepalive, name=f'job-{job.id}-keepalive', daemon=True)
+        keepalive_thread.start()
+
+        try:
+            result = handler(job, progress)
+            if result.get('success'):
+                job.mark_done(result)
+            else:
+                job.mark_failed(result.get('error', 'Falha no processamento'), result)
+            logger.info(f"Job {job.id} ({job.job_type}) finalizado: {job.status}")
+
+        except Exception as e:
+            logger.error(f"Erro ao executar job {job.id} ({job.job_type}): {e}", exc_info=True)
+            job.mark_failed(str(e))
+
+        finally:
+            done.set()
+
+    @staticmethod
+    def work(stop: threading.Event, poll_interval: Optional[float] = None) -> None:
+        """Loop do worker: reserva e executa jobs até stop ser sinalizado"""
+        poll_interval = poll_interval or Config.JOB_POLL_INTERVAL
+        worker = JobQueue.worker_name()
+        job_types = list(JobQueue.HANDLERS)
+        logger.info(f"Worker de jobs iniciado: {worker}")
+
+        while not stop.is_set():
+            JobQueue.run_maintenance()
+
+            try:
+                Job.requeue_stale(Config.JOB_STALE_MINUTES, Config.JOB_MAX_ATTEMPTS)
+
+                job = Job.claim_next(worker, job_types)
+                if job is None:
+                    stop.wait(poll_interval)
+                    continue
+
+                logger.info(f"Job {job.id} ({job.job_type}) reservado por {worker}")
+                JobQueue.run_job(job)
+
+            except Exception as e:
+                logger.error(f"Erro no loop do worker de jobs: {e}")
+                stop.wait(poll_interval)
+
+        logger.info(f"Worker de jobs encerrado: {worker}")
+
+    @classmethod
+    def run_maintenance(cls) -> None:
+        """
+        Tarefas periódicas dos workers (no máximo uma vez a cada
+        JOB_MAINTENANCE_SECONDS por processo): cria com antecedência as
+        partições mensais de events, para que a virada do mês não execute
+        DDL dentro dos triggers de escrita
+        """
+        now = time.monotonic()
+        with cls._maintenance_lock:
+            if now < cls._next_maintenance:
+                return
+            cls._next_maintenance = now + Config.JOB_MAINTENANCE_SECONDS
+
+        try:
+            created = EventLog.ensure_partitions(months_ahead=2)
+            if created:
+                logger.info(f"Timeline: {created} partições mensais criadas")
+        except Exception as e:
+            logger.error(f"Erro ao criar partições da timeline: {e}")
+
+    @classmethod
+    def start_embedded_worker(cls) -> None:
+        """
+        Inicia a thread de worker dentro do processo da aplicação
+        (uma por processo), quando JOB_EMBEDDED_WORKER está habilitado.
+        """
+        if not Config.JOB_EMBEDDED_WORKER:
+            return
+
+        if cls._embedded is not None and cls._embedded.is_alive():
+            return
+
+        with cls._embedded_lock:
+            if cls._embedded is not None and cls._embedded.is_alive():
+                return
+
+            cls._stop.clear()
+            cls._embedded = threading.Thread(
+                target=cls.work,
+                args=(cls._stop,),
+                name='job-worker',
+                daemon=True
+            )
+            cls._embedded.start()
@@ -18,19 +18,46 @@ Data: 2026-03-07
 
 import hashlib
 import logging
+import math
+import mmap
+import multiprocessing
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 import PyPDF2
 import pdfplumber
 
+from backend.config import Config
+from backend.utils.domain_normalizer import to_ascii
+from backend.utils.domain_validator import (
+    IGNORED_DOMAINS,
+    NOT_DOMAIN_WORDS,
+    filter_valid_domains,
+    is_valid_domain,
+)
+
 logger = logging.getLogger(__name__)
 
 
+def _extract_page_range(file_path: str, first_page: int, last_page: int) -> Tuple[Set[str], List[Dict], List[str], List[int]]:
+    """Processa as páginas [first_page, last_page] — executado nos processos do pool"""
+    with pdfplumber.open(file_path) as pdf:
+        return PDFExtractor.extract_pages(pdf, range(first_page, last_page + 1))
+
+
 class PDFExtractor:
     """Serviço de extração de domínios de PDF"""
 
+    # Faixas de páginas por processo na extração paralela
+    CHUNKS_PER_WORKER = 4
+
+    # Versão das regras de extração/validação gravada no cache de extrações;
+    # incrementar ao mudar essas regras para que entradas antigas sejam ignoradas
+    EXTRACTOR_VERSION = 3
+
     # Regex para identificar domínios em texto corrido
     DOMAIN_PATTERN = re.compile(
         r'\b(?:[a-zA-Z0-9](?:[a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?\.)'
@@ -104,33 +131,22 @@ class PDFExtractor:
         'wiki', 'works', 'wtf', 'yoga', 'zone',
     }
 
-    # Palavras que parecem domínios mas são falsos positivos
-    IGNORE_DOMAINS = {
-        'example.com', 'example.org', 'example.net',
-        'localhost', 'test.com', 'domain.com',
-        'email.com', 'website.com', 'page.com',
-        'google.com', 'facebook.com', 'twitter.com',
-        'instagram.com', 'youtube.com', 'whatsapp.com',
-        'microsoft.com', 'apple.com', 'amazon.com',
-    }
-
-    # Palavras que NÃO são domínios (evitar falsos positivos de texto)
-    NOT_DOMAIN_WORDS = {
-        'art', 'fig', 'tab', 'ref', 'obs', 'ver', 'vide',
-        'inc', 'ltda', 'eireli', 'me', 'sa', 'sas',
-        'jan', 'fev', 'mar', 'abr', 'mai', 'jun',
-        'jul', 'ago', 'set', 'out', 'nov', 'dez',
-        'seg', 'ter', 'qua', 'qui', 'sex', 'sab', 'dom',
-    }
+    # Falsos positivos (mantidos aqui por compatibilidade; a validação
+    # usa backend.utils.domain_validator)
+    IGNORE_DOMAINS = IGNORED_DOMAINS
+    NOT_DOMAIN_WORDS = NOT_DOMAIN_WORDS
 
     @staticmethod
     def calculate_file_hash(file_path: Path) -> str:
-        """Calcula hash SHA-256 do arquivo"""
-        sha256_hash = hashlib.sha256()
+        """
+        Calcula hash SHA-256 do arquivo em uma única passada sobre um mmap
+        (sem cópias em blocos de 4 KB; hashlib libera o GIL em buffers grandes)
+        """
         with open(file_path, "rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-        return sha256_hash.hexdigest()
+            if os.fstat(f.fileno()).st_size == 0:
+                return hashlib.sha256().hexdigest()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return hashlib.sha256(mapped).hexdigest()
 
     @staticmethod
     def validate_domain(domain: str) -> bool:
@@ -138,71 +154,7 @@ class PDFExtractor:
         Valida se uma string é um domínio válido para bloqueio.
         Mais permissivo que o validador de formulário — aceita TLDs novos.
         """
-        domain = domain.strip().lower()
-
-        # Tamanho
-        if len(domain) < 4 or len(domain) > 255:
-            return False
-
-        # Lista de ignorados explícita
-        if domain in PDFExtractor.IGNORE_DOMAINS:
-            return False
-
-        # Deve ter pelo menos um ponto
-        if '.' not in domain:
-            return False
-
-        # Não pode começar/terminar com ponto ou hífen
-        if domain[0] in ('.', '-') or domain[-1] in ('.', '-'):
-            return False
-
-        # Não pode conter caracteres inválidos
-        if re.search(r'[^a-z0-9.\-]', domain):
-            return False
-
-        parts = domain.split('.')
-
-        # Cada parte deve ser válida
-        for part in parts:
-            if not part:
-                return False
-            if part[0] == '-' or part[-1] == '-':
-                return False
-            if not re.match(r'^[a-z0-9\-]+$', part):
-                return False
-
-        # TLD deve ter pelo menos 2 caracteres e não ser só números
-        tld = parts[-1]
-        if len(tld) < 2:
-            return False
-        if tld.isdigit():
-            return False
-
-        # Deve ter pelo menos 2 partes (ex: dominio.tld)
-        if len(parts) < 2:
-            return False
-
-        # Parte principal (SLD) deve ter pelo menos 1 caractere
-        if len(parts[-2]) < 1:
-            return False
-
-        # Filtrar palavras comuns que não são domínios
-        if len(parts) == 2 and parts[0] in PDFExtractor.NOT_DOMAIN_WORDS:
-            return False
-
-        # Filtrar IPs disfarçados (ex: 1.2.3.4)
-        if all(p.isdigit() for p in parts):
-            return False
-
-        # Filtrar números de processo judicial (ex: 1031339-38.2022.8.26.0050)
-        if re.match(r'^\d+[-\d]*\.\d+', domain):
-            return False
-
-        # Filtrar datas e números (ex: 13.02.2025, 29.0001.0082235)
-        if re.match(r'^\d+\.\d+\.\d+', domain):
-            return False
-
-        return True
+        return is_valid_domain(domain.strip().lower())
 
     @staticmethod
     def extract_domains_from_text(text: str) -> Set[str]:
@@ -235,10 +187,7 @@ class PDFExtractor:
         normalized_text = '\n'.join(normalized_lines)
 
         matches = PDFExtractor.DOMAIN_PATTERN.findall(normalized_text)
-        for match in matches:
-            domain = match.strip().lower().rstrip('.')
-            if PDFExtractor.validate_domain(domain):
-                domains.add(domain)
+        domains.update(filter_valid_domains(match.lower().rstrip('.') for match in matches))
 
         return domains
 
@@ -259,66 +208,220 @@ class PDFExtractor:
         # Remover porta
         cell = re.sub(r':\d+$', '', cell)
         cell = cell.strip().rstrip('.')
+        # IDN em punycode (o padrão de texto corrido só reconhece ASCII)
+        cell = to_ascii(cell) or ''
 
-        if PDFExtractor.validate_domain(cell):
+        if is_valid_domain(cell):
             return cell
         return None
 
     @classmethod
-    def extract_with_pdfplumber(cls, file_path: Path) -> Tuple[Set[str], Dict]:
+    def extract_pages(cls, pdf, page_numbers: Iterable[int]) -> Tuple[Set[str], List[Dict], List[str], List[int]]:
         """
-        Extrai domínios usando pdfplumber.
+        Extrai domínios das páginas indicadas (numeração a partir de 1) de
+        um PDF já aberto com pdfplumber.
         Tenta extrair de tabelas primeiro (mais preciso), depois de texto corrido.
+
+        Cada página passa antes por uma sonda barata: os objetos da página
+        são analisados uma única vez (e reaproveitados pelas extrações); sem
+        camada de texto a página é pulada, e sem linhas/retângulos o
+        extract_tables é dispensado (a estratégia padrão de tabelas depende
+        dessas bordas, então nada seria encontrado).
+
+        Returns:
+            Tupla (domínios, metadados por página, erros, páginas com falha)
+        """
+        domains: Set[str] = set()
+        page_stats: List[Dict] = []
+        errors: List[str] = []
+        failed_pages: List[int] = []
+
+        for page_num in page_numbers:
+            page = pdf.pages[page_num - 1]
+            page_domains: Set[str] = set()
+            tables_count = 0
+            has_text = False
+
+            try:
+                # Sonda: camada de texto e bordas de tabela
+                has_text = bool(page.chars)
+                has_edges = has_text and bool(page.edges)
+
+                # 1. Tentar extrair de tabelas (PDFs tipo planilha)
+                tables = page.extract_tables() if has_edges else None
+                if tables:
+                    tables_count = len(tables)
+                    for table in tables:
+                        for row in table:
+                            if not row:
+                                continue
+                            for cell in row:
+                                domain = cls.extract_domains_from_table_cell(cell)
+                                if domain:
+                                    page_domains.add(domain)
+
+                # 2. Extrair de texto corrido (PDFs tipo ofício)
+                text = page.extract_text() if has_text else None
+                if text:
+                    text_domains = cls.extract_domains_from_text(text)
+                    page_domains.update(text_domains)
+                    logger.debug(f"Página {page_num}: {len(text_domains)} domínios no texto")
+
+            except Exception as e:
+                error_msg = f"Erro na página {page_num}: {str(e)}"
+                errors.append(error_msg)
+                failed_pages.append(page_num)
+                logger.warning(error_msg)
+
+            finally:
+                # Liberar objetos já analisados da página (PDFs grandes)
+                page.close()
+
+            domains.update(page_domains)
+            page_stats.append({
+                'page': page_num,
+                'text': has_text,
+                'tables': tables_count,
+                'domains': len(page_domains)
+            })
+
+        return domains, page_stats, errors, failed_pages
+
+    @staticmethod
+    def _page_ranges(total_pages: int, workers: int) -> List[Tuple[int, int]]:
+        """
+        Divide as páginas em faixas contíguas [primeira, última].
+        Gera algumas faixas por worker para equilibrar páginas mais pesadas.
+        """
+        chunks = min(total_pages, workers * PDFExtractor.CHUNKS_PER_WORKER)
+        size = math.ceil(total_pages / chunks)
+        return [
+            (first, min(first + size - 1, total_pages))
+            for first in range(1, total_pages + 1, size)
+        ]
+
+    @staticmethod
+    def _resolve_workers(workers: Optional[int]) -> int:
+        """Número de processos de extração (0 = todos os núcleos)"""
+        if workers is None:
+            workers = Config.PDF_EXTRACT_WORKERS
+        if workers <= 0:
+            workers = os.cpu_count() or 1
+        return workers
+
+    @classmethod
+    def _extract_parallel(
+        cls,
+        file_path: Path,
+        total_pages: int,
+        workers: int
+    ) -> Tuple[Set[str], List[Dict], List[str], List[int]]:
+        """
+        Distribui faixas de páginas em um ProcessPoolExecutor; cada processo
+        abre o arquivo e processa as próprias páginas. Os resultados são
+        combinados na ordem das páginas.
+        """
+        ranges = cls._page_ranges(total_pages, workers)
+        domains: Set[str] = set()
+        page_stats: List[Dict] = []
+        errors: List[str] = []
+        failed_pages: List[int] = []
+
+        # spawn: o processo pai tem threads (jobs, api_logs, heartbeats) e
+        # fork com threads ativas pode herdar locks em estado inconsistente.
+        # Os filhos reimportam o módulo principal (ex.: backend.worker) e
+        # com ele backend.database.db, mas o pool só conecta no primeiro uso.
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=min(workers, len(ranges)), mp_context=context) as executor:
+            results = executor.map(
+                _extract_page_range,
+                [str(file_path)] * len(ranges),
+                [first for first, _ in ranges],
+                [last for _, last in ranges]
+            )
+            for range_domains, range_stats, range_errors, range_failed in results:
+                domains.update(range_domains)
+                page_stats.extend(range_stats)
+                errors.extend(range_errors)
+                failed_pages.extend(range_failed)
+
+        return domains, page_stats, errors, failed_pages
+
+    @classmethod
+    def extract_with_pdfplumber(
+        cls,
+        file_path: Path,
+        workers: Optional[int] = None
+    ) -> Tuple[Set[str], Dict]:
+        """
+        Extrai domínios usando pdfplumber.
+
+        PDFs com pelo menos PDF_PARALLEL_MIN_PAGES páginas são processados em
+        paralelo por `workers` processos (padrão PDF_EXTRACT_WORKERS); se o
+        pool falhar, a extração é refeita em série no processo atual.
+
+        metadata['failed_pages'] lista as páginas que o pdfplumber não
+        conseguiu processar (None se o arquivo nem pôde ser aberto).
         """
         domains = set()
         metadata = {
             'method': 'pdfplumber',
             'pages': 0,
             'tables_found': 0,
+            'pages_without_text': 0,
+            'workers': 1,
+            'page_stats': [],
+            'failed_pages': [],
             'errors': []
         }
+        workers = cls._resolve_workers(workers)
 
         try:
             with pdfplumber.open(file_path) as pdf:
-                metadata['pages'] = len(pdf.pages)
+                total_pages = len(pdf.pages)
+                metadata['pages'] = total_pages
 
-                for page_num, page in enumerate(pdf.pages, 1):
+                result = None
+                if workers > 1 and total_pages >= Config.PDF_PARALLEL_MIN_PAGES:
                     try:
-                        # 1. Tentar extrair de tabelas (PDFs tipo planilha)
-                        tables = page.extract_tables()
-                        if tables:
-                            metadata['tables_found'] += len(tables)
-                            for table in tables:
-                                for row in table:
-                                    if not row:
-                                        continue
-                                    for cell in row:
-                                        domain = cls.extract_domains_from_table_cell(cell)
-                                        if domain:
-                                            domains.add(domain)
-
-                        # 2. Extrair de texto corrido (PDFs tipo ofício)
-                        text = page.extract_text()
-                        if text:
-                            page_domains = cls.extract_domains_from_text(text)
-                            domains.update(page_domains)
-                            logger.debug(f"Página {page_num}: {len(page_domains)} domínios no texto")
-
+                        result = cls._extract_parallel(file_path, total_pages, workers)
+                        metadata['workers'] = min(workers, total_pages)
                     except Exception as e:
-                        error_msg = f"Erro na página {page_num}: {str(e)}"
-                        metadata['errors'].append(error_msg)
-                        logger.warning(error_msg)
+                        logger.warning(f"Extração paralela falhou, processando em série: {e}")
+
+                if result is None:
+                    result = cls.extract_pages(pdf, range(1, total_pages + 1))
+
+                domains, page_stats, errors, failed_pages = result
+                metadata['page_stats'] = page_stats
+                metadata['tables_found'] = sum(stat['tables'] for stat in page_stats)
+                metadata['pages_without_text'] = sum(
+                    1 for stat in page_stats
+                    if not stat['text'] and stat['page'] not in failed_pages
+                )
+                metadata['failed_pages'] = failed_pages
+                metadata['errors'].extend(errors)
 
         except Exception as e:
             error_msg = f"Erro ao processar PDF com pdfplumber: {str(e)}"
             metadata['errors'].append(error_msg)
+            metadata['failed_pages'] = None
             logger.error(error_msg)
 
         return domains, metadata
 
     @classmethod
-    def extract_with_pypdf2(cls, file_path: Path) -> Tuple[Set[str], Dict]:
-        """Extrai domínios usando PyPDF2 (fallback)"""
+    def extract_with_pypdf2(
+        cls,
+        file_path: Path,
+        pages: Optional[List[int]] = None
+    ) -> Tuple[Set[str], Dict]:
+        """
+        Extrai domínios usando PyPDF2 (fallback)
+
+        Args:
+            pages: páginas a processar (numeração a partir de 1); None = todas
+        """
         domains = set()
         metadata = {
             'method': 'pypdf2',
@@ -330,9 +433,11 @@ class PDFExtractor:
             with open(file_path, 'rb') as f:
                 pdf_reader = PyPDF2.PdfReader(f)
                 metadata['pages'] = len(pdf_reader.pages)
+                page_numbers = pages or range(1, metadata['pages'] + 1)
 
-                for page_num, page in enumerate(pdf_reader.pages, 1):
+                for page_num in page_numbers:
                     try:
+                        page = pdf_reader.pages[page_num - 1]
                         text = page.extract_text()
                         if text:
                             page_domains = cls.extract_domains_from_text(text)
@@ -351,13 +456,59 @@ class PDFExtractor:
         return domains, metadata
 
     @classmethod
-    def extract_domains(cls, file_path: Path, method: str = 'auto') -> Dict:
+    def _get_cached(cls, file_hash: str, method: str) -> Optional[Dict]:
+        """Busca extração anterior do mesmo arquivo no cache persistente"""
+        # Import tardio: os processos do pool de extração importam este
+        # módulo e não devem abrir conexões com o banco
+        from backend.models.extraction_cache import ExtractionCache
+
+        try:
+            return ExtractionCache.get(file_hash, method, cls.EXTRACTOR_VERSION)
+        except Exception as e:
+            logger.warning(f"Erro ao consultar cache de extração: {e}")
+            return None
+
+    @classmethod
+    def _store_cached(cls, file_hash: str, method: str, result: Dict) -> None:
+        """Grava a extração no cache persistente e aplica o descarte"""
+        from backend.models.extraction_cache import ExtractionCache
+
+        try:
+            ExtractionCache.store(
+                file_hash=file_hash,
+                method=method,
+                extractor_version=cls.EXTRACTOR_VERSION,
+                domains=result['domains'],
+                file_size=result['file_size'],
+                extraction_metadata=result['extraction_metadata']
+            )
+            ExtractionCache.evict(Config.PDF_CACHE_MAX_ENTRIES, Config.PDF_CACHE_MAX_AGE_DAYS)
+        except Exception as e:
+            logger.warning(f"Erro ao gravar cache de extração: {e}")
+
+    @classmethod
+    def extract_domains(
+        cls,
+        file_path: Path,
+        method: str = 'auto',
+        file_hash: Optional[str] = None,
+        use_cache: bool = True
+    ) -> Dict:
         """
         Extrai domínios de um arquivo PDF.
 
+        No modo 'auto' o documento é lido uma única vez pelo pdfplumber;
+        o PyPDF2 só reprocessa as páginas em que o pdfplumber falhou (ou o
+        arquivo inteiro, se ele não pôde ser aberto).
+
+        Com PDF_CACHE_ENABLED, um arquivo já extraído (mesmo SHA-256 e
+        método) é servido do cache pdf_extraction_cache sem nova análise.
+
         Args:
             file_path: Caminho do arquivo PDF
             method: Método de extração ('pypdf2', 'pdfplumber', 'auto')
+            file_hash: SHA-256 já calculado pelo chamador (evita reler o arquivo)
+            use_cache: Consultar/gravar o cache de extrações
 
         Returns:
             Dict com domínios extraídos e metadados
@@ -367,34 +518,50 @@ class PDFExtractor:
         if not file_path.exists():
             raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
 
-        file_hash = cls.calculate_file_hash(file_path)
+        file_hash = file_hash or cls.calculate_file_hash(file_path)
         file_size = file_path.stat().st_size
+        use_cache = use_cache and Config.PDF_CACHE_ENABLED
+
+        if use_cache:
+            cached = cls._get_cached(file_hash, method)
+            if cached is not None:
+                logger.info(f"Extração servida do cache: {cached['total_domains']} domínios ({file_hash[:12]})")
+                return {
+                    'success': cached['total_domains'] > 0,
+                    'domains': list(cached['domains']),
+                    'total_domains': cached['total_domains'],
+                    'file_hash': file_hash,
+                    'file_size': file_size,
+                    'extraction_metadata': cached['extraction_metadata'] or {},
+                    'cached': True
+                }
 
         domains: Set[str] = set()
         extraction_metadata: Dict = {}
 
         # pdfplumber primeiro (suporta tabelas + texto)
+        failed_pages: Optional[List[int]] = None
         if method in ['auto', 'pdfplumber']:
-            try:
-                domains_plumber, metadata_plumber = cls.extract_with_pdfplumber(file_path)
-                if domains_plumber:
-                    domains.update(domains_plumber)
-                    extraction_metadata = metadata_plumber
-                    logger.info(f"pdfplumber: {len(domains_plumber)} domínios extraídos")
-            except Exception as e:
-                logger.warning(f"Falha com pdfplumber: {e}")
-
-        # PyPDF2 como fallback ou quando explicitamente solicitado
-        if (not domains and method in ['auto', 'pypdf2']) or method == 'pypdf2':
-            try:
-                domains_pypdf2, metadata_pypdf2 = cls.extract_with_pypdf2(file_path)
-                if domains_pypdf2:
-                    domains.update(domains_pypdf2)
-                    if not extraction_metadata:
-                        extraction_metadata = metadata_pypdf2
-                    logger.info(f"PyPDF2: {len(domains_pypdf2)} domínios extraídos")
-            except Exception as e:
-                logger.warning(f"Falha com PyPDF2: {e}")
+            domains_plumber, extraction_metadata = cls.extract_with_pdfplumber(file_path)
+            domains.update(domains_plumber)
+            failed_pages = extraction_metadata['failed_pages']
+            logger.info(f"pdfplumber: {len(domains_plumber)} domínios extraídos")
+
+        # PyPDF2 quando explicitamente solicitado ou, no modo auto, apenas
+        # para o que o pdfplumber não conseguiu ler
+        if method == 'pypdf2' or (method == 'auto' and failed_pages != []):
+            domains_pypdf2, metadata_pypdf2 = cls.extract_with_pypdf2(file_path, pages=failed_pages)
+            domains.update(domains_pypdf2)
+            if method == 'pypdf2':
+                extraction_metadata = metadata_pypdf2
+            else:
+                extraction_metadata['fallback'] = {
+                    'method': 'pypdf2',
+                    'pages': failed_pages or 'all',
+                    'domains': len(domains_pypdf2),
+                    'errors': metadata_pypdf2['errors']
+                }
+            logger.info(f"PyPDF2: {len(domains_pypdf2)} domínios extraídos")
 
         domains_list = sorted(list(domains))
 
@@ -404,9 +571,15 @@ class PDFExtractor:
             'total_domains': len(domains),
             'file_hash': file_hash,
             'file_size': file_size,
-            'extraction_metadata': extraction_metadata
+            'extraction_metadata': extraction_metadata,
+            'cached': False
         }
 
+        # Só resultados completos vão para o cache (falhas podem ser transitórias)
+        fallback_errors = extraction_metadata.get('fallback', {}).get('errors')
+        if use_cache and not extraction_metadata.get('errors') and not fallback_errors:
+            cls._store_cached(file_hash, method, result)
+
         logger.info(f"Extração concluída: {len(domains)} domínios únicos encontrados")
         return result
 
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BR10 Block Web - Statistics Service
+=====================================
+Estatísticas gerais para dashboard e configurações
+
+Lidas dos contadores mantidos por trigger (StatsCounter), mais a contagem
+de uploads dos últimos RECENT_UPLOADS_DAYS dias (índice de uploaded_at),
+e servidas do Redis via cache_statistics/get_cached_statistics.
+
+Autor: BR10 Team
+Versão: 3.2.0
+Data: 2026-10-17
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict
+
+from backend.models.pdf_upload import PDFUpload
+from backend.models.stats_counter import StatsCounter
+from backend.services.cache_service import cache_statistics, get_cached_statistics
+
+logger = logging.getLogger(__name__)
+
+
+class StatisticsService:
+    """Serviço de estatísticas gerais"""
+
+    # Período dos uploads "recentes" do card do dashboard
+    RECENT_UPLOADS_DAYS = 7
+
+    @staticmethod
+    def build_statistics() -> Dict:
+        """Monta as estatísticas a partir dos contadores"""
+        counters = StatsCounter.get_all()
+        recent_since = datetime.now() - timedelta(days=StatisticsService.RECENT_UPLOADS_DAYS)
+        recent_uploads = PDFUpload.get_period_stats(recent_since)['totals']['total_uploads']
+
+        return {
+            'domains': {
+                'total': counters['domains_total'],
+                'active': counters['domains_active'],
+                'inactive': counters['domains_total'] - counters['domains_active']
+            },
+            'clients': {
+                'total': counters['clients_total'],
+                'active': counters['clients_active'],
+                'online': counters['clients_online']
+            },
+            'uploads': {
+                'total': counters['uploads_total'],
+                'recent': recent_uploads,
+                'recent_days': StatisticsService.RECENT_UPLOADS_DAYS
+            },
+            'generated_at': datetime.now().isoformat()
+        }
+
+    @staticmethod
+    def get_statistics(use_cache: bool = True) -> Dict:
+        """Retorna estatísticas, do Redis quando disponível"""
+        if use_cache:
+            cached = get_cached_statistics()
+            if cached:
+                return cached
+
+        stats = StatisticsService.build_statistics()
+        cache_statistics(stats)
+        return stats
+
+    @staticmethod
+    def refresh() -> Dict:
+        """Recalcula os contadores com COUNT completo e atualiza o cache"""
+        StatsCounter.refresh()
+        logger.info("Contadores de estatísticas recalculados")
+        return StatisticsService.get_statistics(use_cache=False)
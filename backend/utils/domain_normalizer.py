@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BR10 Block Web - Domain Normalizer
+====================================
+Normalização e deduplicação de domínios importados
+
+Aplicada ao lote inteiro antes de Domain.bulk_create, para que variações
+do mesmo nome não virem linhas separadas:
+
+  1. espaços e ponto final removidos, minúsculas ("X.BET." -> "x.bet")
+  2. IDN convertido para punycode ("bücher.bet" -> "xn--bcher-kva.bet")
+  3. opcional: "www." removido, a menos que o restante seja um sufixo
+     público (DOMAIN_COLLAPSE_WWW; desativado por padrão, pois a zona
+     RPZ bloqueia nomes exatos e x.bet não cobre www.x.bet)
+  4. opcional: redução ao domínio registrável pela Public Suffix List
+     ("a.b.x.com.br" -> "x.com.br", DOMAIN_REDUCE_TO_REGISTRABLE)
+
+Sufixos públicos ICANN isolados ("com.br", "bet") são descartados:
+bloquear um deles atingiria todos os domínios abaixo dele.
+
+A Public Suffix List é lida do arquivo incluído no projeto
+(PUBLIC_SUFFIX_LIST), sem acesso à rede.
+
+Autor: BR10 Team
+Versão: 3.2.0
+Data: 2026-10-17
+"""
+
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from backend.config import Config
+
+try:
+    import idna
+except ImportError:  # idna é opcional; sem ele usamos o codec IDNA 2003 da biblioteca padrão
+    idna = None
+
+logger = logging.getLogger(__name__)
+
+
+def to_ascii(domain: str) -> Optional[str]:
+    """Converte IDN para punycode; None se o nome não puder ser codificado"""
+    if domain.isascii():
+        return domain.lower()
+
+    try:
+        if idna is not None:
+            return idna.encode(domain, uts46=True).decode('ascii')
+        return domain.encode('idna').decode('ascii').lower()
+    except (UnicodeError, ValueError):
+        return None
+
+
+class PublicSuffixList:
+    """Regras da Public Suffix List (carregadas sob demanda, uma vez por processo)"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._loaded = False
+        self.icann: Set[str] = set()
+        self.rules: Set[str] = set()
+        self.wildcards: Set[str] = set()
+        self.exceptions: Set[str] = set()
+
+    def _ensure_loaded(self) -> None:
+        """Lê o arquivo da lista (regras convertidas para punycode)"""
+        if self._loaded:
+            return
+
+        with self._lock:
+            if self._loaded:
+                return
+
+            icann_section = False
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if line.startswith('// ===BEGIN ICANN'):
+                        icann_section = True
+                    elif line.startswith('// ===END ICANN'):
+                        icann_section = False
+                    if not line or line.startswith('//'):
+                        continue
+
+                    rule = line.split()[0]
+                    if rule.startswith('!'):
+                        target, name = self.exceptions, rule[1:]
+                    elif rule.startswith('*.'):
+                        target, name = self.wildcards, rule[2:]
+                    else:
+                        target, name = self.rules, rule
+
+                    name = to_ascii(name)
+                    if name is None:
+                        continue
+                    target.add(name)
+                    if icann_section and target is self.rules:
+                        self.icann.add(name)
+
+            self._loaded = True
+            logger.info(
+                f"Public Suffix List carregada: {len(self.rules)} regras, "
+                f"{len(self.wildcards)} curingas, {len(self.exceptions)} exceções"
+            )
+
+    def is_public_suffix(self, domain: str, icann_only: bool = False) -> bool:
+        """Verifica se o domínio (punycode) é ele próprio um sufixo público"""
+        self._ensure_loaded()
+
+        if icann_only:
+            return domain in self.icann or '.' not in domain
+        if domain in self.rules or '.' not in domain:
+            return True
+        return domain.partition('.')[2] in self.wildcards and domain not in self.exceptions
+
+    def public_suffix(self, domain: str) -> str:
+        """Sufixo público mais longo que cobre o domínio (regra padrão "*")"""
+        self._ensure_loaded()
+
+        labels = domain.split('.')
+        for i in range(len(labels)):
+            candidate = '.'.join(labels[i:])
+            if candidate in self.exceptions:
+                return '.'.join(labels[i + 1:])
+            if candidate in self.rules:
+                return candidate
+            if i + 1 < len(labels) and '.'.join(labels[i + 1:]) in self.wildcards:
+                return candidate
+        return labels[-1]
+
+    def registrable_domain(self, domain: str) -> Optional[str]:
+        """Sufixo público + um rótulo; None se o domínio for um sufixo público"""
+        suffix = self.public_suffix(domain)
+        if len(domain) <= len(suffix):
+            return None
+
+        head = domain[:-len(suffix) - 1]
+        return f"{head.rsplit('.', 1)[-1]}.{suffix}"
+
+
+# Instância global da lista
+public_suffixes = PublicSuffixList(Config.PUBLIC_SUFFIX_LIST)
+
+
+def normalize_domain(
+    domain: str,
+    collapse_www: Optional[bool] = None,
+    registrable: Optional[bool] = None
+) -> Optional[str]:
+    """
+    Normaliza um domínio bruto
+
+    Returns:
+        Domínio normalizado ou None se não puder ser usado
+    """
+    if collapse_www is None:
+        collapse_www = Config.DOMAIN_COLLAPSE_WWW
+    if registrable is None:
+        registrable = Config.DOMAIN_REDUCE_TO_REGISTRABLE
+
+    domain = to_ascii(domain.strip().rstrip('.'))
+    if not domain:
+        return None
+
+    if registrable:
+        return public_suffixes.registrable_domain(domain)
+
+    if collapse_www and domain.startswith('www.') and not public_suffixes.is_public_suffix(domain[4:]):
+        domain = domain[4:]
+
+    if public_suffixes.is_public_suffix(domain, icann_only=True):
+        return None
+
+    return domain
+
+
+def normalize_domains(
+    domains: Iterable[str],
+    collapse_www: Optional[bool] = None,
+    registrable: Optional[bool] = None
+) -> Tuple[List[str], Dict]:
+    """
+    Normaliza e deduplica um lote inteiro, mantendo a ordem da primeira
+    ocorrência. Entradas repetidas no lote são normalizadas uma única vez.
+
+    Returns:
+        (domínios únicos normalizados, estatísticas)
+    """
+    if collapse_www is None:
+        collapse_www = Config.DOMAIN_COLLAPSE_WWW
+    if registrable is None:
+        registrable = Config.DOMAIN_REDUCE_TO_REGISTRABLE
+
+    seen_raw: Dict[str, Optional[str]] = {}
+    unique: Dict[str, None] = {}
+    total = 0
+    rejected = 0
+
+    for raw in domains:
+        total += 1
+        if raw in seen_raw:
+            normalized = seen_raw[raw]
+        else:
+            normalized = normalize_domain(raw, collapse_www, registrable)
+            seen_raw[raw] = normalized
+
+        if normalized is None:
+            rejected += 1
+        else:
+            unique[normalized] = None
+
+    result = list(unique)
+    return result, {
+        'input': total,
+        'output': len(result),
+        'merged': total - rejected - len(result),
+        'rejected': rejected
+    }
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BR10 Block Web - Domain Validator
+===================================
+Validação rápida de domínios para bloqueio
+
+Todas as regras estruturais (caracteres, rótulos de 1 a 63 caracteres sem
+hífen nas pontas, TLD com pelo menos uma letra, números de processo,
+datas e palavras comuns do tipo "art.5") estão em uma única expressão
+pré-compilada; sobram apenas a checagem de tamanho e a lista de
+ignorados, ambas sem alocação. É o caminho comum do PDFExtractor, da
+adição em massa e de utils.validators.validate_domain.
+
+As funções esperam domínios já normalizados (sem espaços, minúsculos).
+
+Autor: BR10 Team
+Versão: 3.2.0
+Data: 2026-10-17
+"""
+
+import re
+from typing import Iterable, List
+
+MIN_LENGTH = 4
+MAX_LENGTH = 255
+
+# Domínios que aparecem em documentos mas nunca devem ser bloqueados
+IGNORED_DOMAINS = frozenset({
+    'example.com', 'example.org', 'example.net',
+    'localhost', 'test.com', 'domain.com',
+    'email.com', 'website.com', 'page.com',
+    'google.com', 'facebook.com', 'twitter.com',
+    'instagram.com', 'youtube.com', 'whatsapp.com',
+    'microsoft.com', 'apple.com', 'amazon.com',
+})
+
+# Palavras que NÃO são domínios quando formam "palavra.tld" (ex: "art.5o")
+NOT_DOMAIN_WORDS = frozenset({
+    'art', 'fig', 'tab', 'ref', 'obs', 'ver', 'vide',
+    'inc', 'ltda', 'eireli', 'me', 'sa', 'sas',
+    'jan', 'fev', 'mar', 'abr', 'mai', 'jun',
+    'jul', 'ago', 'set', 'out', 'nov', 'dez',
+    'seg', 'ter', 'qua', 'qui', 'sex', 'sab', 'dom',
+})
+
+_LABEL = r'[a-z0-9](?:[a-z0-9\-]{0,61}[a-z0-9])?'
+
+DOMAIN_RE = re.compile(
+    # Números de processo e datas: 1031339-38.2022.8.26.0050, 13.02.2025
+    r'(?![0-9][0-9\-]*\.[0-9])'
+    # "palavra.tld" com palavra comum de texto
+    r'(?!(?:' + '|'.join(sorted(NOT_DOMAIN_WORDS)) + r')\.[a-z0-9\-]+\Z)'
+    # Um ou mais rótulos + TLD (mínimo 2 caracteres, não só dígitos)
+    r'(?:' + _LABEL + r'\.)+'
+    r'(?=[a-z0-9\-]*[a-z])[a-z0-9][a-z0-9\-]{0,61}[a-z0-9]'
+)
+
+_fullmatch = DOMAIN_RE.fullmatch
+
+
+def is_valid_domain(domain: str) -> bool:
+    """Valida um domínio normalizado"""
+    return (
+        MIN_LENGTH <= len(domain) <= MAX_LENGTH
+        and domain not in IGNORED_DOMAINS
+        and _fullmatch(domain) is not None
+    )
+
+
+def filter_valid_domains(domains: Iterable[str]) -> List[str]:
+    """Valida uma lista em uma única passada; retorna os válidos, na ordem"""
+    fullmatch = _fullmatch
+    ignored = IGNORED_DOMAINS
+    return [
+        domain for domain in domains
+        if MIN_LENGTH <= len(domain) <= MAX_LENGTH
+        and domain not in ignored
+        and fullmatch(domain) is not None
+    ]
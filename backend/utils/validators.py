@@ -15,6 +15,7 @@ from pathlib import Path
 from typing import Optional, Tuple
 
 from backend.config import Config
+from backend.utils.domain_validator import IGNORED_DOMAINS, is_valid_domain
 
 
 def validate_domain(domain: str) -> Tuple[bool, Optional[str]]:
@@ -36,22 +37,15 @@ def validate_domain(domain: str) -> Tuple[bool, Optional[str]]:
     if len(domain) > 255:
         return False, "Domínio muito longo (máximo 255 caracteres)"
     
-    # Padrão básico
-    pattern = re.compile(
-        r'^(?:[a-z0-9](?:[a-z0-9\-]{0,61}[a-z0-9])?\.)+[a-z]{2,}$'
-    )
+    if domain in IGNORED_DOMAINS:
+        return False, "Domínio na lista de ignorados"
     
-    if not pattern.match(domain):
-        return False, "Formato de domínio inválido"
-    
-    # Verificar se tem pelo menos um ponto
     if '.' not in domain:
         return False, "Domínio deve conter pelo menos um ponto"
     
-    # Verificar TLD
-    parts = domain.split('.')
-    if len(parts[-1]) < 2:
-        return False, "TLD inválido"
+    # Padrão completo (validador compilado compartilhado com a extração de PDFs)
+    if not is_valid_domain(domain):
+        return False, "Formato de domínio inválido"
     
     return True, None
 
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BR10 Block Web - Job Worker
+=============================
+Processo dedicado para a fila de jobs (processamento de PDFs)
+
+Uso:
+    python -m backend.worker                 # 1 thread de worker
+    python -m backend.worker --threads 2
+
+Com workers dedicados, desative a thread embutida na aplicação com
+JOB_EMBEDDED_WORKER=false.
+
+Autor: BR10 Team
+Versão: 3.2.0
+Data: 2026-10-17
+"""
+
+import argparse
+import logging
+import signal
+import threading
+
+from backend.database.db import db
+from backend.services.job_queue import JobQueue
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Worker da fila de jobs do BR10 Block Web')
+    parser.add_argument('--threads', type=int, default=1, help='Jobs processados em paralelo')
+    args = parser.parse_args()
+
+    if not db.test_connection():
+        raise SystemExit("Não foi possível conectar ao banco de dados")
+
+    stop = threading.Event()
+
+    def handle_signal(signum, frame):
+        logger.info(f"Sinal {signum} recebido, finalizando após o job atual...")
+        stop.set()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    threads = [
+        threading.Thread(target=JobQueue.work, args=(stop,), name=f'job-worker-{i}')
+        for i in range(max(args.threads, 1))
+    ]
+    for thread in threads:
+        thread.start()
+
+    # join com timeout para que o thread principal continue recebendo sinais
+    while any(thread.is_alive() for thread in threads):
+        for thread in threads:
+            thread.join(timeout=1)
+
+    db.close_all_connections()
+
+
+if __name__ == '__main__':
+    main()
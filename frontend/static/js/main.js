@@ -50,6 +50,29 @@ const utils = {
     // Esconder loading
     hideLoading() {
         $('#loading-spinner').remove();
+    },
+    
+    // Acompanhar job em segundo plano até terminar; retorna o resultado do job
+    async waitForJob(jobId, onProgress = null, interval = 1500) {
+        while (true) {
+            const response = await fetch(`${API_BASE}/admin/jobs/${jobId}`);
+            const data = await response.json();
+            
+            if (!data.success) {
+                return { success: false, error: data.error || 'Erro ao consultar job' };
+            }
+            
+            const job = data.job;
+            if (onProgress) {
+                onProgress(job.progress || 0, job.progress_message || 'Aguardando processamento...', job);
+            }
+            
+            if (job.status === 'done' || job.status === 'failed') {
+                return job.result || { success: job.status === 'done', error: job.error };
+            }
+            
+            await new Promise(resolve => setTimeout(resolve, interval));
+        }
     }
 };
 
@@ -136,6 +159,7 @@ class PDFUploader {
             body: formData
         })
         .then(response => response.json())
+        .then(data => data.success ? utils.waitForJob(data.job_id) : data)
         .then(data => {
             utils.hideLoading();
             